@@ -0,0 +1,102 @@
+"""
+LRU + TTL cache of LLM decisions keyed on a canonical, price-quantized MarketState.
+
+Consecutive closes often produce the same setup with levels that moved by a tick or two.
+With ``temperature`` at 0 the model answers those identically, so the decision for the
+first one is reused. The fingerprint drops the timestamp and the price-derived
+``distance_pct`` fields, buckets every price to ``price_pct`` of itself (one significant
+step, e.g. 10 for BTC near 65,000 at 0.05%), and is namespaced by the execution guide's
+hash, so editing the manual or switching models starts a fresh cache. Age is measured on
+candle time, which keeps replays of a recorded session deterministic.
+"""
+from __future__ import annotations
+
+import math
+from collections import OrderedDict
+
+from core.metrics import metrics
+from models.schemas import AIDecision, MarketState
+
+
+class DecisionCache:
+    """
+    Bounded LRU of ``AIDecision`` by MarketState fingerprint, expiring after ``ttl_secs`` of candle time.
+    """
+
+    def __init__(self, max_entries: int, ttl_secs: float, price_pct: float, namespace: str):
+        self.max_entries = max_entries
+        self.ttl_secs = ttl_secs
+        self.price_pct = price_pct
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[tuple, tuple[float, AIDecision]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _quantize(self, price: float | None) -> float | None:
+        if price is None or self.price_pct <= 0 or not math.isfinite(price) or price <= 0:
+            return price
+        step = 10.0 ** math.floor(math.log10(price * self.price_pct))
+        return round(round(price / step) * step, 12)
+
+    def fingerprint(self, market_state: MarketState) -> tuple:
+        quantize = self._quantize
+        bullish, bearish = market_state.closest_bullish_fvg, market_state.closest_bearish_fvg
+        return (
+            self.namespace,
+            market_state.symbol,
+            market_state.timeframe,
+            market_state.valid_poi_found,
+            market_state.setup_type,
+            quantize(market_state.stop_reference),
+            quantize(bullish.top),
+            quantize(bullish.bottom),
+            quantize(bearish.top),
+            quantize(bearish.bottom),
+            quantize(market_state.last_swing_high),
+            quantize(market_state.last_swing_low),
+            tuple((pool.side, quantize(pool.price), pool.touches) for pool in market_state.liquidity_targets),
+            tuple((zone.direction, quantize(zone.top), quantize(zone.bottom)) for zone in market_state.bpr_zones),
+            tuple(
+                (
+                    context.timeframe,
+                    context.setup_type,
+                    quantize(context.closest_bullish_fvg.top),
+                    quantize(context.closest_bullish_fvg.bottom),
+                    quantize(context.closest_bearish_fvg.top),
+                    quantize(context.closest_bearish_fvg.bottom),
+                    quantize(context.last_swing_high),
+                    quantize(context.last_swing_low),
+                )
+                for context in market_state.htf_context
+            ),
+        )
+
+    def get(self, key: tuple, now: float) -> AIDecision | None:
+        entry = self._entries.get(key)
+        if entry is not None and now - entry[0] > self.ttl_secs:
+            del self._entries[key]
+            self.evictions += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            metrics.increment("llm.cache.miss")
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        metrics.increment("llm.cache.hit")
+        # Callers may fill in fields (e.g. stop_reference); never hand out the stored instance.
+        return entry[1].model_copy()
+
+    def put(self, key: tuple, decision: AIDecision, now: float) -> None:
+        self._entries[key] = (now, decision.model_copy())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
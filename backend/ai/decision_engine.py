@@ -1,27 +1,111 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import hashlib
 import json
 import logging
+import time
 from pathlib import Path
+from typing import Callable
 
 import aiohttp
 
+from ai.decision_cache import DecisionCache
+from ai.ollama_router import OllamaEndpoint, OllamaRouter
 from ai.parser import JSONParser
+from ai.stream_parser import StreamingDecisionParser
 from core.config import settings
+from core.metrics import metrics
+from core.recorder import record
 from models.schemas import AIDecision, MarketState
 
 logger = logging.getLogger("openclaw.llm_brain")
 
+# Ollama reports how long it spent loading the model; above this the call paid a cold load.
+COLD_LOAD_SECS = 0.5
+
+# Appended to the execution guide as part of the system prompt. Everything static sits in
+# front of the per-call market state, so Ollama reuses the evaluated prefix between calls.
+INSTRUCTIONS = """
+You are the OpenClaw-Class Autonomous Execution Agent.
+Your logic is strictly governed by the institutional execution guide above.
+
+CORE AXIOM: A POI without Liquidity offers zero mathematical edge.
+Prioritize capital preservation over frequency of trades.
+
+Each request is a compact JSON market state; absent fields are null or empty.
+When present, htf_context summarizes the structure of each higher timeframe; treat it as bias, never as an entry.
+Evaluate the state and respond ONLY as JSON in the exact shape below:
+{
+  "action": "LONG" | "SHORT" | "WAIT",
+  "confidence": <int 0-100>,
+  "reasoning": "<max 2 concise sentences>",
+  "entry_poi": <float or null>,
+  "target_liquidity": <float or null>,
+  "stop_reference": <float or null>
+}
+"""
+
+# Per-request, so the system prompt above stays the shared prefix for single and batched calls.
+BATCH_INSTRUCTIONS = (
+    "This request holds several market states, each with an integer id. Evaluate each one independently "
+    'and respond ONLY as JSON: {"decisions": [{"id": <id>, ...decision fields in the shape above}]}, '
+    "with exactly one entry per id.\n"
+)
+
+
+def _compact(value):
+    """Drops None, empty dicts and empty lists, recursively."""
+    if isinstance(value, dict):
+        items = ((key, _compact(item)) for key, item in value.items())
+        return {key: item for key, item in items if item is not None and item != {} and item != []}
+    if isinstance(value, list):
+        return [_compact(item) for item in value]
+    return value
+
 
 class DecisionEngine:
     """
     LLM policy evaluator against the master execution guide.
+
+    Owns one pooled HTTP session for its lifetime (``start()``/``close()``). Every request
+    carries ``keep_alive`` and, while idle, a periodic empty-prompt ping keeps the model
+    resident, so a sparse setup does not pay a cold model load. Decisions are reused for
+    near-identical market states through ``decision_cache`` (``None`` when disabled).
     """
 
     def __init__(self):
         self.model_name = settings.OLLAMA_MODEL
-        self.ollama_url = f"{settings.OLLAMA_BASE_URL.rstrip('/')}/api/generate"
-        self.system_prompt = self._load_execution_guide()
+        base_urls = [url.strip() for url in settings.OLLAMA_BASE_URLS.split(",") if url.strip()]
+        self.router = OllamaRouter(
+            base_urls or [settings.OLLAMA_BASE_URL],
+            hedge=settings.OLLAMA_HEDGE_ENABLED,
+            hedge_min_secs=settings.OLLAMA_HEDGE_MIN_SECS,
+            cooldown_secs=settings.OLLAMA_ENDPOINT_COOLDOWN_SECS,
+        )
+        self.keep_alive = settings.OLLAMA_KEEP_ALIVE
+        self.warm_ping_secs = settings.OLLAMA_WARM_PING_SECS
+        self.num_ctx = settings.OLLAMA_NUM_CTX
+        self.stream = settings.OLLAMA_STREAM
+        self.max_tokens = settings.OLLAMA_MAX_TOKENS
+        self.budget_secs = settings.OLLAMA_DECISION_BUDGET_SECS
+        self.system_prompt = f"{self._load_execution_guide().rstrip()}\n{INSTRUCTIONS}"
+        self.guide_hash = hashlib.sha256(f"{self.model_name}\n{self.system_prompt}".encode("utf-8")).hexdigest()[:16]
+        self.decision_cache = (
+            DecisionCache(
+                max_entries=settings.DECISION_CACHE_SIZE,
+                ttl_secs=settings.DECISION_CACHE_TTL_SECS,
+                price_pct=settings.DECISION_CACHE_PRICE_PCT,
+                namespace=self.guide_hash,
+            )
+            if settings.DECISION_CACHE_ENABLED
+            else None
+        )
+        self._session: aiohttp.ClientSession | None = None
+        self._session_loop: asyncio.AbstractEventLoop | None = None
+        self._warm_task: asyncio.Task | None = None
+        self._last_request = 0.0
 
     def _load_execution_guide(self) -> str:
         guide_path = Path(__file__).resolve().parents[1] / "knowledge_base" / "master_desk_manual_v4.txt"
@@ -30,59 +114,306 @@ class DecisionEngine:
             raise FileNotFoundError("Missing master_desk_manual_v4.txt")
         return guide_path.read_text(encoding="utf-8")
 
-    def _build_prompt(self, market_state: MarketState) -> str:
-        market_json = market_state.model_dump_json(indent=2)
-        return f"""
-You are the OpenClaw-Class Autonomous Execution Agent.
-Your logic is strictly governed by the provided institutional execution guide.
+    @staticmethod
+    def _build_prompt(market_state: MarketState) -> str:
+        """The per-call part of the request: the market state as minified JSON without empty fields."""
+        return "Current Quantitative Market State:\n" + json.dumps(
+            _compact(market_state.model_dump(mode="json")), separators=(",", ":")
+        )
 
-CORE AXIOM: A POI without Liquidity offers zero mathematical edge.
-Prioritize capital preservation over frequency of trades.
+    @staticmethod
+    def _build_batch_prompt(market_states: list[MarketState]) -> str:
+        states = [{"id": index, **_compact(state.model_dump(mode="json"))} for index, state in enumerate(market_states)]
+        return BATCH_INSTRUCTIONS + "Current Quantitative Market States:\n" + json.dumps(states, separators=(",", ":"))
 
-Current Quantitative Market State:
-{market_json}
+    def _client(self) -> aiohttp.ClientSession:
+        """The pooled session, (re)opened on first use, after close() or on a new event loop."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=settings.OLLAMA_TIMEOUT_SECS),
+                connector=aiohttp.TCPConnector(
+                    limit=4 * len(self.router.endpoints), keepalive_timeout=max(60, self.warm_ping_secs * 2)
+                ),
+            )
+            self._session_loop = loop
+        return self._session
 
-Evaluate the state and respond ONLY as JSON in the exact shape below:
-{{
-  "action": "LONG" | "SHORT" | "WAIT",
-  "confidence": <int 0-100>,
-  "reasoning": "<max 2 concise sentences>",
-  "entry_poi": <float or null>,
-  "target_liquidity": <float or null>,
-  "stop_reference": <float or null>
-}}
-"""
+    async def start(self) -> None:
+        """Opens the session, loads the model and starts the idle warm ping."""
+        await self.warm()
+        if self.warm_ping_secs > 0 and self._warm_task is None:
+            self._warm_task = asyncio.create_task(self._warm_loop())
+
+    async def close(self) -> None:
+        if self._warm_task is not None:
+            self._warm_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._warm_task
+            self._warm_task = None
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def warm(self) -> bool:
+        """Empty-prompt generate on every endpoint: loads the model and renews keep_alive without generating."""
+        loaded = await asyncio.gather(*(self._warm_endpoint(endpoint) for endpoint in self.router.endpoints))
+        return all(loaded)
+
+    async def _warm_endpoint(self, endpoint: OllamaEndpoint) -> bool:
+        started = time.perf_counter()
+        payload = {"model": self.model_name, "prompt": "", "keep_alive": self.keep_alive}
+        try:
+            async with self._client().post(endpoint.url("/api/generate"), json=payload) as response:
+                await response.read()
+                loaded = response.status == 200
+        except Exception as exc:
+            logger.warning("Ollama warm ping to %s failed: %s", endpoint.base_url, exc)
+            metrics.increment("llm.warm_ping.failed")
+            return False
+        finally:
+            self._last_request = time.monotonic()
+        metrics.observe("llm.warm_ping", time.perf_counter() - started)
+        return loaded
+
+    async def _warm_loop(self) -> None:
+        while True:
+            idle = time.monotonic() - self._last_request
+            if idle >= self.warm_ping_secs:
+                await self.warm()
+                idle = 0.0
+            await asyncio.sleep(self.warm_ping_secs - idle)
+
+    async def _generate(self, payload: dict) -> tuple[int, str | None]:
+        """
+        POSTs one generation request through the endpoint router; returns (HTTP status, raw
+        model text or None).
+
+        Whatever comes back over the wire, transport errors included, goes to the pipeline recorder.
+        """
+        started = time.perf_counter()
+
+        async def _post(endpoint: OllamaEndpoint) -> tuple[int, str | None, dict]:
+            async with self._client().post(endpoint.url("/api/generate"), json=payload) as response:
+                if response.status != 200:
+                    return response.status, None, {}
+                if payload.get("stream"):
+                    return 200, *await self._read_stream(response, started)
+                stats = await response.json()
+                metrics.observe("llm.time_to_decision", time.perf_counter() - started)
+                return 200, stats.get("response", "{}"), stats
+
+        try:
+            status, raw_response, stats = await self.router.request(_post, succeeded=lambda result: result[0] == 200)
+        except Exception as exc:
+            record("ollama", {"error": str(exc)})
+            raise
+        finally:
+            self._last_request = time.monotonic()
+        record("ollama", {"status": status, "response": raw_response})
+        elapsed = time.perf_counter() - started
+        # A stream cut at the decision never gets the final stats. First-token latency includes
+        # prefill, so it cannot tell a model load from a long prompt; those calls stay unclassified.
+        if "load_duration" in stats:
+            phase = "cold" if stats["load_duration"] / 1e9 >= COLD_LOAD_SECS else "warm"
+        else:
+            phase = "unknown"
+        metrics.observe(f"llm.decision.{phase}", elapsed)
+        if stats:
+            self._observe_tokens(stats, elapsed)
+        return status, raw_response
+
+    async def _read_stream(self, response, started: float) -> tuple[str, dict]:
+        """
+        Feeds the NDJSON chunks to a ``StreamingDecisionParser`` until a decision object is
+        complete or the generation budget is spent. Leaving early closes the connection, which
+        makes Ollama abort the generation. Returns the decision text (or everything visible
+        when there is none) and the response stats.
+        """
+        parser = StreamingDecisionParser()
+        stats = {}
+        deadline = started + self.budget_secs
+        async for line in response.content:
+            if not line.strip():
+                continue
+            chunk = json.loads(line)
+            if "error" in chunk:
+                raise RuntimeError(chunk["error"])
+            stats.setdefault("ttft", time.perf_counter() - started)
+            decision = parser.feed(chunk.get("response", ""))
+            if chunk.get("done"):
+                stats.update(chunk)
+                decision = decision or parser.finish()
+            if decision is not None:
+                metrics.observe("llm.time_to_decision", time.perf_counter() - started)
+                break
+            if chunk.get("done"):
+                break
+            # Checked per token; a stalled stream is cut by the session timeout instead.
+            if parser.tokens >= self.max_tokens or time.perf_counter() >= deadline:
+                logger.warning("LLM generation budget spent after %d tokens without a decision", parser.tokens)
+                metrics.increment("llm.stream.budget_exhausted")
+                break
+        stats.setdefault("eval_count", parser.tokens)
+        return parser.decision_text or parser.text, stats
+
+    def _observe_tokens(self, stats: dict, elapsed: float) -> None:
+        """
+        Token counts and time to first token from Ollama's response stats.
+
+        ``prompt_eval_count`` only covers prompt tokens that were evaluated, so a reused
+        prefix shows up as a small count and a short prefill. A stream cut at the decision
+        has no final stats, so its prompt count is left out rather than recorded as zero.
+        Streams measure the first token directly; otherwise it is load plus prompt evaluation.
+        """
+        prompt_tokens = stats.get("prompt_eval_count")
+        output_tokens = stats.get("eval_count", 0)
+        ttft = stats.get("ttft", (stats.get("load_duration", 0) + stats.get("prompt_eval_duration", 0)) / 1e9)
+        if prompt_tokens is not None:
+            metrics.increment("llm.prompt_tokens", prompt_tokens)
+            metrics.increment("llm.prompt_token_samples")
+        metrics.increment("llm.output_tokens", output_tokens)
+        metrics.observe("llm.ttft", ttft)
+        logger.info(
+            "LLM call: prompt_tokens=%s output_tokens=%d ttft=%.0fms total=%.0fms",
+            "n/a" if prompt_tokens is None else prompt_tokens,
+            output_tokens,
+            ttft * 1000,
+            elapsed * 1000,
+        )
+        if prompt_tokens is not None and prompt_tokens >= self.num_ctx:
+            logger.warning("Prompt filled num_ctx=%d; Ollama truncates the prompt, raise OLLAMA_NUM_CTX.", self.num_ctx)
+
+    def _cached(self, market_state: MarketState) -> tuple[tuple | None, AIDecision | None]:
+        """(cache key or None when caching is off, cached decision or None)."""
+        if self.decision_cache is None:
+            return None, None
+        cache_key = self.decision_cache.fingerprint(market_state)
+        cached = self.decision_cache.get(cache_key, market_state.timestamp.timestamp())
+        if cached is not None:
+            if cached.stop_reference is None:
+                cached.stop_reference = market_state.stop_reference
+            logger.info("AI decision (cached): %s", json.dumps(cached.model_dump(mode="json")))
+        return cache_key, cached
 
     async def evaluate_market(self, market_state: MarketState) -> AIDecision:
+        cache_key, cached = self._cached(market_state)
+        if cached is not None:
+            return cached
+        return await self._evaluate(market_state, cache_key)
+
+    async def _evaluate(self, market_state: MarketState, cache_key: tuple | None) -> AIDecision:
+        candle_time = market_state.timestamp.timestamp()
+
         payload = {
             "model": self.model_name,
             "system": self.system_prompt,
             "prompt": self._build_prompt(market_state),
             "format": "json",
-            "stream": False,
-            "options": {"temperature": 0.0, "num_ctx": 4096},
+            "stream": self.stream,
+            "keep_alive": self.keep_alive,
+            "options": {"temperature": 0.0, "num_ctx": self.num_ctx, "num_predict": self.max_tokens},
         }
 
         try:
-            timeout = aiohttp.ClientTimeout(total=settings.OLLAMA_TIMEOUT_SECS)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(self.ollama_url, json=payload) as response:
-                    if response.status != 200:
-                        logger.error("Ollama status=%s", response.status)
-                        return self._default_wait_state("LLM API Error", market_state.stop_reference)
-
-                    data = await response.json()
-                    raw_response = data.get("response", "{}")
-                    parsed = JSONParser.parse_ai_decision(raw_response)
-                    decision = AIDecision(**parsed)
-                    if decision.stop_reference is None:
-                        decision.stop_reference = market_state.stop_reference
-                    logger.info("AI decision: %s", json.dumps(decision.model_dump(mode="json")))
-                    return decision
+            status, raw_response = await self._generate(payload)
+            if status != 200:
+                logger.error("Ollama status=%s", status)
+                return self._default_wait_state("LLM API Error", market_state.stop_reference)
+
+            parsed = JSONParser.parse_ai_decision(raw_response)
+            decision = AIDecision(**parsed)
+            # Parse failures fall back to WAIT; only real model answers are worth reusing.
+            if cache_key is not None and parsed != JSONParser.fallback_wait():
+                self.decision_cache.put(cache_key, decision, candle_time)
+            if decision.stop_reference is None:
+                decision.stop_reference = market_state.stop_reference
+            logger.info("AI decision: %s", json.dumps(decision.model_dump(mode="json")))
+            logger.info("LLM latency: %s", json.dumps(metrics.snapshot("llm.")))
+            if len(self.router.endpoints) > 1:
+                logger.info("LLM endpoints: %s", json.dumps(self.router.snapshot()))
+            return decision
         except Exception as exc:
             logger.error("Failed to evaluate market via Ollama: %s", exc)
             return self._default_wait_state("Connection Failure", market_state.stop_reference)
 
+    async def evaluate_batch(
+        self,
+        market_states: list[MarketState],
+        on_decision: Callable[[int, AIDecision], None] | None = None,
+    ) -> list[AIDecision]:
+        """
+        Decides several market states with one request; returns the decisions in input order.
+
+        The states go out as an id-keyed array behind the shared system prompt, so the prefix
+        is paid once for the whole batch. Entries the model leaves out or gets wrong are retried
+        one by one through ``evaluate_market``; the valid ones are kept. ``on_decision(index,
+        decision)`` hears about every decision as soon as it is known, so a caller that cancels
+        the retries on a deadline still has the answers the batch did produce.
+        """
+        decisions: list[AIDecision | None] = [None] * len(market_states)
+
+        def _settle(index: int, decision: AIDecision) -> None:
+            decisions[index] = decision
+            if on_decision is not None:
+                on_decision(index, decision)
+
+        cache_keys = {}
+        pending = []
+        for index, market_state in enumerate(market_states):
+            cache_keys[index], cached = self._cached(market_state)
+            if cached is None:
+                pending.append(index)
+            else:
+                _settle(index, cached)
+
+        if len(pending) > 1:
+            payload = {
+                "model": self.model_name,
+                "system": self.system_prompt,
+                "prompt": self._build_batch_prompt([market_states[index] for index in pending]),
+                "format": "json",
+                # The stream parser stops at the first decision object; a batch needs the whole array.
+                "stream": False,
+                "keep_alive": self.keep_alive,
+                "options": {
+                    "temperature": 0.0,
+                    "num_ctx": self.num_ctx,
+                    # Prompt and answer share the context window; more than num_ctx can never be decoded.
+                    "num_predict": min(self.max_tokens * len(pending), self.num_ctx),
+                },
+            }
+            answers = {}
+            try:
+                status, raw_response = await self._generate(payload)
+                if status == 200:
+                    answers = JSONParser.parse_batch_decisions(raw_response, len(pending))
+                else:
+                    logger.error("Ollama status=%s for a batch of %d", status, len(pending))
+            except Exception as exc:
+                logger.error("Failed to evaluate batch via Ollama: %s", exc)
+            for slot, index in enumerate(pending):
+                try:
+                    decision = AIDecision(**answers[slot])
+                except (KeyError, ValueError, TypeError):
+                    continue
+                market_state = market_states[index]
+                if cache_keys[index] is not None:
+                    self.decision_cache.put(cache_keys[index], decision, market_state.timestamp.timestamp())
+                if decision.stop_reference is None:
+                    decision.stop_reference = market_state.stop_reference
+                _settle(index, decision)
+            metrics.increment("llm.batch.requests")
+            metrics.increment("llm.batch.states", len(pending))
+
+        retries = [index for index, decision in enumerate(decisions) if decision is None]
+        if retries and len(pending) > 1:
+            metrics.increment("llm.batch.retried", len(retries))
+            logger.warning("No valid batch answer for %d of %d states; retrying singly.", len(retries), len(pending))
+        for index in retries:
+            _settle(index, await self._evaluate(market_states[index], cache_keys[index]))
+        return decisions
+
     def _default_wait_state(self, reason: str, stop_reference: float | None) -> AIDecision:
         return AIDecision(
             action="WAIT",
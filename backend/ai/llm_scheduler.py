@@ -0,0 +1,163 @@
+"""
+Admission control in front of ``DecisionEngine.evaluate_market``.
+
+Candle closes dispatch their pipelines as independent tasks, so a slow Ollama would
+otherwise collect a growing pile of evaluations that finish out of order. The scheduler
+runs at most ``max_concurrency`` evaluations (match the server's ``OLLAMA_NUM_PARALLEL``)
+and queues the rest in arrival order, one slot per symbol and timeframe: a newer candle
+takes over the queued request of the older one, which is dropped as superseded. Every
+request carries a deadline, normally the next candle close; one that is still queued when
+it passes is dropped, and a running one is cancelled, so no decision is acted on against
+a market that has already moved on. With ``max_batch`` above 1, the request that gets a
+slot takes the oldest queued ones along and they are decided together through
+``DecisionEngine.evaluate_batch``; the shortest deadline in the batch applies to all, and
+answers the batch already produced are handed out even when retries run past it.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from core.metrics import metrics
+from models.schemas import AIDecision, MarketState
+
+logger = logging.getLogger("openclaw.llm_scheduler")
+
+
+class LLMRequestDropped(Exception):
+    """An evaluation that was superseded or ran out of time; ``reason`` says which."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+@dataclass
+class _Waiter:
+    market_state: MarketState
+    future: asyncio.Future
+    deadline: float | None
+
+
+class LLMScheduler:
+    """
+    Bounded, coalescing queue of LLM evaluations with deadlines in ``clock()`` seconds.
+    """
+
+    def __init__(self, engine, max_concurrency: int = 1, max_batch: int = 1, clock=time.time):
+        self.engine = engine
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_batch = max(1, max_batch)
+        self.clock = clock
+        self.running = 0
+        # Insertion-ordered; replacing a key's waiter keeps its place in the queue.
+        self._waiting: dict[tuple[str, str], _Waiter] = {}
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiting)
+
+    async def evaluate(self, market_state: MarketState, deadline: float | None = None) -> AIDecision:
+        """Evaluates ``market_state`` once a slot is free; raises ``LLMRequestDropped`` instead of deciding late."""
+        if self._expired(deadline):
+            self._drop("expired")
+            raise LLMRequestDropped("candle was already past its deadline on arrival")
+        if self.running < self.max_concurrency and not self._waiting:
+            self.running += 1
+        else:
+            answered = await self._wait_for_slot(market_state, deadline)
+            if answered is not None:
+                return answered
+        batch = self._take_batch()
+        answered: dict[int, AIDecision] = {}
+
+        def _answer(index: int, decision: AIDecision) -> None:
+            # Batch answers go out as they arrive; a deadline hit during retries keeps them.
+            answered[index] = decision
+            if index and not batch[index - 1].future.done():
+                batch[index - 1].future.set_result(decision)
+
+        try:
+            deadlines = [waiter.deadline for waiter in batch if waiter.deadline is not None]
+            if deadline is not None:
+                deadlines.append(deadline)
+            timeout = min(deadlines) - self.clock() if deadlines else None
+            if not batch:
+                return await asyncio.wait_for(self.engine.evaluate_market(market_state), timeout)
+            states = [market_state, *(waiter.market_state for waiter in batch)]
+            decisions = await asyncio.wait_for(self.engine.evaluate_batch(states, on_decision=_answer), timeout)
+            for index, decision in enumerate(decisions):
+                _answer(index, decision)
+            return decisions[0]
+        except asyncio.TimeoutError:
+            if 0 in answered:
+                return answered[0]
+            self._drop("timed_out")
+            raise LLMRequestDropped("next candle closed before the evaluation finished") from None
+        finally:
+            for waiter in batch:
+                if not waiter.future.done():
+                    waiter.future.set_exception(LLMRequestDropped("batched evaluation did not complete"))
+            self._release()
+
+    async def _wait_for_slot(self, market_state: MarketState, deadline: float | None) -> AIDecision | None:
+        """Queues the request; returns a decision when it was answered in another request's batch."""
+        key = (market_state.symbol, market_state.timeframe)
+        waiter = _Waiter(market_state, asyncio.get_running_loop().create_future(), deadline)
+        previous = self._waiting.get(key)
+        self._waiting[key] = waiter
+        if previous is not None and not previous.future.done():
+            self._drop("superseded")
+            previous.future.set_exception(LLMRequestDropped("superseded by a newer candle while queued"))
+        try:
+            # None hands over a slot from _release without decrementing ``running``.
+            return await waiter.future
+        except asyncio.CancelledError:
+            if self._waiting.get(key) is waiter:
+                del self._waiting[key]
+            elif waiter.future.done() and not waiter.future.cancelled() and waiter.future.exception() is None:
+                if waiter.future.result() is None:
+                    # Cancelled just after the slot was handed over; pass it on.
+                    self._release()
+            raise
+
+    def _next_waiter(self) -> _Waiter | None:
+        """Oldest queued request that is still live; expired ones are dropped on the way."""
+        while self._waiting:
+            key = next(iter(self._waiting))
+            waiter = self._waiting.pop(key)
+            if waiter.future.done():
+                continue
+            if self._expired(waiter.deadline):
+                self._drop("expired")
+                waiter.future.set_exception(LLMRequestDropped("next candle closed while the request was queued"))
+                continue
+            return waiter
+        return None
+
+    def _take_batch(self) -> list[_Waiter]:
+        """Queued requests that ride along with the one holding the slot, up to ``max_batch`` states in total."""
+        batch = []
+        while len(batch) < self.max_batch - 1:
+            waiter = self._next_waiter()
+            if waiter is None:
+                break
+            batch.append(waiter)
+        return batch
+
+    def _release(self) -> None:
+        waiter = self._next_waiter()
+        if waiter is None:
+            self.running -= 1
+        else:
+            waiter.future.set_result(None)
+
+    def _expired(self, deadline: float | None) -> bool:
+        return deadline is not None and self.clock() >= deadline
+
+    @staticmethod
+    def _drop(reason: str) -> None:
+        metrics.increment(f"llm.scheduler.{reason}")
+        logger.warning("LLM request dropped: %s", reason)
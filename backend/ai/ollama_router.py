@@ -0,0 +1,181 @@
+"""
+Latency-aware routing of generate requests over several Ollama instances, with hedging.
+
+Every endpoint keeps an EWMA of its successful request latency, an EWMA error rate and a
+window of recent latencies. A request goes to the endpoint with the lowest error-weighted
+EWMA among the healthy ones; untried endpoints go first and endpoints that have only ever
+failed go last. If the primary has not answered by its own p95 latency (never earlier than
+``hedge_min_secs``), a duplicate goes to the next endpoint and whichever answers first wins.
+The other request is cancelled, which closes its connection and makes that Ollama abort the
+generation. A request that errors or gets an unusable answer (non-200) fails over to the next
+endpoint. After ``max_failures`` consecutive failures an endpoint sits out ``cooldown_secs``.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+
+import numpy as np
+
+from core.metrics import metrics
+
+logger = logging.getLogger("openclaw.ollama_router")
+
+T = TypeVar("T")
+
+
+class OllamaEndpoint:
+    def __init__(self, base_url: str, alpha: float):
+        self.base_url = base_url.rstrip("/")
+        self.alpha = alpha
+        self.latency_ewma: float | None = None
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+        self.latencies: deque[float] = deque(maxlen=100)
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}{path}"
+
+    def observe_success(self, seconds: float) -> None:
+        self.latencies.append(seconds)
+        if self.latency_ewma is None:
+            self.latency_ewma = seconds
+        else:
+            self.latency_ewma = self.alpha * seconds + (1 - self.alpha) * self.latency_ewma
+        self.error_rate *= 1 - self.alpha
+        self.consecutive_failures = 0
+
+    def observe_failure(self, max_failures: int, cooldown_secs: float) -> None:
+        self.error_rate = self.alpha + (1 - self.alpha) * self.error_rate
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= max_failures:
+            self.unhealthy_until = time.monotonic() + cooldown_secs
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.unhealthy_until
+
+    def score(self) -> tuple[int, float]:
+        """Untried endpoints first, then sampled ones by error-weighted EWMA, then never-succeeded ones."""
+        if self.latency_ewma is None:
+            return (0, 0.0) if self.error_rate == 0 else (2, self.error_rate)
+        return 1, self.latency_ewma / max(0.05, 1.0 - self.error_rate)
+
+    def p95(self) -> float | None:
+        if len(self.latencies) < 5:
+            return None
+        return float(np.percentile(np.fromiter(self.latencies, dtype=np.float64), 95))
+
+    def summary(self) -> dict:
+        return {
+            "latency_ewma_ms": None if self.latency_ewma is None else self.latency_ewma * 1000,
+            "error_rate": self.error_rate,
+            "healthy": self.healthy(time.monotonic()),
+        }
+
+
+class OllamaRouter:
+    """
+    Picks endpoints by latency and error rate; ``request`` runs one call with hedging.
+    """
+
+    def __init__(
+        self,
+        base_urls: list[str],
+        hedge: bool = True,
+        hedge_min_secs: float = 1.0,
+        alpha: float = 0.2,
+        max_failures: int = 3,
+        cooldown_secs: float = 30.0,
+    ):
+        if not base_urls:
+            raise ValueError("OllamaRouter needs at least one endpoint")
+        self.endpoints = [OllamaEndpoint(url, alpha) for url in base_urls]
+        self.hedge = hedge
+        self.hedge_min_secs = hedge_min_secs
+        self.max_failures = max_failures
+        self.cooldown_secs = cooldown_secs
+
+    def ranked(self) -> list[OllamaEndpoint]:
+        """Healthy endpoints by score, then the ones cooling down (soonest back first)."""
+        now = time.monotonic()
+        healthy = sorted((e for e in self.endpoints if e.healthy(now)), key=OllamaEndpoint.score)
+        cooling = sorted((e for e in self.endpoints if not e.healthy(now)), key=lambda e: e.unhealthy_until)
+        return healthy + cooling
+
+    def hedge_delay(self, endpoint: OllamaEndpoint) -> float:
+        p95 = endpoint.p95()
+        return self.hedge_min_secs if p95 is None else max(self.hedge_min_secs, p95)
+
+    async def request(
+        self,
+        send: Callable[[OllamaEndpoint], Awaitable[T]],
+        succeeded: Callable[[T], bool] = lambda result: True,
+    ) -> T:
+        """
+        Runs ``send(endpoint)`` on the best endpoint, hedged to the runner-up after the primary's
+        p95. A call that raises or whose result fails ``succeeded`` moves on to the next endpoint;
+        only when every endpoint has failed is the last failed result returned, or the last error
+        raised if none produced a result.
+        """
+        order = self.ranked()
+        primary = asyncio.create_task(self._timed(order[0], send, succeeded))
+        pending = {primary}
+        backups = iter(order[1:])
+        error: BaseException | None = None
+        failed: list[T] = []
+        try:
+            if self.hedge and len(order) > 1:
+                done, _ = await asyncio.wait(pending, timeout=self.hedge_delay(order[0]))
+                if not done:
+                    metrics.increment("llm.router.hedged")
+                    pending.add(asyncio.create_task(self._timed(next(backups), send, succeeded)))
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    ok, result = task.result()
+                    if not ok:
+                        failed.append(result)
+                        continue
+                    if task is not primary:
+                        metrics.increment("llm.router.hedge_won" if pending else "llm.router.failover")
+                    return result
+                if not pending:
+                    backup = next(backups, None)
+                    if backup is not None:
+                        pending.add(asyncio.create_task(self._timed(backup, send, succeeded)))
+            if failed:
+                return failed[-1]
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _timed(self, endpoint: OllamaEndpoint, send, succeeded) -> tuple[bool, T]:
+        started = time.perf_counter()
+        try:
+            result = await send(endpoint)
+        except asyncio.CancelledError:
+            # Lost the hedge race; says nothing about the endpoint.
+            raise
+        except Exception as exc:
+            endpoint.observe_failure(self.max_failures, self.cooldown_secs)
+            logger.warning("Ollama endpoint %s failed: %s", endpoint.base_url, exc)
+            raise
+        if not succeeded(result):
+            endpoint.observe_failure(self.max_failures, self.cooldown_secs)
+            logger.warning("Ollama endpoint %s returned an unusable result", endpoint.base_url)
+            return False, result
+        endpoint.observe_success(time.perf_counter() - started)
+        return True, result
+
+    def snapshot(self) -> dict:
+        return {endpoint.base_url: endpoint.summary() for endpoint in self.endpoints}
@@ -4,8 +4,29 @@ import re
 
 logger = logging.getLogger("openclaw.parser")
 
+REQUIRED_KEYS = (
+    "action",
+    "confidence",
+    "reasoning",
+    "entry_poi",
+    "target_liquidity",
+    "stop_reference",
+)
+
+
 class JSONParser:
     """Strips markdown and validates the LLM's strict JSON output."""
+
+    @staticmethod
+    def validate(decision) -> dict:
+        """Raises ValueError unless ``decision`` is an object with every required key."""
+        # Validate required keys exist to prevent downstream KeyError
+        if not isinstance(decision, dict):
+            raise ValueError("Decision is not a JSON object")
+        for key in REQUIRED_KEYS:
+            if key not in decision:
+                raise ValueError(f"Missing required key: {key}")
+        return decision
     
     @staticmethod
     def parse_ai_decision(raw_response: str) -> dict:
@@ -15,21 +36,7 @@ class JSONParser:
             clean_str = re.sub(r"```\s*", "", clean_str).strip()
             
             decision = json.loads(clean_str)
-            
-            # Validate required keys exist to prevent downstream KeyError
-            required_keys = [
-                "action",
-                "confidence",
-                "reasoning",
-                "entry_poi",
-                "target_liquidity",
-                "stop_reference",
-            ]
-            for key in required_keys:
-                if key not in decision:
-                    raise ValueError(f"Missing required key: {key}")
-                    
-            return decision
+            return JSONParser.validate(decision)
             
         except json.JSONDecodeError as e:
             logger.error(f"Failed to decode LLM JSON: {e}. Raw Output: {raw_response}")
@@ -38,6 +45,33 @@ class JSONParser:
             logger.error(f"Validation error in AI output: {e}")
             return JSONParser.fallback_wait()
 
+    @staticmethod
+    def parse_batch_decisions(raw_response: str, size: int) -> dict[int, dict]:
+        """
+        Entries of a ``{"decisions": [{"id": ..., ...}]}`` answer by id. Ids outside
+        ``range(size)``, repeated ids and entries failing ``validate`` are left out.
+        """
+        try:
+            clean_str = re.sub(r"```(json)?\s*", "", raw_response).strip()
+            payload = json.loads(clean_str)
+        except (json.JSONDecodeError, TypeError) as e:
+            logger.error(f"Failed to decode LLM batch JSON: {e}. Raw Output: {raw_response}")
+            return {}
+        entries = payload.get("decisions") if isinstance(payload, dict) else payload
+        if not isinstance(entries, list):
+            logger.error("LLM batch output has no decisions array")
+            return {}
+        decisions = {}
+        for entry in entries:
+            entry_id = entry.get("id") if isinstance(entry, dict) else None
+            if not isinstance(entry_id, int) or not 0 <= entry_id < size or entry_id in decisions:
+                continue
+            try:
+                decisions[entry_id] = JSONParser.validate({key: entry[key] for key in entry if key != "id"})
+            except ValueError as e:
+                logger.error(f"Validation error in AI batch entry {entry_id}: {e}")
+        return decisions
+
     @staticmethod
     def fallback_wait() -> dict:
         """The ultimate fail-safe if the AI outputs garbage."""
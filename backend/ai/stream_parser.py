@@ -0,0 +1,141 @@
+"""
+Incremental parser for streamed model output.
+
+Tokens are fed as they arrive. ``<think>`` reasoning blocks are dropped, even when a tag is
+split across chunks, and the visible text is scanned for balanced ``{...}`` objects while
+tracking string literals and escapes. The first object that decodes and validates as an
+``AIDecision`` is the answer, so the caller can stop the generation right away instead of
+waiting for whatever the model emits after it.
+"""
+from __future__ import annotations
+
+import json
+import re
+
+from ai.parser import JSONParser
+from models.schemas import AIDecision
+
+THINK_OPEN = "<think>"
+THINK_CLOSE = "</think>"
+STRUCTURAL = re.compile(r'[{}"\\]')
+
+
+def _partial_tag(text: str, tag: str) -> int:
+    """Length of the longest suffix of ``text`` that is a proper prefix of ``tag``."""
+    start = text.find("<", max(0, len(text) - len(tag) + 1))
+    while start >= 0:
+        if tag.startswith(text[start:]):
+            return len(text) - start
+        start = text.find("<", start + 1)
+    return 0
+
+
+class StreamingDecisionParser:
+    """
+    Feed chunks with ``feed``; it returns the decision dict once a valid object is complete.
+    """
+
+    def __init__(self):
+        self.decision_text: str | None = None
+        self.tokens = 0
+        self._parts: list[str] = []
+        self._length = 0
+        self._pending = ""
+        self._in_think = False
+        # Absolute offset of the open candidate object and its text so far.
+        self._start: int | None = None
+        self._candidate: list[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = -1
+
+    @property
+    def text(self) -> str:
+        """All visible text so far, reasoning blocks removed."""
+        return "".join(self._parts)
+
+    def feed(self, chunk: str) -> dict | None:
+        self.tokens += 1
+        if not self._pending and "<" not in chunk:
+            # Common case: no tag can start here, so the chunk is all reasoning or all visible.
+            return None if self._in_think else self._scan(chunk)
+        buffer, self._pending = self._pending + chunk, ""
+        visible = []
+        while buffer:
+            tag = THINK_CLOSE if self._in_think else THINK_OPEN
+            found = buffer.find(tag)
+            if found < 0:
+                # Hold back a possible partial tag until the next chunk decides it.
+                keep = _partial_tag(buffer, tag)
+                head, self._pending = buffer[: len(buffer) - keep], buffer[len(buffer) - keep :]
+                buffer = ""
+            else:
+                head, buffer = buffer[:found], buffer[found + len(tag) :]
+            if not self._in_think:
+                visible.append(head)
+            if found >= 0:
+                self._in_think = not self._in_think
+        return self._scan("".join(visible))
+
+    def finish(self) -> dict | None:
+        """Flushes a held-back partial tag at the end of the stream."""
+        pending, self._pending = self._pending, ""
+        if self._in_think or not pending:
+            return None
+        return self._scan(pending)
+
+    def _scan(self, visible: str) -> dict | None:
+        if self.decision_text is not None or not visible:
+            return None
+        # Each chunk is scanned once; offsets are absolute so escapes carry across chunks.
+        base = self._length
+        self._parts.append(visible)
+        self._length += len(visible)
+        if self._start is not None:
+            self._candidate.append(visible)
+        index = 0
+        while True:
+            if self._start is None:
+                index = visible.find("{", index)
+                if index < 0:
+                    return None
+                self._start, self._depth, self._in_string = base + index, 1, False
+                self._candidate = [visible[index:]]
+                index += 1
+                continue
+            # Only quotes, backslashes and braces change the state; jump between them.
+            match = STRUCTURAL.search(visible, index)
+            if match is None:
+                return None
+            index = match.end()
+            char = match.group()
+            if base + match.start() == self._escaped:
+                continue
+            if self._in_string:
+                if char == "\\":
+                    self._escaped = base + index
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    candidate = "".join(self._candidate)[: base + index - self._start]
+                    self._start, self._candidate = None, []
+                    decision = self._validate(candidate)
+                    if decision is not None:
+                        self.decision_text = candidate
+                        return decision
+
+    @staticmethod
+    def _validate(candidate: str) -> dict | None:
+        try:
+            decision = JSONParser.validate(json.loads(candidate))
+            AIDecision.model_validate(decision)
+        except ValueError:
+            # pydantic's ValidationError and JSONDecodeError are both ValueErrors.
+            return None
+        return decision
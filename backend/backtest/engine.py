@@ -0,0 +1,242 @@
+"""
+Offline replay of stored candles through the execution checklist, a decision policy and
+the live trade math.
+
+Signals come from one vectorized pass over the whole history (``backtest.signals``); the
+policy is only consulted on bars where the checklist passes, and every accepted decision
+goes through ``plan_trade``, the same stop-buffer/RR/sizing code ``PositionManager`` uses.
+Exits are resolved for all trades at once against the following bars.
+
+Run from backend/:
+    python -m backtest.engine --cache-dir data/candles --symbol BTC/USDT --timeframe 5m
+"""
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import logging
+import math
+from dataclasses import dataclass, fields
+
+import ccxt
+import numpy as np
+import pandas as pd
+
+from backtest.policies import CachedDecisionPolicy, RuleBasedPolicy
+from backtest.signals import checklist_signals, market_state_at
+from core.config import settings
+from execution.position_manager import plan_trade
+from strategy.candle_cache import CandleCache
+from strategy.candle_store import CandleSnapshot
+from strategy.liquidity import find_liquidity_targets
+from strategy.sessions import SessionManager
+
+logger = logging.getLogger("openclaw.backtest")
+
+MS_PER_DAY = 24 * 60 * 60 * 1000
+
+
+def simulate_exits(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    entry_rows: np.ndarray,
+    is_long: np.ndarray,
+    stop_loss: np.ndarray,
+    take_profit: np.ndarray,
+    horizon: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (exit_row, exit_price, reason) per trade entered at the close of ``entry_rows``.
+
+    The stop or target is checked on each of the next ``horizon`` bars; a bar touching both
+    counts as a stop. Untouched trades exit at the close of bar ``entry + horizon`` ("TIME"),
+    or stay "OPEN" when the history ends first. Fills are at the level itself, gaps ignored.
+    """
+    size = len(close)
+    rows = entry_rows[:, None] + np.arange(1, horizon + 1)[None, :]
+    in_history = rows < size
+    rows = np.minimum(rows, size - 1)
+    long_ = is_long[:, None]
+    stop_hit = np.where(long_, low[rows] <= stop_loss[:, None], high[rows] >= stop_loss[:, None]) & in_history
+    target_hit = np.where(long_, high[rows] >= take_profit[:, None], low[rows] <= take_profit[:, None]) & in_history
+
+    touched = stop_hit | target_hit
+    first = touched.argmax(axis=1)
+    trades = np.arange(len(entry_rows))
+    hit = touched[trades, first]
+    stopped = hit & stop_hit[trades, first]
+
+    expired = entry_rows + horizon
+    exit_row = np.where(hit, entry_rows + 1 + first, np.minimum(expired, size - 1))
+    reason = np.where(stopped, "STOP", np.where(hit, "TARGET", np.where(expired < size, "TIME", "OPEN")))
+    exit_price = np.where(stopped, stop_loss, np.where(hit, take_profit, close[exit_row]))
+    return exit_row, exit_price, reason
+
+
+def summarize(trades: pd.DataFrame) -> dict:
+    """R-multiple statistics over closed trades, in exit order."""
+    closed = trades[trades["exit_reason"] != "OPEN"].sort_values("exit_row")
+    r_multiple = closed["r_multiple"].to_numpy()
+    equity = np.cumsum(r_multiple)
+    drawdown = np.maximum.accumulate(np.concatenate(([0.0], equity)))[1:] - equity
+    gains, losses = r_multiple[r_multiple > 0].sum(), -r_multiple[r_multiple < 0].sum()
+    return {
+        "trades": int(len(closed)),
+        "open_trades": int(len(trades) - len(closed)),
+        "win_rate": float((r_multiple > 0).mean()) if len(closed) else 0.0,
+        "total_r": float(equity[-1]) if len(closed) else 0.0,
+        "avg_r": float(r_multiple.mean()) if len(closed) else 0.0,
+        "max_drawdown_r": float(drawdown.max()) if len(closed) else 0.0,
+        "profit_factor": float(gains / losses) if losses else math.inf if gains else 0.0,
+        "exits": {str(reason): int(count) for reason, count in closed["exit_reason"].value_counts().items()},
+    }
+
+
+@dataclass
+class BacktestReport:
+    trades: pd.DataFrame
+    stats: dict
+
+
+class Backtester:
+    """
+    Replays a candle history through the checklist, a decision policy and the live trade math.
+    """
+
+    def __init__(
+        self,
+        policy,
+        symbol: str = settings.TRADING_SYMBOL,
+        timeframe: str = settings.TRADING_TIMEFRAME,
+        window: int = settings.MAX_CANDLES,
+        swing_lookback: int = 5,
+        displacement_threshold: float = 0.7,
+        account_balance: float = settings.DEFAULT_ACCOUNT_BALANCE,
+        risk_percent: float = settings.RISK_PER_TRADE_PERCENT,
+        min_rr_ratio: float = settings.MIN_RR_RATIO,
+        max_trade_duration_mins: int = settings.MAX_TRADE_DURATION_MINS,
+        max_daily_drawdown_r: float = settings.MAX_DAILY_DRAWDOWN_R,
+        killzone_gating: bool = settings.KILLZONE_GATING_ENABLED,
+        liquidity_history: int = 2000,
+    ):
+        self.policy = policy
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.window = window
+        self.swing_lookback = swing_lookback
+        self.displacement_threshold = displacement_threshold
+        self.account_balance = account_balance
+        self.risk_percent = risk_percent
+        self.min_rr_ratio = min_rr_ratio
+        self.max_daily_drawdown_r = max_daily_drawdown_r
+        self.killzone_gating = killzone_gating
+        self.liquidity_history = liquidity_history
+        self.timeframe_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        # Same time stop as RiskGuard.enforce_time_stops, in whole bars after the entry candle.
+        self.horizon = max(1, math.ceil(max_trade_duration_mins * 60_000 / self.timeframe_ms))
+
+    def _candidate_rows(self, candles: CandleSnapshot, signals: dict) -> np.ndarray:
+        rows = np.flatnonzero(signals["valid"])
+        if self.killzone_gating:
+            close_ms = candles.timestamp[rows] + self.timeframe_ms
+            rows = rows[SessionManager().killzone_mask(close_ms)]
+        return rows
+
+    def _plans(self, candles: CandleSnapshot, signals: dict, rows: np.ndarray) -> list[tuple[int, dict]]:
+        plans = []
+        for row in rows.tolist():
+            price = float(candles.close[row])
+            state = market_state_at(candles, signals, row, self.symbol, self.timeframe)
+            start = max(0, row + 1 - self.liquidity_history)
+            history = CandleSnapshot(
+                *(getattr(candles, field.name)[start : row + 1] for field in fields(CandleSnapshot))
+            )
+            state.liquidity_targets, state.bpr_zones = find_liquidity_targets(history, price)
+            decision = self.policy.decide(state, price)
+            plan = plan_trade(decision, price, self.account_balance, self.risk_percent, self.min_rr_ratio)
+            if plan["status"] == "planned":
+                plans.append((row, plan))
+        return plans
+
+    def _apply_killswitch(self, trades: pd.DataFrame) -> pd.DataFrame:
+        """Drops entries taken once the day's realized R reached -max_daily_drawdown_r (RiskGuard's rule)."""
+        entry_time, exit_time = trades["entry_time"].to_numpy(), trades["exit_time"].to_numpy()
+        r_multiple, open_ = trades["r_multiple"].to_numpy(), (trades["exit_reason"] == "OPEN").to_numpy()
+        keep = np.zeros(len(trades), dtype=bool)
+        pending: list[tuple[int, float]] = []
+        realized: dict[int, float] = {}
+        for index in range(len(trades)):
+            while pending and pending[0][0] <= entry_time[index]:
+                closed_at, result = heapq.heappop(pending)
+                realized[closed_at // MS_PER_DAY] = realized.get(closed_at // MS_PER_DAY, 0.0) + result
+            keep[index] = realized.get(entry_time[index] // MS_PER_DAY, 0.0) > -self.max_daily_drawdown_r
+            if keep[index] and not open_[index]:
+                heapq.heappush(pending, (int(exit_time[index]), float(r_multiple[index])))
+        return trades[keep].reset_index(drop=True)
+
+    def run(self, candles: CandleSnapshot) -> BacktestReport:
+        signals = checklist_signals(candles, self.window, self.swing_lookback, self.displacement_threshold)
+        rows = self._candidate_rows(candles, signals)
+        plans = self._plans(candles, signals, rows)
+
+        entry_rows = np.array([row for row, _ in plans], dtype=np.int64)
+        is_long = np.array([plan["action"] == "LONG" for _, plan in plans], dtype=bool)
+        entry = np.array([plan["entry_price"] for _, plan in plans], dtype=np.float64)
+        stop_loss = np.array([plan["stop_loss"] for _, plan in plans], dtype=np.float64)
+        take_profit = np.array([plan["take_profit"] for _, plan in plans], dtype=np.float64)
+        risk_distance = np.array([plan["risk_distance"] for _, plan in plans], dtype=np.float64)
+        exit_row, exit_price, reason = simulate_exits(
+            candles.high, candles.low, candles.close, entry_rows, is_long, stop_loss, take_profit, self.horizon
+        )
+        direction = np.where(is_long, 1.0, -1.0)
+        trades = pd.DataFrame(
+            {
+                "entry_row": entry_rows,
+                "entry_time": candles.timestamp[entry_rows] + self.timeframe_ms,
+                "action": np.where(is_long, "LONG", "SHORT"),
+                "entry_price": entry,
+                "stop_loss": stop_loss,
+                "take_profit": take_profit,
+                "position_size": np.array([plan["position_size"] for _, plan in plans], dtype=np.float64),
+                "exit_row": exit_row,
+                "exit_time": candles.timestamp[exit_row] + self.timeframe_ms,
+                "exit_price": exit_price,
+                "exit_reason": reason,
+                "r_multiple": direction * (exit_price - entry) / risk_distance,
+            }
+        )
+        trades = self._apply_killswitch(trades)
+        stats = summarize(trades)
+        stats["signals"] = int(signals["valid"].sum())
+        stats["policy_calls"] = int(len(rows))
+        stats["skipped_killswitch"] = int(len(plans) - len(trades))
+        logger.info(
+            "Backtest %s %s: %d bars, %d signals, %d trades, %.2fR",
+            self.symbol, self.timeframe, len(candles), stats["signals"], stats["trades"], stats["total_r"],
+        )
+        return BacktestReport(trades=trades, stats=stats)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backtest the execution checklist over cached candles.")
+    parser.add_argument("--cache-dir", default=settings.CANDLE_CACHE_DIR)
+    parser.add_argument("--symbol", default=settings.TRADING_SYMBOL)
+    parser.add_argument("--timeframe", default=settings.TRADING_TIMEFRAME)
+    parser.add_argument("--decisions", help="JSONL of recorded LLM decisions; default is the rule-based policy.")
+    parser.add_argument("--trades-csv", help="Write the trade list here.")
+    args = parser.parse_args()
+    if not args.cache_dir:
+        parser.error("--cache-dir (or CANDLE_CACHE_DIR) is required")
+
+    candles = CandleCache(args.cache_dir, args.symbol, args.timeframe).read()
+    policy = CachedDecisionPolicy.from_jsonl(args.decisions) if args.decisions else RuleBasedPolicy()
+    report = Backtester(policy, symbol=args.symbol, timeframe=args.timeframe).run(candles)
+    if args.trades_csv:
+        report.trades.to_csv(args.trades_csv, index=False)
+    print(json.dumps({"bars": len(candles), **report.stats}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
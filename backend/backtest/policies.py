@@ -0,0 +1,77 @@
+"""
+Decision policies the backtester can plug in where the live pipeline asks the LLM.
+
+A policy is any object with ``decide(market_state, current_price) -> AIDecision``.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from core.config import settings
+from models.schemas import AIDecision, MarketState
+
+
+def _wait(reasoning: str) -> AIDecision:
+    return AIDecision(action="WAIT", confidence=0, reasoning=reasoning)
+
+
+class RuleBasedPolicy:
+    """
+    Deterministic stand-in for the LLM: takes every valid setup toward the nearest
+    un-swept liquidity pool on its side that still clears ``min_rr_ratio``.
+    """
+
+    def __init__(self, min_rr_ratio: float = settings.MIN_RR_RATIO):
+        self.min_rr_ratio = min_rr_ratio
+
+    def decide(self, market_state: MarketState, current_price: float) -> AIDecision:
+        if not market_state.valid_poi_found or market_state.stop_reference is None:
+            return _wait("No valid setup.")
+
+        is_long = market_state.setup_type.startswith("BULLISH")
+        # Same stop buffer as plan_trade, so the target is only picked if the trade would be accepted.
+        stop_loss = market_state.stop_reference * (0.999 if is_long else 1.001)
+        risk_distance = current_price - stop_loss if is_long else stop_loss - current_price
+        if risk_distance <= 0:
+            return _wait("Stop is on the wrong side of price.")
+
+        side = "BUY_SIDE" if is_long else "SELL_SIDE"
+        for pool in market_state.liquidity_targets:
+            if pool.side != side:
+                continue
+            reward_distance = pool.price - current_price if is_long else current_price - pool.price
+            if reward_distance / risk_distance >= self.min_rr_ratio:
+                return AIDecision(
+                    action="LONG" if is_long else "SHORT",
+                    confidence=100,
+                    reasoning=f"{market_state.setup_type} toward {side} liquidity at {pool.price:.2f}.",
+                    target_liquidity=pool.price,
+                    stop_reference=market_state.stop_reference,
+                )
+        return _wait("No liquidity target far enough for the required RR.")
+
+
+class CachedDecisionPolicy:
+    """
+    Replays recorded LLM answers keyed by (symbol, candle timestamp); unknown candles WAIT.
+    """
+
+    def __init__(self, decisions: dict[tuple[str, str], AIDecision]):
+        self.decisions = decisions
+
+    @classmethod
+    def from_jsonl(cls, path: str | Path) -> CachedDecisionPolicy:
+        """One ``{"symbol", "timestamp" (ISO 8601), "decision": AIDecision}`` object per line."""
+        decisions = {}
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                decisions[(record["symbol"], record["timestamp"])] = AIDecision.model_validate(record["decision"])
+        return cls(decisions)
+
+    def decide(self, market_state: MarketState, current_price: float) -> AIDecision:
+        key = (market_state.symbol, market_state.timestamp.isoformat())
+        return self.decisions.get(key) or _wait("No cached decision for this candle.")
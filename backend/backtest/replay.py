@@ -0,0 +1,240 @@
+"""
+Replays a pipeline log written by ``core.recorder.PipelineRecorder`` through
+``worker.on_candle_close`` with every I/O edge stubbed from the log.
+
+Ollama, the exchange, the killswitch query and event publishing return what was recorded;
+trades go to an in-memory SQLite database; the settings in force at recording time are
+restored for the run. Nothing sleeps or waits on a socket, so the pipeline runs as fast as
+the CPU allows. Higher-timeframe context is resampled again from the recorded windows.
+Every replayed ``MarketState`` and event is compared with the recording,
+which makes a log doubling as a deterministic end-to-end regression and throughput test.
+
+Per-feed worker state starts empty and the disk candle cache is not read, so FVG zones
+or liquidity pools that were drawn from history older than the first recorded window
+can differ; they are reported like any other mismatch.
+
+Logs recorded with ``LLM_MAX_BATCH`` above 1 are refused: a batched Ollama response is stored
+only with the candle whose evaluation held the slot, so the candles that rode along have none.
+
+Run from backend/: python -m backtest.replay path/to/pipeline.jsonl.gz
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import json
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import worker
+from ai.decision_cache import DecisionCache
+from ai.llm_scheduler import LLMScheduler
+from core.config import settings
+from core.database import Base
+from core.recorder import collect, decode_window, record
+from strategy.resampler import IncrementalResampler
+
+COMPARED = ("market_state", "events")
+
+
+def read_log(path: str | Path):
+    path = Path(path)
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _comparable(values: list) -> list:
+    # Wall-clock stamps (event time, short-window fallbacks) are the only non-deterministic fields.
+    return [{key: value for key, value in item.items() if key != "timestamp"} for item in values]
+
+
+@contextmanager
+def _patched(target, **attributes):
+    saved = {name: getattr(target, name) for name in attributes}
+    for name, value in attributes.items():
+        setattr(target, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(target, name, value)
+
+
+class _Tape:
+    """Recorded I/O results for the candle being replayed, consumed in order."""
+
+    def __init__(self):
+        self.entry: dict = {}
+        self.queues: dict[str, deque] = {}
+
+    def load(self, entry: dict) -> None:
+        self.entry = entry
+        self.queues = {kind: deque(entry.get(kind, ())) for kind in ("killswitch", "ollama", "orders")}
+
+    def next(self, kind: str):
+        queue = self.queues.get(kind)
+        if not queue:
+            raise RuntimeError(f"replay log has no {kind} result left for this candle")
+        return queue.popleft()
+
+    def killswitch(self, db) -> bool:
+        return self.next("killswitch")
+
+    async def generate(self, payload: dict):
+        response = self.next("ollama")
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response["status"], response["response"]
+
+    def orders(self, **kwargs) -> dict:
+        return dict(self.next("orders"))
+
+
+async def _publish(event) -> None:
+    record("events", event.model_dump(mode="json"))
+
+
+def _recorded_cache() -> DecisionCache | None:
+    # An empty decision cache as configured when the log was recorded, so hits replay in order.
+    if not settings.DECISION_CACHE_ENABLED:
+        return None
+    return DecisionCache(
+        settings.DECISION_CACHE_SIZE,
+        settings.DECISION_CACHE_TTL_SECS,
+        settings.DECISION_CACHE_PRICE_PCT,
+        worker.ai_brain.guide_hash,
+    )
+
+
+def _recorded_resampler() -> IncrementalResampler | None:
+    # A fresh HTF resampler for the timeframes the log was recorded with.
+    timeframes = worker._split_csv(settings.HTF_TIMEFRAMES)
+    if not timeframes:
+        return None
+    resampler = IncrementalResampler(settings.TRADING_TIMEFRAME, timeframes, settings.MAX_CANDLES)
+    resampler.subscribe(worker.update_htf_context)
+    return resampler
+
+
+@contextmanager
+def stubbed_worker(tape):
+    """
+    Worker with all I/O swapped out: ``tape`` serves ``killswitch(db)``, ``generate(payload)``
+    and ``orders(**kwargs)``; events are only recorded and trades go to in-memory SQLite.
+    """
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    with (
+        _patched(
+            worker,
+            SessionLocal=sessionmaker(bind=engine, autocommit=False, autoflush=False),
+            publish_event=_publish,
+            pipeline_recorder=None,
+            # Recorded candles are in the past; a frozen clock keeps every deadline open.
+            llm_scheduler=LLMScheduler(worker.ai_brain, max_concurrency=1, clock=lambda: 0.0),
+            incremental_engines={},
+            fvg_indexes={},
+            feature_windows={},
+            htf_resampler=_recorded_resampler(),
+            htf_context={},
+            htf_incremental_engines={},
+            htf_feature_windows={},
+        ),
+        _patched(worker.feed_multiplexer, feeds={}),
+        _patched(worker.risk_guard, check_daily_killswitch=tape.killswitch),
+        _patched(worker.ai_brain, _generate=tape.generate, decision_cache=_recorded_cache()),
+        _patched(
+            worker.position_manager,
+            _place_binance_orders=tape.orders,
+            risk_percent=worker.position_manager.risk_percent,
+            min_rr_ratio=worker.position_manager.min_rr_ratio,
+        ),
+    ):
+        try:
+            yield
+        finally:
+            engine.dispose()
+
+
+async def replay(path: str | Path) -> dict:
+    """Runs every recorded candle through the pipeline; returns throughput and mismatches."""
+    tape = _Tape()
+    windows = {}
+    mismatches = []
+    candles = 0
+    pipeline_seconds = 0.0
+    with stubbed_worker(tape):
+        saved_settings = settings.model_dump()
+        try:
+            for entry in read_log(path):
+                if "settings" in entry:
+                    for name, value in entry["settings"].items():
+                        setattr(settings, name, value)
+                    if settings.LLM_MAX_BATCH > 1:
+                        raise ValueError(
+                            f"log was recorded with LLM_MAX_BATCH={settings.LLM_MAX_BATCH}; batched Ollama "
+                            "responses are not recorded per candle and cannot be replayed"
+                        )
+                    # Sized at import time in the worker.
+                    worker.position_manager.risk_percent = settings.RISK_PER_TRADE_PERCENT
+                    worker.position_manager.min_rr_ratio = settings.MIN_RR_RATIO
+                    worker.ai_brain.decision_cache = _recorded_cache()
+                    worker.htf_resampler = _recorded_resampler()
+                    continue
+                key = (entry["symbol"], entry["timeframe"])
+                locked = windows[key] = decode_window(entry["window"], windows.get(key))
+                tape.load(entry)
+                started = time.perf_counter()
+                with collect() as replayed:
+                    await worker.on_candle_close(locked, symbol=entry["symbol"], timeframe=entry["timeframe"])
+                pipeline_seconds += time.perf_counter() - started
+                for kind in COMPARED:
+                    if _comparable(replayed.get(kind, [])) != _comparable(entry.get(kind, [])):
+                        mismatches.append(
+                            {
+                                "candle": candles,
+                                "symbol": entry["symbol"],
+                                "timestamp": int(locked.timestamp[-1]),
+                                "kind": kind,
+                                "recorded": entry.get(kind, []),
+                                "replayed": replayed.get(kind, []),
+                            }
+                        )
+                candles += 1
+        finally:
+            for name, value in saved_settings.items():
+                setattr(settings, name, value)
+    return {
+        "candles": candles,
+        "pipeline_seconds": pipeline_seconds,
+        "candles_per_second": candles / pipeline_seconds if pipeline_seconds else 0.0,
+        "mismatches": mismatches,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay a recorded worker pipeline log.")
+    parser.add_argument("path")
+    args = parser.parse_args()
+    report = asyncio.run(replay(args.path))
+    summary = {key: value for key, value in report.items() if key != "mismatches"}
+    summary["mismatches"] = len(report["mismatches"])
+    print(json.dumps(summary, indent=2))
+    for mismatch in report["mismatches"][:10]:
+        print(json.dumps(mismatch, default=str))
+    sys.exit(1 if report["mismatches"] else 0)
+
+
+if __name__ == "__main__":
+    main()
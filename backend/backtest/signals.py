@@ -0,0 +1,89 @@
+"""
+The execution checklist evaluated for every bar of a history in one vectorized pass.
+
+Bar ``i`` gets exactly the ``MarketState`` the live pipeline would build from a locked
+``window``-candle snapshot ending at ``i``: FVG flags only read bars ``i-2..i``, and a swing
+at ``j`` counts once it is confirmed (``j + k <= i``) and while its centered window still
+starts inside the snapshot (``j - k >= i - window + 1``).
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import numpy as np
+
+from models.schemas import FVGZone, MarketState
+from strategy.candle_store import CandleSnapshot
+from strategy.quant_kernels import detect_fair_value_gaps, detect_swing_points
+
+
+def _last_swing_in_window(values: np.ndarray, flags: np.ndarray, window: int, swing_lookback: int) -> np.ndarray:
+    size = len(values)
+    rows = np.arange(size)
+    positions = np.where(flags, rows, -1)
+    np.maximum.accumulate(positions, out=positions)
+    confirmed = np.full(size, -1)
+    confirmed[swing_lookback:] = positions[: size - swing_lookback]
+    valid = (confirmed >= 0) & (confirmed - swing_lookback >= rows - window + 1)
+    return np.where(valid, values[confirmed], np.nan)
+
+
+def checklist_signals(
+    candles: CandleSnapshot,
+    window: int,
+    swing_lookback: int = 5,
+    displacement_threshold: float = 0.7,
+) -> dict:
+    """Per-bar checklist columns as seen through a sliding ``window``-candle snapshot."""
+    open_, high, low, close = candles.open, candles.high, candles.low, candles.close
+    rows = np.arange(len(close))
+    fvg = detect_fair_value_gaps(open_, high, low, close)
+    swing_high, swing_low = detect_swing_points(high, low, swing_lookback)
+    last_swing_high = _last_swing_in_window(high, swing_high, window, swing_lookback)
+    last_swing_low = _last_swing_in_window(low, swing_low, window, swing_lookback)
+
+    range_size = high - low
+    with np.errstate(divide="ignore", invalid="ignore"):
+        displacement = (range_size != 0) & (np.abs(close - open_) / range_size > displacement_threshold)
+    enough_rows = np.minimum(rows + 1, window) >= 5
+    bullish = (close > last_swing_high) & displacement & (close > open_) & fvg["bullish"] & enough_rows
+    bearish = (close < last_swing_low) & displacement & (close < open_) & fvg["bearish"] & enough_rows
+    return {
+        **fvg,
+        "last_swing_high": last_swing_high,
+        "last_swing_low": last_swing_low,
+        "valid": bullish | bearish,
+        "bullish_setup": bullish,
+        "stop_reference": np.where(bullish, fvg["bullish_btm"], np.where(bearish, fvg["bearish_top"], np.nan)),
+    }
+
+
+def _maybe_float(value) -> float | None:
+    return None if np.isnan(value) else float(value)
+
+
+def market_state_at(candles: CandleSnapshot, signals: dict, row: int, symbol: str, timeframe: str) -> MarketState:
+    """The ``MarketState`` for bar ``row`` built from precomputed checklist columns."""
+    valid = bool(signals["valid"][row])
+    setup_type = None
+    if valid:
+        direction = "BULLISH" if signals["bullish_setup"][row] else "BEARISH"
+        setup_type = f"{direction}_MSS_WITH_DISPLACEMENT"
+    return MarketState(
+        timestamp=datetime.fromtimestamp(int(candles.timestamp[row]) / 1000, tz=timezone.utc),
+        symbol=symbol,
+        timeframe=timeframe,
+        valid_poi_found=valid,
+        setup_type=setup_type,
+        stop_reference=_maybe_float(signals["stop_reference"][row]),
+        closest_bullish_fvg=FVGZone(
+            top=_maybe_float(signals["bullish_top"][row]),
+            bottom=_maybe_float(signals["bullish_btm"][row]),
+        ),
+        closest_bearish_fvg=FVGZone(
+            top=_maybe_float(signals["bearish_top"][row]),
+            bottom=_maybe_float(signals["bearish_btm"][row]),
+        ),
+        last_swing_high=_maybe_float(signals["last_swing_high"][row]),
+        last_swing_low=_maybe_float(signals["last_swing_low"][row]),
+    )
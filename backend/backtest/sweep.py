@@ -0,0 +1,155 @@
+"""
+Parameter-grid sweep of the backtester across a process pool.
+
+The candle columns are copied once into a single shared-memory block; each worker maps
+it read-only in its initializer, so a task only ships its parameter dict and returns a
+stats dict. Tasks are independent and CPU-bound, which keeps the speed-up close to
+linear in the number of cores.
+
+Run from backend/:
+    python -m backtest.sweep --cache-dir data/candles --grid swing_lookback=3,5,8 --grid min_rr_ratio=2,3
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from backtest.engine import Backtester
+from backtest.policies import RuleBasedPolicy
+from core.config import settings
+from strategy.candle_cache import CandleCache
+from strategy.candle_store import CandleSnapshot
+
+logger = logging.getLogger("openclaw.sweep")
+
+COLUMNS = tuple(field.name for field in fields(CandleSnapshot))
+# Backtester arguments a grid may vary.
+SWEEP_PARAMETERS = (
+    "window",
+    "swing_lookback",
+    "displacement_threshold",
+    "min_rr_ratio",
+    "risk_percent",
+    "max_trade_duration_mins",
+    "max_daily_drawdown_r",
+    "killzone_gating",
+)
+
+# Per-worker state set by _attach.
+_shared: shared_memory.SharedMemory | None = None
+_candles: CandleSnapshot | None = None
+_context: dict = {}
+
+
+def _views(buffer, size: int) -> CandleSnapshot:
+    """Column arrays over one buffer laid out as int64 timestamps followed by float64 OHLCV."""
+    columns = []
+    for index, column in enumerate(COLUMNS):
+        dtype = np.int64 if column == "timestamp" else np.float64
+        view = np.ndarray((size,), dtype=dtype, buffer=buffer, offset=index * size * 8)
+        view.flags.writeable = False
+        columns.append(view)
+    return CandleSnapshot(*columns)
+
+
+def _attach(name: str, size: int, context: dict) -> None:
+    global _shared, _candles, _context
+    # Pool workers share the parent's resource tracker, so attaching does not take ownership.
+    _shared = shared_memory.SharedMemory(name=name)
+    _candles = _views(_shared.buf, size)
+    _context = context
+
+
+def _run(params: dict) -> dict:
+    min_rr_ratio = params.get("min_rr_ratio", settings.MIN_RR_RATIO)
+    backtester = Backtester(RuleBasedPolicy(min_rr_ratio), **_context, **params)
+    return {**params, **backtester.run(_candles).stats}
+
+
+def expand_grid(grid: dict[str, list]) -> list[dict]:
+    """Cartesian product of ``{parameter: values}`` as a list of parameter dicts."""
+    unknown = sorted(set(grid) - set(SWEEP_PARAMETERS))
+    if unknown:
+        raise ValueError(f"unknown sweep parameters {unknown}; expected a subset of {SWEEP_PARAMETERS}")
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def run_sweep(
+    candles: CandleSnapshot,
+    grid: dict[str, list],
+    symbol: str = settings.TRADING_SYMBOL,
+    timeframe: str = settings.TRADING_TIMEFRAME,
+    workers: int | None = None,
+    rank_by: str = "total_r",
+) -> pd.DataFrame:
+    """
+    Backtests every grid point with the rule-based policy and returns one row per point,
+    best ``rank_by`` first.
+    """
+    combinations = expand_grid(grid)
+    workers = min(workers or os.cpu_count() or 1, len(combinations)) or 1
+    size = len(candles)
+    shared = shared_memory.SharedMemory(create=True, size=max(1, len(COLUMNS) * size * 8))
+    try:
+        target = _views(shared.buf, size)
+        for column in COLUMNS:
+            target[column].flags.writeable = True
+            target[column][:] = candles[column]
+        del target
+        context = {"symbol": symbol, "timeframe": timeframe}
+        with ProcessPoolExecutor(workers, initializer=_attach, initargs=(shared.name, size, context)) as pool:
+            rows = list(pool.map(_run, combinations, chunksize=max(1, len(combinations) // (workers * 4))))
+    finally:
+        shared.close()
+        shared.unlink()
+
+    logger.info("Sweep finished: %d combinations over %d bars on %d workers", len(rows), size, workers)
+    results = pd.DataFrame(rows)
+    if "exits" in results:
+        results = results.drop(columns="exits")
+    return results.sort_values(rank_by, ascending=False, kind="stable").reset_index(drop=True)
+
+
+def _parse_value(text: str):
+    lowered = text.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sweep backtest parameters over cached candles.")
+    parser.add_argument("--cache-dir", default=settings.CANDLE_CACHE_DIR)
+    parser.add_argument("--symbol", default=settings.TRADING_SYMBOL)
+    parser.add_argument("--timeframe", default=settings.TRADING_TIMEFRAME)
+    parser.add_argument("--grid", action="append", default=[], help="name=v1,v2,... (repeatable)")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--rank-by", default="total_r")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+    if not args.cache_dir:
+        parser.error("--cache-dir (or CANDLE_CACHE_DIR) is required")
+
+    grid = {}
+    for item in args.grid:
+        name, _, values = item.partition("=")
+        grid[name.strip()] = [_parse_value(value.strip()) for value in values.split(",")]
+    candles = CandleCache(args.cache_dir, args.symbol, args.timeframe).read()
+    results = run_sweep(candles, grid, args.symbol, args.timeframe, args.workers, args.rank_by)
+    print(results.head(args.top).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
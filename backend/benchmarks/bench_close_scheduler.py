@@ -0,0 +1,127 @@
+"""
+Close-to-callback latency and request rate: fixed 3 s polling vs CloseBoundaryScheduler.
+
+Everything runs on a simulated clock, so an hour of market time takes well under a
+second. The simulated exchange clock runs ahead of the local clock, each new candle
+only becomes visible after a random matching-engine lag, and every request pays a
+round trip.
+
+Run from backend/: python -m benchmarks.bench_close_scheduler
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import statistics
+
+from benchmarks.common import print_table
+from strategy.close_scheduler import CloseBoundaryScheduler
+from strategy.data_feed import LiveDataFeed
+
+TIMEFRAME_MS = 5 * 60 * 1000
+T0_MS = 1_767_225_600_000
+
+
+class FakeClock:
+    def __init__(self, start: float, stop: float):
+        self.now = start
+        self.stop = stop
+
+    def time(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        # Yield first so callbacks scheduled at the current instant observe the current time.
+        await asyncio.sleep(0)
+        self.now += max(seconds, 0.0)
+        if self.now >= self.stop:
+            raise asyncio.CancelledError
+
+
+class FakeExchange:
+    def __init__(self, clock: FakeClock, skew_ms: float, rtt_ms: float, seed: int = 11):
+        self.clock = clock
+        self.skew_ms = skew_ms
+        self.rtt_s = rtt_ms / 1000
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._lags: dict[int, float] = {}
+
+    def milliseconds(self) -> int:
+        return int(self.clock.time() * 1000 + self.skew_ms)
+
+    def _visible_index(self, server_ms: float) -> int:
+        index = int(server_ms // TIMEFRAME_MS)
+        lag = self._lags.setdefault(index, self._rng.uniform(20, 400))
+        return index if server_ms >= index * TIMEFRAME_MS + lag else index - 1
+
+    async def fetch_time(self) -> int:
+        self.requests += 1
+        await self.clock.sleep(self.rtt_s / 2)
+        server_ms = self.milliseconds()
+        await self.clock.sleep(self.rtt_s / 2)
+        return server_ms
+
+    async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.requests += 1
+        await self.clock.sleep(self.rtt_s / 2)
+        last = self._visible_index(self.milliseconds())
+        await self.clock.sleep(self.rtt_s / 2)
+        first = last - limit + 1 if since is None else max(since // TIMEFRAME_MS, last - limit + 1)
+        return [
+            [index * TIMEFRAME_MS, 100.0, 101.0, 99.0, 100.5, 1.0]
+            for index in range(first, last + 1)
+        ]
+
+    async def close(self) -> None:
+        return None
+
+
+async def _simulate(mode: str, hours: float, skew_ms: float, rtt_ms: float) -> dict:
+    start = (T0_MS + 37_000) / 1000
+    clock = FakeClock(start=start, stop=start + hours * 3600)
+    exchange = FakeExchange(clock, skew_ms=skew_ms, rtt_ms=rtt_ms)
+    scheduler = CloseBoundaryScheduler("5m", clock=clock.time, sleep=clock.sleep)
+    feed = LiveDataFeed(
+        symbol="BTC/USDT",
+        timeframe="5m",
+        mode="scheduled" if mode == "scheduled" else "poll",
+        exchange=exchange,
+        scheduler=scheduler,
+    )
+    latencies = []
+
+    async def on_close(locked_candles, symbol, timeframe):
+        close_ms = int(locked_candles.timestamp[-1]) + TIMEFRAME_MS
+        latencies.append(exchange.milliseconds() - close_ms)
+
+    try:
+        if mode == "scheduled":
+            await feed.start_stream(on_close)
+        else:
+            # Same loop as LiveDataFeed._run_polling, driven by the simulated clock.
+            await feed._load_window()
+            feed.last_closed_candle_time = int(feed.candles.snapshot().timestamp[-2])
+            while True:
+                await feed._poll_once(on_close)
+                await clock.sleep(feed.poll_seconds)
+    except asyncio.CancelledError:
+        pass
+
+    return {
+        "mode": mode,
+        "closes": len(latencies),
+        "mean_ms": statistics.fmean(latencies),
+        "median_ms": statistics.median(latencies),
+        "p95_ms": sorted(latencies)[int(len(latencies) * 0.95) - 1],
+        "max_ms": max(latencies),
+        "requests_per_hour": exchange.requests / hours,
+    }
+
+
+def run(hours: float = 24.0, skew_ms: float = 850.0, rtt_ms: float = 40.0) -> list[dict]:
+    return [asyncio.run(_simulate(mode, hours, skew_ms, rtt_ms)) for mode in ("poll-3s", "scheduled")]
+
+
+if __name__ == "__main__":
+    print_table(run(), ["mode", "closes", "mean_ms", "median_ms", "p95_ms", "max_ms", "requests_per_hour"])
@@ -0,0 +1,129 @@
+"""
+Per-poll merge cost of LiveDataFeed (legacy full-window refetch vs incremental upsert)
+and per-close lock cost (legacy DataFrame mask + copies vs ring-buffer snapshot).
+
+Run from backend/: python -m benchmarks.bench_feed_merge
+"""
+from __future__ import annotations
+
+import asyncio
+
+import pandas as pd
+
+from benchmarks.common import measure, print_table
+from strategy.data_feed import LiveDataFeed
+from strategy.market_structure import QuantitativeEngine
+
+OHLCV_COLUMNS = ["timestamp", "Open", "High", "Low", "Close", "Volume"]
+TIMEFRAME_MS = 5 * 60 * 1000
+POLLS_PER_CANDLE = 100  # 5m candle polled every 3 s
+
+
+class _SyntheticMarket:
+    """Deterministic candle tape where the forming candle changes on every poll."""
+
+    def __init__(self, history: int):
+        self.rows = [
+            [idx * TIMEFRAME_MS, 100.0 + idx % 7, 101.0 + idx % 7, 99.0 + idx % 7, 100.5 + idx % 7, 10.0]
+            for idx in range(history)
+        ]
+        self.tick = 0
+
+    def advance(self) -> None:
+        self.tick += 1
+        if self.tick % POLLS_PER_CANDLE == 0:
+            last = self.rows[-1]
+            self.rows.append([last[0] + TIMEFRAME_MS, last[4], last[4] + 1, last[4] - 1, last[4], 0.0])
+        forming = self.rows[-1]
+        forming[4] = forming[1] + (self.tick % 11 - 5) * 0.1
+        forming[2] = max(forming[2], forming[4])
+        forming[3] = min(forming[3], forming[4])
+        forming[5] += 1.0
+
+    def window(self, limit: int) -> list:
+        return [list(row) for row in self.rows[-limit:]]
+
+    def since(self, since_ms: int) -> list:
+        start = len(self.rows)
+        while start > 0 and self.rows[start - 1][0] >= since_ms:
+            start -= 1
+        return [list(row) for row in self.rows[start:]]
+
+
+def _legacy_frame(rows: list) -> pd.DataFrame:
+    df = pd.DataFrame(rows, columns=OHLCV_COLUMNS)
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms", utc=True)
+    df.set_index("timestamp", inplace=True)
+    return df
+
+
+def _legacy_merge(state: dict, rows: list, max_candles: int) -> None:
+    combined = pd.concat([state["df"], _legacy_frame(rows)])
+    combined = combined[~combined.index.duplicated(keep="last")]
+    combined.sort_index(inplace=True)
+    state["df"] = combined.tail(max_candles)
+
+
+def _new_feed(size: int) -> LiveDataFeed:
+    feed = LiveDataFeed(symbol="BTC/USDT", timeframe="5m", max_candles=size)
+    asyncio.run(feed.exchange.close())
+    return feed
+
+
+def run(sizes=(100, 1_000, 10_000), repeat: int = 300) -> list[dict]:
+    results = []
+    for size in sizes:
+        market = _SyntheticMarket(size + 1)
+        legacy = {"df": _legacy_frame(market.window(size))}
+
+        def legacy_poll(market=market, legacy=legacy, size=size):
+            market.advance()
+            _legacy_merge(legacy, market.window(size), size)
+
+        results.append({"max_candles": size, "path": "legacy", **measure(legacy_poll, repeat=repeat)})
+
+        market = _SyntheticMarket(size + 1)
+        feed = _new_feed(size)
+        feed._apply_rows(market.window(size))
+
+        def incremental_poll(market=market, feed=feed):
+            market.advance()
+            feed._apply_rows(market.since(feed.candles.last_timestamp))
+
+        results.append({"max_candles": size, "path": "incremental", **measure(incremental_poll, repeat=repeat)})
+    return results
+
+
+def run_lock(sizes=(100, 1_000, 10_000), repeat: int = 300) -> list[dict]:
+    """Cost of producing the pipeline's private candle frame on each close."""
+    results = []
+    for size in sizes:
+        market = _SyntheticMarket(size)
+        legacy_df = _legacy_frame(market.window(size))
+        closed = legacy_df.index[-2]
+
+        def legacy_lock(df=legacy_df, closed=closed):
+            locked = df[df.index <= closed].copy()
+            QuantitativeEngine(locked)
+
+        feed = _new_feed(size)
+        feed._apply_rows(market.window(size))
+        closed_ms = int(feed.candles.snapshot().timestamp[-2])
+
+        def snapshot_lock(feed=feed, closed_ms=closed_ms):
+            QuantitativeEngine(feed.candles.snapshot(through=closed_ms))
+
+        def snapshot_only(feed=feed, closed_ms=closed_ms):
+            feed.candles.snapshot(through=closed_ms)
+
+        for label, fn in (("legacy", legacy_lock), ("snapshot+adapter", snapshot_lock), ("snapshot", snapshot_only)):
+            results.append({"max_candles": size, "path": label, **measure(fn, repeat=repeat)})
+    return results
+
+
+if __name__ == "__main__":
+    columns = ["max_candles", "path", "mean_us", "p95_us", "cpu_us", "peak_alloc_kb"]
+    print("Per-poll merge")
+    print_table(run(), columns)
+    print("\nPer-close lock")
+    print_table(run_lock(), columns)
@@ -0,0 +1,45 @@
+"""
+Per-close cost of the liquidity-pool / BPR detector over long cached histories,
+checked against strategy.liquidity.LATENCY_BUDGET_MS.
+
+Run from backend/: python -m benchmarks.bench_liquidity
+"""
+from __future__ import annotations
+
+import sys
+
+import numpy as np
+
+from benchmarks.common import measure, print_table
+from strategy.candle_store import CandleSnapshot
+from strategy.liquidity import LATENCY_BUDGET_MS, find_liquidity_targets
+
+TIMEFRAME_MS = 5 * 60 * 1000
+
+
+def _history(size: int) -> CandleSnapshot:
+    rng = np.random.default_rng(size)
+    close = 30_000 + np.cumsum(rng.normal(0, 20, size))
+    open_ = close + rng.normal(0, 10, size)
+    high = np.maximum(open_, close) + np.abs(rng.normal(0, 6, size))
+    low = np.minimum(open_, close) - np.abs(rng.normal(0, 6, size))
+    timestamps = np.arange(size, dtype=np.int64) * TIMEFRAME_MS
+    return CandleSnapshot(timestamps, open_, high, low, close, np.ones(size))
+
+
+def run(sizes=(1_000, 10_000, 50_000), repeat: int = 50) -> list[dict]:
+    results = []
+    for size in sizes:
+        candles = _history(size)
+        price = float(candles.close[-1])
+        stats = measure(lambda: find_liquidity_targets(candles, price), repeat=repeat)
+        stats["within_budget"] = stats["p95_us"] / 1000 <= LATENCY_BUDGET_MS
+        results.append({"bars": size, **stats})
+    return results
+
+
+if __name__ == "__main__":
+    results = run()
+    print(f"Latency budget: {LATENCY_BUDGET_MS} ms per closed candle (p95)")
+    print_table(results, ["bars", "mean_us", "p95_us", "cpu_us", "peak_alloc_kb", "within_budget"])
+    sys.exit(0 if all(row["within_budget"] for row in results) else 1)
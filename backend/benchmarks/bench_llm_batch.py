@@ -0,0 +1,161 @@
+"""
+Decision throughput of ``DecisionEngine.evaluate_batch`` for batch sizes 1 to 16.
+
+A local aiohttp server stands in for Ollama's /api/generate and sleeps for a simple cost
+model of the request: fixed overhead, prefill per prompt token (the system prompt only
+when it is not the prefix of the previous request, like Ollama's prompt cache) and decode
+per output token, with tokens estimated as four characters. Batch size 1 is the serial
+``evaluate_market`` path. ``--no-prefix-cache`` charges the system prompt on every
+request, as when other traffic evicts the cached prefix between calls. Times are scaled by
+``--time-scale`` to keep the run short; the ratios are what matter.
+
+Run from backend/: python -m benchmarks.bench_llm_batch
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timezone
+
+from aiohttp import web
+
+from ai.decision_engine import DecisionEngine
+from ai.ollama_router import OllamaRouter
+from benchmarks.common import print_table
+from models.schemas import FVGZone, LiquidityPool, MarketState
+
+SYMBOLS = [f"{base}/USDT" for base in "BTC ETH SOL BNB XRP ADA DOGE AVAX DOT LINK LTC ATOM NEAR APT ARB OP".split()]
+BATCH_SIZES = (1, 2, 4, 8, 16)
+DECISION = {
+    "action": "LONG",
+    "confidence": 78,
+    "reasoning": "Bullish MSS with displacement into an open FVG. Buy-side liquidity rests above the swing high.",
+    "entry_poi": None,
+    "target_liquidity": None,
+    "stop_reference": None,
+}
+
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class _MockOllama:
+    def __init__(self, request_ms: float, prefill_ms: float, decode_ms: float, prefix_cache: bool, scale: float):
+        self.request_ms = request_ms
+        self.prefill_ms = prefill_ms
+        self.decode_ms = decode_ms
+        self.prefix_cache = prefix_cache
+        self.scale = scale
+        self.requests = 0
+        self._last_system = None
+
+    async def generate(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        self.requests += 1
+        prompt = payload.get("prompt", "")
+        if "Market States:" in prompt:
+            states = json.loads(prompt.split("Market States:\n", 1)[1])
+            response = json.dumps({"decisions": [{"id": state["id"], **DECISION} for state in states]})
+        else:
+            response = json.dumps(DECISION)
+
+        prompt_tokens = _tokens(prompt)
+        system = payload.get("system", "")
+        if not self.prefix_cache or system != self._last_system:
+            prompt_tokens += _tokens(system)
+        self._last_system = system
+        output_tokens = _tokens(response)
+        cost_ms = self.request_ms + prompt_tokens * self.prefill_ms + output_tokens * self.decode_ms
+        await asyncio.sleep(cost_ms * self.scale / 1000)
+        return web.json_response(
+            {"response": response, "done": True, "prompt_eval_count": prompt_tokens, "eval_count": output_tokens}
+        )
+
+
+def _states() -> list[MarketState]:
+    timestamp = datetime(2026, 1, 5, 8, 0, tzinfo=timezone.utc)
+    states = []
+    for index, symbol in enumerate(SYMBOLS):
+        price = 100.0 * (index + 1)
+        states.append(
+            MarketState(
+                timestamp=timestamp,
+                symbol=symbol,
+                timeframe="5m",
+                valid_poi_found=True,
+                setup_type="BULLISH_MSS_WITH_DISPLACEMENT",
+                stop_reference=price * 0.99,
+                closest_bullish_fvg=FVGZone(top=price * 1.001, bottom=price * 0.998),
+                last_swing_high=price * 1.02,
+                last_swing_low=price * 0.985,
+                liquidity_targets=[LiquidityPool(side="BUY_SIDE", price=price * 1.03, touches=3, distance_pct=3.0)],
+            )
+        )
+    return states
+
+
+async def _run(args) -> list[dict]:
+    server = _MockOllama(args.request_ms, args.prefill_ms, args.decode_ms, not args.no_prefix_cache, args.time_scale)
+    app = web.Application()
+    app.router.add_post("/api/generate", server.generate)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    engine = DecisionEngine()
+    engine.router = OllamaRouter([f"http://127.0.0.1:{port}"])
+    engine.decision_cache = None
+    # The mock answers in one piece; streaming only changes when a single decision is cut off.
+    engine.stream = False
+    states = _states()
+    rows = []
+    try:
+        for size in BATCH_SIZES:
+            server.requests = 0
+            started = time.perf_counter()
+            for offset in range(0, len(states), size):
+                chunk = states[offset : offset + size]
+                if size == 1:
+                    await engine.evaluate_market(chunk[0])
+                else:
+                    await engine.evaluate_batch(chunk)
+            seconds = time.perf_counter() - started
+            rows.append(
+                {
+                    "batch_size": size,
+                    "requests": server.requests,
+                    "seconds": seconds,
+                    "decisions_per_s": len(states) / seconds,
+                }
+            )
+    finally:
+        await engine.close()
+        await runner.cleanup()
+    for row in rows:
+        row["speedup"] = row["decisions_per_s"] / rows[0]["decisions_per_s"]
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Batched LLM decision throughput against a mock Ollama.")
+    parser.add_argument("--request-ms", type=float, default=40.0, help="Fixed cost per request.")
+    parser.add_argument("--prefill-ms", type=float, default=0.3, help="Cost per evaluated prompt token.")
+    parser.add_argument("--decode-ms", type=float, default=15.0, help="Cost per generated token.")
+    parser.add_argument("--no-prefix-cache", action="store_true", help="Charge the system prompt on every request.")
+    parser.add_argument("--time-scale", type=float, default=0.1, help="Multiplier on every simulated cost.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    rows = asyncio.run(_run(args))
+    print(f"{len(SYMBOLS)} decisions per batch size, prefix cache {'off' if args.no_prefix_cache else 'on'}")
+    print_table(rows, ["batch_size", "requests", "seconds", "decisions_per_s", "speedup"])
+
+
+if __name__ == "__main__":
+    main()
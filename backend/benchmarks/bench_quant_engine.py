@@ -0,0 +1,74 @@
+"""
+Per-close cost of the execution checklist: pandas QuantitativeEngine vs the array
+kernels vs the incremental engine, across window sizes, plus the pandas path's
+per-feature timings.
+
+Run from backend/: python -m benchmarks.bench_quant_engine
+"""
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+
+from benchmarks.common import measure, print_table
+from strategy import quant_kernels
+from strategy.candle_store import CandleRingBuffer
+from strategy.features import STRATEGY_FEATURES
+from strategy.incremental_engine import IncrementalQuantEngine
+from strategy.market_structure import QuantitativeEngine
+
+TIMEFRAME_MS = 5 * 60 * 1000
+
+
+def _filled_buffer(size: int, extra: int) -> tuple[CandleRingBuffer, list]:
+    """Buffer holding ``size`` random-walk candles plus ``extra`` candles still to arrive."""
+    rng = np.random.default_rng(size)
+    closes = 100 + np.cumsum(rng.normal(0, 1, size + extra))
+    opens = closes + rng.normal(0, 0.5, size + extra)
+    rows = [
+        (index * TIMEFRAME_MS, (o, max(o, c) + 0.2, min(o, c) - 0.2, c, 1.0))
+        for index, (o, c) in enumerate(zip(opens, closes))
+    ]
+    buffer = CandleRingBuffer(window=size)
+    for timestamp, values in rows[:size]:
+        buffer.upsert(timestamp, values)
+    return buffer, rows[size:]
+
+
+def run(sizes=(100, 500, 2_000), repeat: int = 300) -> list[dict]:
+    results = []
+    for size in sizes:
+        buffer, _ = _filled_buffer(size, 0)
+        snapshot = buffer.snapshot()
+
+        def pandas_path(snapshot=snapshot):
+            QuantitativeEngine(snapshot, symbol="BTC/USDT", timeframe="5m").run_execution_checklist()
+
+        def kernel_path(snapshot=snapshot):
+            quant_kernels.run_execution_checklist(snapshot, symbol="BTC/USDT", timeframe="5m")
+
+        results.append({"window": size, "path": "pandas", **measure(pandas_path, repeat=repeat)})
+        results.append({"window": size, "path": "numpy", **measure(kernel_path, repeat=repeat)})
+
+        # The incremental engine only pays for the newly closed bar, so feed it one per call
+        # (enough bars for warm-up, timing and the allocation pass in measure()).
+        buffer, arriving = _filled_buffer(size, 2 * repeat)
+        engine = IncrementalQuantEngine("BTC/USDT", "5m")
+        engine.sync(buffer.snapshot())
+        pending = iter(arriving)
+
+        def incremental_path(buffer=buffer, engine=engine, pending=pending):
+            buffer.upsert(*next(pending))
+            engine.sync(buffer.snapshot())
+
+        results.append({"window": size, "path": "incremental", **measure(incremental_path, repeat=repeat)})
+    return results
+
+
+if __name__ == "__main__":
+    # Checklist logging is part of the cost being compared, but not worth printing.
+    logging.basicConfig(level=logging.INFO, handlers=[logging.NullHandler()])
+    print_table(run(), ["window", "path", "mean_us", "p95_us", "cpu_us", "peak_alloc_kb"])
+    print("\nPandas path cost per feature / rule")
+    print_table(STRATEGY_FEATURES.timing_report(), ["name", "calls", "rows", "total_ms", "mean_us"])
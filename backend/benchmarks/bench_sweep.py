@@ -0,0 +1,58 @@
+"""
+Scaling of the backtest parameter sweep with the number of worker processes.
+
+A fixed grid over a year of synthetic 5m bars runs at 1, 2, 4, ... workers up to the
+core count. Speed-up should stay close to the worker count.
+
+Run from backend/: python -m benchmarks.bench_sweep
+"""
+from __future__ import annotations
+
+import os
+import time
+
+import numpy as np
+
+from backtest.sweep import run_sweep
+from benchmarks.common import print_table
+from strategy.candle_store import CandleSnapshot
+
+TIMEFRAME_MS = 5 * 60 * 1000
+GRID = {
+    "swing_lookback": [3, 5, 8],
+    "displacement_threshold": [0.6, 0.7, 0.8],
+    "min_rr_ratio": [2.0, 3.0],
+    "max_trade_duration_mins": [30, 120],
+}
+
+
+def _history(size: int) -> CandleSnapshot:
+    rng = np.random.default_rng(size)
+    close = 30_000 + np.cumsum(rng.normal(0, 20, size))
+    open_ = close + rng.normal(0, 10, size)
+    high = np.maximum(open_, close) + np.abs(rng.normal(0, 6, size))
+    low = np.minimum(open_, close) - np.abs(rng.normal(0, 6, size))
+    timestamps = 1_767_225_600_000 + np.arange(size, dtype=np.int64) * TIMEFRAME_MS
+    return CandleSnapshot(timestamps, open_, high, low, close, np.ones(size))
+
+
+def run(bars: int = 105_120) -> list[dict]:
+    candles = _history(bars)
+    cores = os.cpu_count() or 1
+    counts = sorted({1, *(2**power for power in range(1, cores.bit_length()) if 2**power <= cores), cores})
+    results = []
+    for workers in counts:
+        started = time.perf_counter()
+        run_sweep(candles, GRID, symbol="BTC/USDT", timeframe="5m", workers=workers)
+        seconds = time.perf_counter() - started
+        results.append({"workers": workers, "seconds": seconds})
+    for row in results:
+        row["speedup"] = results[0]["seconds"] / row["seconds"]
+        row["efficiency"] = row["speedup"] / row["workers"]
+    return results
+
+
+if __name__ == "__main__":
+    combinations = int(np.prod([len(values) for values in GRID.values()]))
+    print(f"{combinations} combinations per sweep")
+    print_table(run(), ["workers", "seconds", "speedup", "efficiency"])
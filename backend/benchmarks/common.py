@@ -0,0 +1,65 @@
+"""Shared timing/allocation helpers for the scripts in this directory."""
+from __future__ import annotations
+
+import statistics
+import time
+import tracemalloc
+from typing import Callable
+
+
+def measure(fn: Callable[[], object], repeat: int = 200, warmup: int = 5) -> dict:
+    """
+    Runs ``fn`` repeatedly and reports per-call wall time, CPU time and allocations.
+
+    Allocations are sampled in a separate pass because tracemalloc distorts timings.
+    """
+    for _ in range(warmup):
+        fn()
+
+    wall_samples = []
+    cpu_start = time.process_time()
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        wall_samples.append(time.perf_counter() - started)
+    cpu_per_call = (time.process_time() - cpu_start) / repeat
+
+    alloc_repeat = max(1, repeat // 10)
+    tracemalloc.start()
+    try:
+        peak_total = 0
+        allocated_total = 0
+        for _ in range(alloc_repeat):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            fn()
+            current, peak = tracemalloc.get_traced_memory()
+            peak_total += peak - before
+            allocated_total += max(current - before, 0)
+    finally:
+        tracemalloc.stop()
+
+    wall_samples.sort()
+    return {
+        "calls": repeat,
+        "mean_us": statistics.fmean(wall_samples) * 1e6,
+        "p50_us": wall_samples[len(wall_samples) // 2] * 1e6,
+        "p95_us": wall_samples[int(len(wall_samples) * 0.95) - 1] * 1e6,
+        "cpu_us": cpu_per_call * 1e6,
+        "peak_alloc_kb": peak_total / alloc_repeat / 1024,
+        "retained_kb": allocated_total / alloc_repeat / 1024,
+    }
+
+
+def print_table(rows: list[dict], columns: list[str]) -> None:
+    widths = {col: max(len(col), *(len(_fmt(row.get(col))) for row in rows)) for col in columns}
+    print("  ".join(col.ljust(widths[col]) for col in columns))
+    print("  ".join("-" * widths[col] for col in columns))
+    for row in rows:
+        print("  ".join(_fmt(row.get(col)).ljust(widths[col]) for col in columns))
+
+
+def _fmt(value) -> str:
+    if isinstance(value, float):
+        return f"{value:,.1f}"
+    return str(value)
@@ -0,0 +1,362 @@
+"""
+Timing suite for the pipeline hot paths with stored baselines and a regression gate.
+
+Each case is a generator that sets up its inputs, yields ``(name, fn)`` pairs to be
+timed with ``measure`` and cleans up afterwards. Results are compared on p50 against a
+baseline JSON (written with ``--save``); a case slower than the baseline by more than
+``--threshold`` is a regression and makes the run exit with status 1. Baselines are only
+meaningful on the machine that recorded them, so the file also stores the host details.
+
+Run from backend/:
+    python -m benchmarks.suite --save              # record benchmarks/baseline.json
+    python -m benchmarks.suite --threshold 0.2     # compare against it
+    python -m benchmarks.suite --only parser       # subset by case-name substring
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import sys
+from contextlib import contextmanager
+from dataclasses import fields
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.common import measure, print_table
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+METRIC = "p50_us"
+TIMEFRAME_MS = 5 * 60 * 1000
+T0 = 1_767_225_600_000
+
+LLM_DECISION = {
+    "action": "LONG",
+    "confidence": 82,
+    "reasoning": "Bullish MSS with displacement into an open FVG; buy-side liquidity above.",
+    "entry_poi": None,
+    "target_liquidity": 1000.0,
+    "stop_reference": None,
+}
+
+
+@contextmanager
+def _settings(**overrides):
+    from core.config import settings
+
+    saved = {name: getattr(settings, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    try:
+        yield settings
+    finally:
+        for name, value in saved.items():
+            setattr(settings, name, value)
+
+
+def _random_candles(size: int, seed: int = 0):
+    """Random walk with frequent displacement candles, so checklist setups occur."""
+    from strategy.candle_store import CandleSnapshot
+
+    rng = np.random.default_rng(seed)
+    displacement = rng.random(size) < 0.15
+    moves = np.where(displacement, rng.choice([-1, 1], size) * rng.uniform(3, 6, size), rng.normal(0, 1, size))
+    close = 100.0 + np.cumsum(moves + rng.normal(0, 0.2, size))
+    open_ = close - moves
+    wick = np.where(displacement, 0.1, np.abs(rng.normal(0, 0.6, size)))
+    return CandleSnapshot(
+        T0 + np.arange(size, dtype=np.int64) * TIMEFRAME_MS,
+        open_.round(1),
+        (np.maximum(open_, close) + wick).round(1),
+        (np.minimum(open_, close) - wick).round(1),
+        close.round(1),
+        np.ones(size),
+    )
+
+
+def case_checklist():
+    from strategy.market_structure import QuantitativeEngine
+
+    for window in (100, 500, 2_000):
+        candles = _random_candles(window)
+        yield f"checklist[window={window}]", lambda candles=candles: QuantitativeEngine(
+            candles, symbol="BTC/USDT", timeframe="5m"
+        ).run_execution_checklist()
+
+
+def case_feed_merge():
+    from benchmarks.bench_feed_merge import _new_feed, _SyntheticMarket
+
+    for size in (100, 1_000, 10_000):
+        market = _SyntheticMarket(size + 1)
+        feed = _new_feed(size)
+        feed._apply_rows(market.window(size))
+
+        def poll(market=market, feed=feed):
+            market.advance()
+            feed._apply_rows(market.since(feed.candles.last_timestamp))
+
+        yield f"feed_merge[max_candles={size}]", poll
+
+
+def _stream(raw: str):
+    from ai.stream_parser import StreamingDecisionParser
+
+    parser = StreamingDecisionParser()
+    # About one token per four characters.
+    for index in range(0, len(raw), 4):
+        if parser.feed(raw[index : index + 4]) is not None:
+            return
+    parser.finish()
+
+
+def case_parser():
+    from ai.parser import JSONParser
+
+    decision = json.dumps(LLM_DECISION, indent=2)
+    outputs = {
+        "plain": decision,
+        "fenced": f"```json\n{decision}\n```",
+        # deepseek-r1 style reasoning preamble; not valid JSON as a whole, so it falls back to WAIT.
+        "think_preamble": f"<think>\n{'The 5m structure shifted bullish. ' * 150}\n</think>\n{decision}",
+        "long_reasoning": json.dumps({**LLM_DECISION, "reasoning": "Liquidity above. " * 2_000}),
+        "deeply_nested": "[" * 500 + "]" * 500,
+        "truncated": decision[: len(decision) // 2],
+    }
+    for label, raw in outputs.items():
+        yield f"parser[{label}]", lambda raw=raw: JSONParser.parse_ai_decision(raw)
+    for label in ("plain", "think_preamble", "long_reasoning"):
+        yield f"stream_parser[{label}]", lambda raw=outputs[label]: _stream(raw)
+
+
+def case_position_manager():
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from core.database import Base
+    from execution.position_manager import PositionManager
+    from models.schemas import AIDecision
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autocommit=False, autoflush=False)()
+    manager = PositionManager()
+    decision = AIDecision(**{**LLM_DECISION, "target_liquidity": 104.0, "stop_reference": 99.0})
+    try:
+        with _settings(EXECUTE_ORDERS=False):
+            yield "position_manager[paper]", lambda: manager.validate_and_execute(
+                ai_decision=decision, symbol="BTC/USDT", current_price=100.0, account_balance=10_000.0, db=db
+            )
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def case_decision_cache():
+    from ai.decision_cache import DecisionCache
+    from backtest.signals import checklist_signals, market_state_at
+    from models.schemas import AIDecision
+
+    history = _random_candles(2_000, seed=2)
+    signals = checklist_signals(history, 100)
+    state = market_state_at(history, signals, len(history) - 1, "BTC/USDT", "5m")
+    cache = DecisionCache(max_entries=256, ttl_secs=900, price_pct=0.0005, namespace="bench")
+    cache.put(cache.fingerprint(state), AIDecision(**LLM_DECISION), 0.0)
+    yield "decision_cache[hit]", lambda: cache.get(cache.fingerprint(state), 1.0)
+
+
+def case_feasibility():
+    from execution.feasibility import FeasibilityFilter
+    from models.schemas import FVGZone, LiquidityPool, MarketState
+
+    state = MarketState(
+        timestamp=datetime(2026, 1, 5, 8, 0, tzinfo=timezone.utc),
+        symbol="BTC/USDT",
+        timeframe="5m",
+        valid_poi_found=True,
+        setup_type="BULLISH_MSS_WITH_DISPLACEMENT",
+        stop_reference=99.0,
+        closest_bullish_fvg=FVGZone(top=100.2, bottom=99.0),
+        last_swing_high=101.0,
+        liquidity_targets=[LiquidityPool(side="BUY_SIDE", price=100.8 + i / 10, distance_pct=1.0) for i in range(8)],
+    )
+    feasibility = FeasibilityFilter()
+    yield "feasibility[check]", lambda: feasibility.check(state, 100.5, 3.0)
+
+
+class _NullWebSocket:
+    """Serializes like Starlette's send_json and drops the frame."""
+
+    async def send_json(self, message: dict) -> None:
+        json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+def case_broadcast():
+    from main import ConnectionManager
+    from models.schemas import ExecutionEvent
+
+    event = ExecutionEvent(
+        symbol="BTC/USDT",
+        action="LONG",
+        confidence=82,
+        reasoning=LLM_DECISION["reasoning"],
+        status="EXECUTED",
+        price=100.0,
+        size=0.5,
+        pnl_r=None,
+    ).model_dump(mode="json")
+    loop = asyncio.new_event_loop()
+    try:
+        for clients in (1, 10, 100):
+            manager = ConnectionManager()
+            manager.active_connections = [_NullWebSocket() for _ in range(clients)]
+            yield f"broadcast[clients={clients}]", lambda manager=manager: loop.run_until_complete(
+                manager.broadcast(event)
+            )
+    finally:
+        loop.close()
+
+
+class _FixedTape:
+    """Stubbed I/O for the end-to-end case: trading allowed, a fixed LLM answer, paper fills."""
+
+    def killswitch(self, db) -> bool:
+        return True
+
+    async def generate(self, payload: dict):
+        return 200, json.dumps(LLM_DECISION)
+
+    def orders(self, **kwargs) -> dict:
+        return {"status": "executed", "entry_order_id": "paper-order"}
+
+
+def case_pipeline():
+    import worker
+    from backtest.replay import stubbed_worker
+    from backtest.signals import checklist_signals
+    from strategy.candle_store import CandleSnapshot
+
+    history = _random_candles(5_000, seed=1)
+    signals = checklist_signals(history, 100)
+    loop = asyncio.new_event_loop()
+    try:
+        with stubbed_worker(_FixedTape()), _settings(
+            KILLZONE_GATING_ENABLED=False, QUANT_ENGINE="batch", FEASIBILITY_FILTER_ENABLED=False
+        ):
+            # Measure the full LLM path; repeated identical windows would otherwise be cache hits.
+            worker.ai_brain.decision_cache = None
+            for label, valid in (("wait", False), ("setup", True)):
+                row = int(np.flatnonzero(signals["valid"] == valid)[-1])
+                window = CandleSnapshot(
+                    *(getattr(history, field.name)[row - 99 : row + 1] for field in fields(CandleSnapshot))
+                )
+                yield f"process_closed_candle[{label}]", lambda window=window: loop.run_until_complete(
+                    worker.process_closed_candle(window, symbol="BTC/USDT", timeframe="5m")
+                )
+    finally:
+        loop.close()
+
+
+CASES = {
+    "checklist": case_checklist,
+    "feed_merge": case_feed_merge,
+    "parser": case_parser,
+    "position_manager": case_position_manager,
+    "decision_cache": case_decision_cache,
+    "feasibility": case_feasibility,
+    "broadcast": case_broadcast,
+    "pipeline": case_pipeline,
+}
+
+
+def run(only: str | None = None, repeat: int = 200) -> dict[str, dict]:
+    results = {}
+    # Skip the setup of whole groups when the filter names one.
+    groups = [build for group, build in CASES.items() if only and only in group] or list(CASES.values())
+    for build in groups:
+        for name, fn in build():
+            if only and only not in name:
+                continue
+            results[name] = measure(fn, repeat=repeat)
+    return results
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], threshold: float) -> list[dict]:
+    """One row per case; ``status`` is "regression" when slower than baseline by more than ``threshold``."""
+    rows = []
+    for name, stats in results.items():
+        current = stats[METRIC]
+        reference = baseline.get(name, {}).get(METRIC)
+        if reference is None:
+            rows.append({"case": name, "current_us": current, "baseline_us": None, "change_pct": None})
+            rows[-1]["status"] = "new"
+            continue
+        change = current / reference - 1 if reference else 0.0
+        status = "regression" if change > threshold else "faster" if change < -threshold else "ok"
+        rows.append(
+            {
+                "case": name,
+                "current_us": current,
+                "baseline_us": reference,
+                "change_pct": change * 100,
+                "status": status,
+            }
+        )
+    return rows
+
+
+def _host() -> dict:
+    return {"platform": platform.platform(), "python": platform.python_version(), "cpus": os.cpu_count()}
+
+
+def _print_results(results: dict[str, dict]) -> None:
+    rows = [{"case": name, **stats} for name, stats in results.items()]
+    print_table(rows, ["case", METRIC, "p95_us", "peak_alloc_kb"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Hot-path benchmark suite with a regression gate.")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="Write the results as the new baseline.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed p50 slow-down, 0.25 = 25%%.")
+    parser.add_argument("--only", help="Run cases whose name contains this string.")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    # Log calls stay in the measured cost, but nothing is printed.
+    logging.basicConfig(level=logging.INFO, handlers=[logging.NullHandler()])
+    results = run(args.only, args.repeat)
+
+    if args.save:
+        stored = json.loads(args.baseline.read_text()) if args.baseline.exists() and args.only else {"results": {}}
+        stored["results"].update(results)
+        stored.update(host=_host(), recorded_at=datetime.now(timezone.utc).isoformat())
+        args.baseline.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n")
+        _print_results(results)
+        print(f"\nBaseline written to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        _print_results(results)
+        print(f"\nNo baseline at {args.baseline}; run with --save to record one.")
+        return
+
+    stored = json.loads(args.baseline.read_text())
+    if stored.get("host") != _host():
+        print(f"Warning: baseline recorded on {stored.get('host')}, running on {_host()}.")
+    rows = compare(results, stored["results"], args.threshold)
+    print_table(rows, ["case", "baseline_us", "current_us", "change_pct", "status"])
+    regressions = [row["case"] for row in rows if row["status"] == "regression"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,35 @@ class Settings(BaseSettings):
     TRADING_TIMEFRAME: str = "5m"
     MAX_CANDLES: int = 100
 
+    # Market data feed: "poll" (fixed-interval REST), "scheduled" (REST bursts at candle close)
+    # or "websocket" (kline push with REST fallback)
+    DATA_FEED_MODE: str = "poll"
+    BINANCE_WS_BASE_URL: str = "wss://stream.binancefuture.com"
+    # Comma-separated watch lists; empty falls back to TRADING_SYMBOL / TRADING_TIMEFRAME.
+    WATCH_SYMBOLS: str = ""
+    WATCH_TIMEFRAMES: str = ""
+    FEED_REQUESTS_PER_SECOND: float = 10.0
+    # Directory for the on-disk closed-candle cache; empty disables it.
+    CANDLE_CACHE_DIR: str = ""
+    # Comma-separated higher timeframes resampled from TRADING_TIMEFRAME closes, e.g. "15m,1h,4h,1d".
+    # Their closes refresh HTF context only; they never trigger the LLM or orders.
+    HTF_TIMEFRAMES: str = ""
+    # Quant engine: "batch" (pandas) or "numpy" recompute the whole window per close,
+    # "incremental" keeps state per feed.
+    QUANT_ENGINE: str = "batch"
+    # Batch engine: reuse feature rows across closes only when this many rows carry over; below
+    # about 1k rows one full pass is cheaper, so the default window of 100 always recomputes.
+    FEATURE_REUSE_MIN_ROWS: int = 1024
+    # Report the nearest open FVG zones from the per-feed zone index instead of the latest candle only.
+    FVG_INDEX_ENABLED: bool = True
+    # Ranked liquidity pools / BPRs over up to LIQUIDITY_HISTORY_BARS cached candles.
+    LIQUIDITY_TARGETS_ENABLED: bool = True
+    LIQUIDITY_HISTORY_BARS: int = 50000
+    # Skip the quant engine and LLM for candles closing outside the overlap/Silver Bullet killzones.
+    KILLZONE_GATING_ENABLED: bool = True
+    # Append a per-candle record/replay log (JSONL, gzip if it ends in .gz) here; empty disables it.
+    PIPELINE_RECORD_PATH: str = ""
+
     # Telegram
     TELEGRAM_BOT_TOKEN: str = ""
     TELEGRAM_CHAT_ID: str = ""
@@ -22,8 +51,40 @@ class Settings(BaseSettings):
 
     # LLM
     OLLAMA_BASE_URL: str = "http://ollama-brain:11434"
+    # Comma-separated Ollama instances to route across by latency; empty uses OLLAMA_BASE_URL alone.
+    OLLAMA_BASE_URLS: str = ""
+    # Duplicate a request to the next endpoint when the first misses its p95 latency (at least the minimum).
+    OLLAMA_HEDGE_ENABLED: bool = True
+    OLLAMA_HEDGE_MIN_SECS: float = 2.0
+    # An endpoint failing 3 requests in a row is skipped for this long.
+    OLLAMA_ENDPOINT_COOLDOWN_SECS: float = 30.0
     OLLAMA_MODEL: str = "deepseek-r1:7b"
     OLLAMA_TIMEOUT_SECS: int = 30
+    # Context window per request; must fit the execution guide, the instructions and the market state.
+    OLLAMA_NUM_CTX: int = 4096
+    # Stream tokens and stop the generation as soon as a complete decision object has arrived.
+    OLLAMA_STREAM: bool = True
+    # Generation budget per decision, reasoning included: tokens (also sent as num_predict) and seconds.
+    OLLAMA_MAX_TOKENS: int = 2048
+    OLLAMA_DECISION_BUDGET_SECS: float = 20.0
+    # Concurrent LLM evaluations; match OLLAMA_NUM_PARALLEL on the server. Extra requests queue.
+    LLM_MAX_CONCURRENCY: int = 1
+    # Queued evaluations decided together in one prompt, e.g. setups on several symbols at the same close.
+    # Opt-in: a batch is not streamed (no early cut once a decision is complete), the whole batch runs
+    # against its members' earliest deadline, and measured throughput was only ~1.0-1.1x of single calls.
+    LLM_MAX_BATCH: int = 1
+    # Evaluations still queued or running this many seconds before the next candle close are dropped as WAIT.
+    LLM_DEADLINE_MARGIN_SECS: float = 5.0
+    # Sent with every request so the model stays loaded between sparse setups ("-1m" = forever).
+    OLLAMA_KEEP_ALIVE: str = "30m"
+    # Empty-prompt ping after this many idle seconds to keep the model resident; 0 disables it.
+    OLLAMA_WARM_PING_SECS: int = 240
+    # Reuse the decision for a near-identical MarketState: prices bucketed to DECISION_CACHE_PRICE_PCT,
+    # entries expire after DECISION_CACHE_TTL_SECS of candle time.
+    DECISION_CACHE_ENABLED: bool = True
+    DECISION_CACHE_SIZE: int = 256
+    DECISION_CACHE_TTL_SECS: int = 900
+    DECISION_CACHE_PRICE_PCT: float = 0.0005
 
     # Internal API bridge
     INTERNAL_API_TOKEN: str = "change-me"
@@ -35,6 +96,8 @@ class Settings(BaseSettings):
     MAX_TRADE_DURATION_MINS: int = 30
     DEFAULT_ACCOUNT_BALANCE: float = 10000.0
     MIN_RR_RATIO: float = 3.0
+    # Reject setups whose best RR over the state's levels is below MIN_RR_RATIO before calling the LLM.
+    FEASIBILITY_FILTER_ENABLED: bool = True
 
     model_config = SettingsConfigDict(env_file=".env")
 
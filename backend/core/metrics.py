@@ -0,0 +1,66 @@
+"""
+In-process latency and counter metrics.
+
+Series keep their lifetime count/total plus the most recent samples for percentiles, so a
+snapshot is cheap and memory stays bounded however long the worker runs.
+"""
+from __future__ import annotations
+
+from collections import deque
+
+import numpy as np
+
+
+class LatencySeries:
+    def __init__(self, max_samples: int = 1024):
+        self.count = 0
+        self.total = 0.0
+        self.samples: deque[float] = deque(maxlen=max_samples)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.samples.append(seconds)
+
+    def summary(self) -> dict:
+        if not self.count:
+            return {"count": 0}
+        recent = np.fromiter(self.samples, dtype=np.float64)
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000,
+            "p50_ms": float(np.percentile(recent, 50)) * 1000,
+            "p95_ms": float(np.percentile(recent, 95)) * 1000,
+            "max_ms": float(recent.max()) * 1000,
+        }
+
+
+class Metrics:
+    """
+    Named latency series and counters; names are dotted, e.g. ``llm.decision.cold``.
+    """
+
+    def __init__(self):
+        self.series: dict[str, LatencySeries] = {}
+        self.counters: dict[str, int] = {}
+
+    def observe(self, name: str, seconds: float) -> None:
+        series = self.series.get(name)
+        if series is None:
+            series = self.series[name] = LatencySeries()
+        series.observe(seconds)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def snapshot(self, prefix: str = "") -> dict:
+        report = {name: series.summary() for name, series in self.series.items() if name.startswith(prefix)}
+        report.update({name: value for name, value in self.counters.items() if name.startswith(prefix)})
+        return report
+
+    def reset(self) -> None:
+        self.series.clear()
+        self.counters.clear()
+
+
+metrics = Metrics()
@@ -0,0 +1,129 @@
+"""
+Per-candle capture of the worker pipeline's inputs and outputs for offline replay.
+
+While a candle is being processed inside ``collect()``, ``record(kind, value)`` calls from
+anywhere in the pipeline (killswitch check, enriched ``MarketState``, raw Ollama response,
+order results, published events) land on that candle's entry through a context variable,
+so feeds processed concurrently never mix. ``PipelineRecorder`` writes one JSON line per
+closed candle (gzip when the path ends in ``.gz``). Locked windows are stored as the rows
+that changed since the same feed's previous entry, which keeps a line to a few hundred bytes.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import fields
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core.config import settings
+from strategy.candle_store import CandleSnapshot
+
+COLUMNS = tuple(field.name for field in fields(CandleSnapshot))
+# Never written to the log.
+_SECRET_SETTINGS = ("KEY", "TOKEN", "SECRET", "DATABASE_URL")
+
+_current: ContextVar[dict | None] = ContextVar("openclaw_pipeline_record", default=None)
+
+
+def record(kind: str, value) -> None:
+    """Appends ``value`` under ``kind`` to the entry being collected; no-op outside ``collect()``."""
+    entry = _current.get()
+    if entry is not None:
+        entry.setdefault(kind, []).append(value)
+
+
+@contextmanager
+def collect(entry: dict | None = None):
+    """Routes ``record()`` calls made in this context (and tasks it spawns) to ``entry``."""
+    entry = {} if entry is None else entry
+    token = _current.set(entry)
+    try:
+        yield entry
+    finally:
+        _current.reset(token)
+
+
+def replayable_settings() -> dict:
+    return {
+        name: value
+        for name, value in settings.model_dump().items()
+        if not any(secret in name for secret in _SECRET_SETTINGS)
+    }
+
+
+def encode_window(candles: CandleSnapshot, previous: CandleSnapshot | None) -> dict:
+    """``{"reuse": [offset, count], "rows": [...]}``: rows ``offset..offset+count`` of ``previous`` plus new rows."""
+    offset = overlap = 0
+    if previous is not None and len(previous) and len(candles):
+        offset = int(np.searchsorted(previous.timestamp, candles.timestamp[0]))
+        overlap = max(0, min(len(previous) - offset, len(candles)))
+        rows = slice(offset, offset + overlap)
+        if not all(np.array_equal(previous[column][rows], candles[column][:overlap]) for column in COLUMNS):
+            offset = overlap = 0
+    fresh = [candles[column][overlap:].tolist() for column in COLUMNS]
+    return {"reuse": [offset, overlap], "rows": [list(row) for row in zip(*fresh)]}
+
+
+def decode_window(encoded: dict, previous: CandleSnapshot | None) -> CandleSnapshot:
+    offset, overlap = encoded["reuse"]
+    rows = encoded["rows"]
+    columns = []
+    for index, column in enumerate(COLUMNS):
+        dtype = np.int64 if column == "timestamp" else np.float64
+        fresh = np.array([row[index] for row in rows], dtype=dtype)
+        kept = previous[column][offset : offset + overlap] if overlap else np.empty(0, dtype=dtype)
+        columns.append(np.concatenate((kept, fresh)))
+    return CandleSnapshot(*columns)
+
+
+def _copy(candles: CandleSnapshot) -> CandleSnapshot:
+    # Snapshots alias ring-buffer memory that is reused later.
+    return CandleSnapshot(*(np.array(candles[column]) for column in COLUMNS))
+
+
+class PipelineRecorder:
+    """
+    Appends one compact JSON line per closed candle; a settings header starts every session.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._handle = None
+        self._windows: dict[tuple[str, str], CandleSnapshot] = {}
+
+    def _write(self, line: dict) -> None:
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            opener = gzip.open if self.path.suffix == ".gz" else open
+            self._handle = opener(self.path, "at", encoding="utf-8")
+            self._write({"settings": replayable_settings()})
+        self._handle.write(json.dumps(line, separators=(",", ":"), default=str) + "\n")
+        # One flush per candle: the log must survive the crash it is meant to explain.
+        self._handle.flush()
+
+    @contextmanager
+    def capture(self, locked_candles, symbol: str, timeframe: str):
+        if isinstance(locked_candles, pd.DataFrame):
+            locked_candles = CandleSnapshot.from_frame(locked_candles)
+        key = (symbol, timeframe)
+        entry = {
+            "symbol": symbol,
+            "timeframe": timeframe,
+            "window": encode_window(locked_candles, self._windows.get(key)),
+        }
+        self._windows[key] = _copy(locked_candles)
+        try:
+            with collect(entry):
+                yield entry
+        finally:
+            self._write(entry)
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
@@ -0,0 +1,97 @@
+"""
+Pre-LLM feasibility check: can any trade built from this MarketState pass the RR gate?
+
+``plan_trade`` rejects a decision whose reward/risk is below ``MIN_RR_RATIO``. Before the
+LLM is asked, the same stop buffer and RR math are evaluated over the levels the model is
+given: entries at the current price (where the market order fills) or any edge of the
+setup's FVG and of the BPR zones, the stop at ``stop_reference`` and targets at the same-side
+liquidity pools and the last swing. For a fixed stop and target RR only grows as the entry
+moves towards the stop, so the deepest of those entries still above the buffered stop (below
+it for shorts) sets the bound. Below the minimum, the setup is rejected without a call.
+States that cannot be bounded (no stop reference, no target level) always pass.
+"""
+from __future__ import annotations
+
+from core.metrics import metrics
+from execution.position_manager import trade_distances
+from models.schemas import MarketState
+
+SETUP_ACTIONS = {
+    "BULLISH_MSS_WITH_DISPLACEMENT": ("LONG",),
+    "BEARISH_MSS_WITH_DISPLACEMENT": ("SHORT",),
+}
+
+
+def _candidates(market_state: MarketState, current_price: float, action: str) -> tuple[list[float], list[float]]:
+    """(entries, targets) the model could pick for ``action`` from this state."""
+    if action == "LONG":
+        fvg = market_state.closest_bullish_fvg
+        targets = [pool.price for pool in market_state.liquidity_targets if pool.side == "BUY_SIDE"]
+        targets.append(market_state.last_swing_high)
+    else:
+        fvg = market_state.closest_bearish_fvg
+        targets = [pool.price for pool in market_state.liquidity_targets if pool.side == "SELL_SIDE"]
+        targets.append(market_state.last_swing_low)
+    # entry_poi is a free float: the model may enter anywhere inside a zone it was shown.
+    entries = [current_price, fvg.top, fvg.bottom]
+    for zone in market_state.bpr_zones:
+        entries.extend((zone.top, zone.bottom))
+    return [entry for entry in entries if entry is not None], [target for target in targets if target is not None]
+
+
+def best_rr(market_state: MarketState, current_price: float, action: str) -> dict | None:
+    """
+    Highest reward/risk over the candidate levels, as ``{"rr_ratio", "entry", "stop_loss", "target"}``;
+    None when the state has no stop reference or target to bound it with.
+    """
+    entries, targets = _candidates(market_state, current_price, action)
+    if market_state.stop_reference is None or not targets:
+        return None
+    best = {"rr_ratio": 0.0, "entry": current_price, "stop_loss": None, "target": None}
+    for entry in entries:
+        for target in targets:
+            stop_loss, risk_distance, reward_distance = trade_distances(
+                action, entry, market_state.stop_reference, target
+            )
+            if risk_distance <= 0 or reward_distance <= 0:
+                continue
+            rr_ratio = reward_distance / risk_distance
+            if rr_ratio > best["rr_ratio"]:
+                best = {"rr_ratio": rr_ratio, "entry": entry, "stop_loss": stop_loss, "target": target}
+    return best
+
+
+class FeasibilityFilter:
+    """
+    Rejects setups whose best achievable RR is below the minimum; counts the LLM calls saved.
+    """
+
+    def __init__(self):
+        self.passed = 0
+        self.rejected = 0
+
+    def check(self, market_state: MarketState, current_price: float, min_rr_ratio: float) -> dict:
+        """``{"feasible": bool, "action", "rr_bound", "reason"}``; ``rr_bound`` is None when unbounded."""
+        actions = SETUP_ACTIONS.get(market_state.setup_type, ("LONG", "SHORT"))
+        bounds = {action: best_rr(market_state, current_price, action) for action in actions}
+        if any(bound is None for bound in bounds.values()):
+            return self._pass(actions[0], None)
+        action, bound = max(bounds.items(), key=lambda item: item[1]["rr_ratio"])
+        if bound["rr_ratio"] >= min_rr_ratio:
+            return self._pass(action, bound["rr_ratio"])
+
+        self.rejected += 1
+        metrics.increment("llm.calls_saved.feasibility")
+        if bound["target"] is None:
+            reason = f"No {action} target beyond entry and stop; RR bound 0.00. Required: {min_rr_ratio:.2f}."
+        else:
+            reason = (
+                f"Best achievable RR {bound['rr_ratio']:.2f} (entry {bound['entry']:g}, stop {bound['stop_loss']:g}, "
+                f"target {bound['target']:g}) is below the required {min_rr_ratio:.2f}; LLM skipped."
+            )
+        return {"feasible": False, "action": action, "rr_bound": bound["rr_ratio"], "reason": reason}
+
+    def _pass(self, action: str, rr_bound: float | None) -> dict:
+        self.passed += 1
+        metrics.increment("feasibility.passed")
+        return {"feasible": True, "action": action, "rr_bound": rr_bound, "reason": None}
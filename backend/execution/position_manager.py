@@ -7,11 +7,73 @@ from sqlalchemy.orm import Session
 from core.config import settings
 from core.database import TradeRecord
 from core.exchange import get_exchange_instance
+from core.recorder import record
 from models.schemas import AIDecision
 
 logger = logging.getLogger("openclaw.position_manager")
 
 
+def trade_distances(action: str, entry: float, stop_reference: float, target: float) -> tuple[float, float, float]:
+    """(stop_loss, risk_distance, reward_distance) with the stop buffered 0.1% beyond ``stop_reference``."""
+    if action == "LONG":
+        stop_loss = stop_reference * 0.999
+        return stop_loss, entry - stop_loss, target - entry
+    stop_loss = stop_reference * 1.001
+    return stop_loss, stop_loss - entry, entry - target
+
+
+def plan_trade(
+    ai_decision: AIDecision,
+    current_price: float,
+    account_balance: float,
+    risk_percent: float,
+    min_rr_ratio: float,
+) -> dict:
+    """
+    Pure stop-buffer, RR and sizing math shared by live execution and the backtester.
+
+    Returns ``{"status": "planned", ...levels}`` or an ``ignored``/``rejected`` result with a reason.
+    """
+    if ai_decision.action not in ("LONG", "SHORT"):
+        return {"status": "ignored", "reason": "AI decided WAIT."}
+
+    entry = ai_decision.entry_poi or current_price
+    target = ai_decision.target_liquidity
+    stop_reference = ai_decision.stop_reference
+
+    if target is None or stop_reference is None:
+        return {"status": "rejected", "reason": "Missing target_liquidity or stop_reference."}
+
+    stop_loss, risk_distance, reward_distance = trade_distances(ai_decision.action, entry, stop_reference, target)
+
+    if risk_distance <= 0 or reward_distance <= 0:
+        logger.error("Invalid trade math: risk_distance=%s reward_distance=%s", risk_distance, reward_distance)
+        return {"status": "rejected", "reason": "Invalid risk/reward distances."}
+
+    rr_ratio = reward_distance / risk_distance
+    if rr_ratio < min_rr_ratio:
+        return {
+            "status": "rejected",
+            "reason": f"Insufficient RR ratio: {rr_ratio:.2f}. Required: {min_rr_ratio:.2f}.",
+        }
+
+    monetary_risk = account_balance * risk_percent
+    position_size = monetary_risk / risk_distance
+    if position_size <= 0:
+        return {"status": "rejected", "reason": "Computed position size <= 0."}
+
+    return {
+        "status": "planned",
+        "action": ai_decision.action,
+        "entry_price": entry,
+        "stop_loss": stop_loss,
+        "take_profit": target,
+        "risk_distance": risk_distance,
+        "rr_ratio": rr_ratio,
+        "position_size": position_size,
+    }
+
+
 class PositionManager:
     """
     Handles order validation, RR checks, sizing, and testnet execution.
@@ -30,40 +92,11 @@ class PositionManager:
         account_balance: float,
         db: Session,
     ) -> dict:
-        if ai_decision.action not in ("LONG", "SHORT"):
-            return {"status": "ignored", "reason": "AI decided WAIT."}
-
-        entry = ai_decision.entry_poi or current_price
-        target = ai_decision.target_liquidity
-        stop_reference = ai_decision.stop_reference
-
-        if target is None or stop_reference is None:
-            return {"status": "rejected", "reason": "Missing target_liquidity or stop_reference."}
-
-        if ai_decision.action == "LONG":
-            stop_loss = stop_reference * 0.999
-            risk_distance = entry - stop_loss
-            reward_distance = target - entry
-        else:
-            stop_loss = stop_reference * 1.001
-            risk_distance = stop_loss - entry
-            reward_distance = entry - target
-
-        if risk_distance <= 0 or reward_distance <= 0:
-            logger.error("Invalid trade math: risk_distance=%s reward_distance=%s", risk_distance, reward_distance)
-            return {"status": "rejected", "reason": "Invalid risk/reward distances."}
-
-        rr_ratio = reward_distance / risk_distance
-        if rr_ratio < self.min_rr_ratio:
-            return {
-                "status": "rejected",
-                "reason": f"Insufficient RR ratio: {rr_ratio:.2f}. Required: {self.min_rr_ratio:.2f}.",
-            }
-
-        monetary_risk = account_balance * self.risk_percent
-        position_size = monetary_risk / risk_distance
-        if position_size <= 0:
-            return {"status": "rejected", "reason": "Computed position size <= 0."}
+        plan = plan_trade(ai_decision, current_price, account_balance, self.risk_percent, self.min_rr_ratio)
+        if plan["status"] != "planned":
+            return plan
+        entry, stop_loss, target = plan["entry_price"], plan["stop_loss"], plan["take_profit"]
+        position_size = plan["position_size"]
 
         execution_result = self._place_binance_orders(
             symbol=symbol,
@@ -72,6 +105,7 @@ class PositionManager:
             stop_loss=stop_loss,
             take_profit=target,
         )
+        record("orders", dict(execution_result))
 
         trade_record = TradeRecord(
             symbol=symbol,
@@ -8,6 +8,7 @@ from pydantic import BaseModel, Field
 
 ActionType = Literal["LONG", "SHORT", "WAIT"]
 EventStatus = Literal["WAIT", "IGNORED", "REJECTED", "EXECUTED", "FAILED", "KILLSWITCH"]
+LiquiditySide = Literal["BUY_SIDE", "SELL_SIDE"]
 
 
 class FVGZone(BaseModel):
@@ -15,6 +16,28 @@ class FVGZone(BaseModel):
     bottom: float | None = None
 
 
+class LiquidityPool(BaseModel):
+    side: LiquiditySide
+    price: float
+    touches: int = 1
+    distance_pct: float
+
+
+class BPRZone(BaseModel):
+    direction: Literal["BULLISH", "BEARISH"]
+    top: float
+    bottom: float
+
+
+class HTFContext(BaseModel):
+    timeframe: str
+    setup_type: str | None = None
+    closest_bullish_fvg: FVGZone = Field(default_factory=FVGZone)
+    closest_bearish_fvg: FVGZone = Field(default_factory=FVGZone)
+    last_swing_high: float | None = None
+    last_swing_low: float | None = None
+
+
 class MarketState(BaseModel):
     timestamp: datetime
     symbol: str
@@ -26,6 +49,9 @@ class MarketState(BaseModel):
     closest_bearish_fvg: FVGZone = Field(default_factory=FVGZone)
     last_swing_high: float | None = None
     last_swing_low: float | None = None
+    liquidity_targets: list[LiquidityPool] = Field(default_factory=list)
+    bpr_zones: list[BPRZone] = Field(default_factory=list)
+    htf_context: list[HTFContext] = Field(default_factory=list)
 
 
 class AIDecision(BaseModel):
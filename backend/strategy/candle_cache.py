@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+
+from strategy.candle_store import PRICE_COLUMNS, CandleSnapshot
+
+logger = logging.getLogger("openclaw.candle_cache")
+
+_COLUMN_DTYPES = {"timestamp": np.dtype("<i8"), **{column: np.dtype("<f8") for column in PRICE_COLUMNS}}
+
+
+class CandleCache:
+    """
+    Append-only columnar on-disk store of closed candles for one (symbol, timeframe).
+
+    Each column is a raw little-endian file under ``<root>/<MARKET>_<timeframe>/``.
+    Reads are memory-mapped, so deep history costs page cache rather than heap.
+    The timestamp column is written last; on open, any torn append is truncated
+    back to the last row present in every column.
+    """
+
+    def __init__(self, root: str | Path, symbol: str, timeframe: str):
+        market_id = symbol.split(":")[0].replace("/", "").upper()
+        self.path = Path(root) / f"{market_id}_{timeframe}"
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._files = {column: self.path / f"{column}.bin" for column in _COLUMN_DTYPES}
+        self._rows = self._repair()
+
+    def _repair(self) -> int:
+        counts = {
+            column: (path.stat().st_size if path.exists() else 0) // _COLUMN_DTYPES[column].itemsize
+            for column, path in self._files.items()
+        }
+        rows = min(counts.values())
+        for column, path in self._files.items():
+            expected = rows * _COLUMN_DTYPES[column].itemsize
+            if not path.exists():
+                path.touch()
+            elif path.stat().st_size != expected:
+                logger.warning("Truncating torn candle cache column %s to %s rows.", path, rows)
+                os.truncate(path, expected)
+        return rows
+
+    def __len__(self) -> int:
+        return self._rows
+
+    @property
+    def last_timestamp(self) -> int | None:
+        if self._rows == 0:
+            return None
+        return int(self._column("timestamp", self._rows - 1, self._rows)[0])
+
+    def _column(self, column: str, start: int, stop: int) -> np.ndarray:
+        dtype = _COLUMN_DTYPES[column]
+        if stop <= start:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(
+            self._files[column],
+            dtype=dtype,
+            mode="r",
+            offset=start * dtype.itemsize,
+            shape=(stop - start,),
+        )
+
+    def read(self, start: int = 0, stop: int | None = None) -> CandleSnapshot:
+        """Memory-mapped, read-only view of cached rows ``[start, stop)``."""
+        stop = self._rows if stop is None else min(stop, self._rows)
+        start = max(0, min(start, stop))
+        return CandleSnapshot(*(self._column(column, start, stop) for column in _COLUMN_DTYPES))
+
+    def tail(self, count: int) -> CandleSnapshot:
+        return self.read(start=self._rows - count)
+
+    def append(self, candles: CandleSnapshot) -> int:
+        """Appends the candles newer than the cached tail. Returns the number of rows written."""
+        last = self.last_timestamp
+        first_new = 0 if last is None else int(np.searchsorted(candles.timestamp, last, side="right"))
+        count = len(candles) - first_new
+        if count <= 0:
+            return 0
+
+        for column in (*PRICE_COLUMNS, "timestamp"):
+            values = np.ascontiguousarray(candles[column][first_new:], dtype=_COLUMN_DTYPES[column])
+            with open(self._files[column], "ab") as handle:
+                handle.write(values.tobytes())
+        self._rows += count
+        return count
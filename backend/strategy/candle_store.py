@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+
+@dataclass(frozen=True)
+class CandleSnapshot:
+    """
+    Read-only columnar view of locked candles.
+
+    Columns are int64 millisecond timestamps and float64 OHLCV arrays that alias the
+    ring buffer's memory. Column access by name mirrors the DataFrame API so callers
+    can treat snapshots and frames alike (``snapshot["Close"][-1]``).
+    """
+
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return getattr(self, column.lower())
+
+    @property
+    def last_timestamp(self) -> pd.Timestamp:
+        return pd.Timestamp(int(self.timestamp[-1]), unit="ms", tz="UTC")
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> CandleSnapshot:
+        """Columnar view of a DatetimeIndex-ed OHLCV frame (naive index means UTC)."""
+        index = pd.DatetimeIndex(df.index)
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        timestamps = index.values.astype("datetime64[ms]").astype(np.int64)
+        return cls(timestamps, *(df[column].to_numpy(dtype=np.float64) for column in PRICE_COLUMNS))
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame adapter for pandas consumers. Returns a private, writable copy."""
+        nanoseconds = (self.timestamp * 1_000_000).view("datetime64[ns]")
+        index = pd.DatetimeIndex(nanoseconds, name="timestamp").tz_localize("UTC")
+        values = np.column_stack([self[column] for column in PRICE_COLUMNS])
+        return pd.DataFrame(values, columns=list(PRICE_COLUMNS), index=index)
+
+
+class CandleRingBuffer:
+    """
+    Fixed-capacity, column-oriented OHLCV store.
+
+    Every slot is written twice (at ``slot`` and ``slot + capacity``) so the newest
+    ``window`` candles are always one contiguous slice and snapshots never copy.
+    ``headroom`` extra slots keep a snapshot's memory untouched for at least that many
+    further candles, which is what makes zero-copy locked views safe to hand out.
+    """
+
+    def __init__(self, window: int, headroom: int | None = None):
+        if window < 1:
+            raise ValueError("window must be positive")
+        self.window = window
+        self.capacity = window + (window if headroom is None else headroom)
+        self._timestamps = np.zeros(2 * self.capacity, dtype=np.int64)
+        self._values = np.zeros((len(PRICE_COLUMNS), 2 * self.capacity), dtype=np.float64)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return min(self._count, self.window)
+
+    @property
+    def last_timestamp(self) -> int | None:
+        if self._count == 0:
+            return None
+        return int(self._timestamps[(self._count - 1) % self.capacity])
+
+    def _write(self, slot: int, timestamp: int, values) -> None:
+        mirror = slot + self.capacity
+        self._timestamps[slot] = self._timestamps[mirror] = timestamp
+        self._values[:, slot] = self._values[:, mirror] = values
+
+    def _window_bounds(self) -> tuple[int, int]:
+        length = len(self)
+        start = (self._count - length) % self.capacity
+        return start, start + length
+
+    def upsert(self, timestamp: int, values) -> None:
+        """Appends a newer candle or patches an existing one inside the live window."""
+        last = self.last_timestamp
+        if last is None or timestamp > last:
+            self._write(self._count % self.capacity, timestamp, values)
+            self._count += 1
+            return
+
+        start, end = self._window_bounds()
+        position = start + int(np.searchsorted(self._timestamps[start:end], timestamp))
+        if position < end and self._timestamps[position] == timestamp:
+            self._write(position % self.capacity, timestamp, values)
+
+    def extend(self, candles: CandleSnapshot) -> None:
+        """Bulk-appends candles newer than the current tail (used to hydrate from disk)."""
+        last = self.last_timestamp
+        first_new = 0 if last is None else int(np.searchsorted(candles.timestamp, last, side="right"))
+        timestamps = candles.timestamp[first_new:][-self.capacity :]
+        if len(timestamps) == 0:
+            return
+
+        skipped = len(candles) - first_new - len(timestamps)
+        slots = (self._count + skipped + np.arange(len(timestamps))) % self.capacity
+        values = np.vstack([candles[column][first_new:][-self.capacity :] for column in PRICE_COLUMNS])
+        for offset in (0, self.capacity):
+            self._timestamps[slots + offset] = timestamps
+            self._values[:, slots + offset] = values
+        self._count += skipped + len(timestamps)
+
+    def snapshot(self, through: int | None = None) -> CandleSnapshot:
+        """
+        Zero-copy view of the live window, optionally cut at candles opened at or before ``through``.
+        """
+        start, end = self._window_bounds()
+        if through is not None:
+            end = start + int(np.searchsorted(self._timestamps[start:end], through, side="right"))
+
+        timestamps = self._timestamps[start:end]
+        values = self._values[:, start:end]
+        columns = [timestamps, *values]
+        for column in columns:
+            column.flags.writeable = False
+        return CandleSnapshot(*columns)
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+import ccxt
+
+logger = logging.getLogger("openclaw.close_scheduler")
+
+
+class ExchangeClock:
+    """
+    Local-to-exchange clock offset, estimated from ``fetch_time`` round trips (midpoint method).
+
+    One instance can be shared by every scheduler reading the same exchange. Syncs are
+    serialized, and a caller that finds a sync younger than ``max_age_secs`` reuses it
+    instead of sending another request.
+    """
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.offset_ms = 0.0
+        self.round_trip_ms: float | None = None
+        self.synced_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def sync(self, fetch_server_time, max_age_secs: float = 0.0) -> None:
+        async with self._lock:
+            if self.synced_at is not None and self.clock() - self.synced_at < max_age_secs:
+                return
+            sent = self.clock()
+            server_ms = await fetch_server_time()
+            received = self.clock()
+            self.round_trip_ms = (received - sent) * 1000
+            self.offset_ms = server_ms - (sent + received) * 500
+            self.synced_at = received
+            logger.info("Exchange clock offset %.1f ms (rtt %.1f ms).", self.offset_ms, self.round_trip_ms)
+
+    def now_ms(self) -> float:
+        return self.clock() * 1000 + self.offset_ms
+
+
+class CloseBoundaryScheduler:
+    """
+    Wakes the feed just after each candle close on the exchange clock.
+
+    The clock offset comes from an ``ExchangeClock`` (shared when one is passed in) and is
+    refreshed every ``resync_every`` closes. Between closes the scheduler sleeps; after a
+    boundary it paces a short burst of confirmation polls. ``clock`` and ``sleep`` are
+    injectable so latency can be measured on a fake clock.
+    """
+
+    def __init__(
+        self,
+        timeframe: str,
+        grace_ms: float = 150,
+        confirm_interval_ms: float = 250,
+        confirm_attempts: int = 8,
+        resync_every: int = 12,
+        clock=time.time,
+        sleep=asyncio.sleep,
+        exchange_clock: ExchangeClock | None = None,
+    ):
+        self.timeframe_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        self.grace_ms = grace_ms
+        self.confirm_interval_ms = confirm_interval_ms
+        self.confirm_attempts = confirm_attempts
+        self.resync_every = resync_every
+        self.clock = clock
+        self.sleep = sleep
+        self.exchange_clock = exchange_clock or ExchangeClock(clock)
+        self._closes_since_sync: int | None = None
+
+    @property
+    def offset_ms(self) -> float:
+        return self.exchange_clock.offset_ms
+
+    @property
+    def round_trip_ms(self) -> float | None:
+        return self.exchange_clock.round_trip_ms
+
+    @property
+    def needs_clock_sync(self) -> bool:
+        return self._closes_since_sync is None or self._closes_since_sync >= self.resync_every
+
+    async def sync_clock(self, fetch_server_time) -> None:
+        # Feeds sharing the clock all ask on the same close; one round trip serves them all.
+        await self.exchange_clock.sync(fetch_server_time, max_age_secs=self.timeframe_ms / 2000)
+        self._closes_since_sync = 0
+
+    def exchange_now_ms(self) -> float:
+        return self.exchange_clock.now_ms()
+
+    async def wait_for_close(self) -> int:
+        """
+        Sleeps until ``grace_ms`` after the next boundary. Returns the open time of the candle that closed.
+        """
+        now_ms = self.exchange_now_ms()
+        boundary_ms = (int(now_ms) // self.timeframe_ms + 1) * self.timeframe_ms
+        await self.sleep((boundary_ms + self.grace_ms - now_ms) / 1000)
+        if self._closes_since_sync is not None:
+            self._closes_since_sync += 1
+        return boundary_ms - self.timeframe_ms
+
+    async def pause_between_confirmations(self) -> None:
+        await self.sleep(self.confirm_interval_ms / 1000)
@@ -1,79 +1,324 @@
 import asyncio
+import json
 import logging
 
 import ccxt.async_support as ccxt
 import pandas as pd
+import websockets
 
 from core.config import settings
+from strategy.candle_cache import CandleCache
+from strategy.candle_store import CandleRingBuffer
+from strategy.close_scheduler import CloseBoundaryScheduler
 
 logger = logging.getLogger("openclaw.data_feed")
 
 
+def _stream_name(symbol: str, timeframe: str) -> str:
+    market_id = symbol.split(":")[0].replace("/", "").lower()
+    return f"{market_id}@kline_{timeframe}"
+
+
+def kline_stream_url(base_url: str, symbol: str, timeframe: str) -> str:
+    """Builds the Binance USDM raw kline stream URL, e.g. .../ws/btcusdt@kline_5m."""
+    return f"{base_url.rstrip('/')}/ws/{_stream_name(symbol, timeframe)}"
+
+
+def combined_kline_stream_url(base_url: str, subscriptions: list[tuple[str, str]]) -> str:
+    """Builds one Binance combined stream URL, e.g. .../stream?streams=btcusdt@kline_5m/ethusdt@kline_5m."""
+    streams = "/".join(_stream_name(symbol, timeframe) for symbol, timeframe in subscriptions)
+    return f"{base_url.rstrip('/')}/stream?streams={streams}"
+
+
+def create_market_data_client():
+    """Unauthenticated async Binance USDM client used for market data."""
+    exchange = ccxt.binanceusdm({"enableRateLimit": True})
+    if settings.ENABLE_TESTNET:
+        exchange.set_sandbox_mode(True)
+        logger.info("TESTNET MODE ENABLED for market data polling.")
+    return exchange
+
+
 class LiveDataFeed:
     """
-    Async OHLCV polling feed with anti-repaint close-candle locking.
+    Async OHLCV feed with anti-repaint close-candle locking.
+
+    Runs in one of three modes: fixed-interval REST polling, ``scheduled`` REST
+    polling that stays quiet mid-candle and bursts right after each close on the
+    exchange clock, or websocket mode, where exchange kline pushes drive candle
+    closes and REST polling is only used as a fallback with gap backfill while
+    the stream is down. Candles live in a fixed-size ring buffer
+    and closes are dispatched as read-only ``CandleSnapshot`` views. With a
+    ``CandleCache`` attached, the feed hydrates from disk on start, fetches only
+    the gap (paging it into the cache first when it is wider than the window) and
+    appends every locked close back to the cache.
     """
 
-    def __init__(self, symbol: str, timeframe: str, max_candles: int = 100, poll_seconds: int = 3):
+    def __init__(
+        self,
+        symbol: str,
+        timeframe: str,
+        max_candles: int = 100,
+        poll_seconds: int = 3,
+        mode: str = "poll",
+        ws_url: str | None = None,
+        exchange=None,
+        rate_limiter=None,
+        cache: CandleCache | None = None,
+        scheduler: CloseBoundaryScheduler | None = None,
+    ):
+        if mode not in ("poll", "scheduled", "websocket"):
+            raise ValueError(f"Unsupported data feed mode: {mode}")
         self.symbol = symbol
         self.timeframe = timeframe
         self.max_candles = max_candles
         self.poll_seconds = poll_seconds
-        self.exchange = ccxt.binanceusdm({"enableRateLimit": True})
-        if settings.ENABLE_TESTNET:
-            self.exchange.set_sandbox_mode(True)
-            logger.info("TESTNET MODE ENABLED for market data polling.")
-        self.df = pd.DataFrame()
-        self.last_closed_candle_time = None
-
-    async def _fetch_frame(self) -> pd.DataFrame:
-        ohlcv = await self.exchange.fetch_ohlcv(self.symbol, self.timeframe, limit=self.max_candles)
-        df = pd.DataFrame(ohlcv, columns=["timestamp", "Open", "High", "Low", "Close", "Volume"])
-        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms", utc=True)
-        df.set_index("timestamp", inplace=True)
-        return df
+        self.mode = mode
+        self.ws_url = ws_url or kline_stream_url(settings.BINANCE_WS_BASE_URL, symbol, timeframe)
+        self.timeframe_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.scheduler = scheduler or CloseBoundaryScheduler(timeframe)
+        self._owns_exchange = exchange is None
+        self.exchange = exchange if exchange is not None else create_market_data_client()
+        self.candles = CandleRingBuffer(window=max_candles)
+        self.last_closed_candle_time: int | None = None
 
-    async def start_stream(self, on_candle_close_callback):
-        logger.info("Starting data feed for %s (%s)", self.symbol, self.timeframe)
-        try:
-            self.df = await self._fetch_frame()
-            if len(self.df) > 1:
-                self.last_closed_candle_time = self.df.index[-2]
-        except Exception as exc:
-            logger.error("Initial OHLCV fetch failed: %s", exc)
+    @property
+    def df(self) -> pd.DataFrame:
+        """DataFrame adapter over the live window, including the forming candle."""
+        return self.candles.snapshot().to_frame()
+
+    async def _fetch_rows(self, since: int | None = None) -> list:
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+        return await self.exchange.fetch_ohlcv(self.symbol, self.timeframe, since=since, limit=self.max_candles)
 
+    async def _fetch_time(self) -> int:
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+        return await self.exchange.fetch_time()
+
+    def _apply_rows(self, rows: list) -> None:
+        """
+        Upserts ascending OHLCV rows: known candles are patched in place, newer ones appended.
+        Candles already locked and dispatched are immutable and never patched.
+        """
+        for row in rows:
+            if self.last_closed_candle_time is not None and row[0] <= self.last_closed_candle_time:
+                continue
+            self.candles.upsert(row[0], row[1:])
+
+    async def _load_window(self) -> None:
+        # A fresh buffer keeps memory behind previously dispatched snapshots untouched.
+        self.candles = CandleRingBuffer(window=self.max_candles)
+        for row in await self._fetch_rows():
+            self.candles.upsert(row[0], row[1:])
+
+    async def _backfill_cache(self) -> None:
+        """
+        Pages closed candles forward from the cached tail until caught up, so a gap wider than
+        the live window does not leave a hole in the on-disk history.
+        """
         while True:
+            now_ms = self.exchange.milliseconds()
+            rows = await self._fetch_rows(since=self.cache.last_timestamp + self.timeframe_ms)
+            closed = [row for row in rows if row[0] + self.timeframe_ms <= now_ms]
+            if not closed:
+                return
+            page = CandleRingBuffer(window=len(closed))
+            for row in closed:
+                page.upsert(row[0], row[1:])
+            written = self.cache.append(page.snapshot())
+            logger.info("Backfilled %s cached candles for %s (%s).", written, self.symbol, self.timeframe)
+            if written == 0 or len(closed) < len(rows) or len(rows) < self.max_candles:
+                return
+
+    async def _refresh(self) -> None:
+        last_ms = self.candles.last_timestamp
+        if last_ms is None or (self.exchange.milliseconds() - last_ms) // self.timeframe_ms >= self.max_candles - 1:
+            # A since-query pages forward from the stale end, so wide gaps need a full window.
+            if self.cache is not None and self.cache.last_timestamp is not None:
+                await self._backfill_cache()
+            await self._load_window()
+            return
+        self._apply_rows(await self._fetch_rows(since=last_ms))
+
+    def _hydrate_from_cache(self) -> bool:
+        if self.cache is None or len(self.cache) == 0:
+            return False
+        self.candles.extend(self.cache.tail(self.max_candles))
+        self.last_closed_candle_time = self.cache.last_timestamp
+        logger.info(
+            "Hydrated %s cached candles for %s (%s); fetching only the gap.",
+            len(self.candles),
+            self.symbol,
+            self.timeframe,
+        )
+        return True
+
+    def _dispatch_close(self, closed_timestamp: int, on_candle_close_callback) -> None:
+        locked_candles = self.candles.snapshot(through=closed_timestamp)
+        if self.cache is not None:
             try:
-                new_df = await self._fetch_frame()
-                combined = pd.concat([self.df, new_df])
-                combined = combined[~combined.index.duplicated(keep="last")]
-                combined.sort_index(inplace=True)
-                self.df = combined.tail(self.max_candles)
-
-                if len(self.df) < 2:
-                    await asyncio.sleep(self.poll_seconds)
-                    continue
-
-                latest_timestamp = self.df.index[-1]
-                closed_timestamp = self.df.index[-2]
-
-                if self.last_closed_candle_time is None:
-                    self.last_closed_candle_time = closed_timestamp
-                    await asyncio.sleep(self.poll_seconds)
-                    continue
-
-                if closed_timestamp > self.last_closed_candle_time:
-                    locked_df = self.df[self.df.index <= closed_timestamp].copy()
-                    logger.info("Closed candle %s detected. Triggering pipeline.", closed_timestamp)
-                    asyncio.create_task(on_candle_close_callback(locked_df))
-                    self.last_closed_candle_time = closed_timestamp
-                elif latest_timestamp > self.last_closed_candle_time:
-                    # Handles first iteration where last lock points older than last complete candle.
-                    self.last_closed_candle_time = closed_timestamp
+                self.cache.append(locked_candles)
+            except OSError as exc:
+                logger.error("Candle cache append failed: %s", exc)
+        logger.info("Closed candle %s detected. Triggering pipeline.", locked_candles.last_timestamp)
+        asyncio.create_task(
+            on_candle_close_callback(locked_candles, symbol=self.symbol, timeframe=self.timeframe)
+        )
+        self.last_closed_candle_time = closed_timestamp
+
+    async def _poll_once(self, on_candle_close_callback) -> None:
+        await self._refresh()
+
+        if len(self.candles) < 2:
+            return
+
+        closed_timestamps = self.candles.snapshot().timestamp[:-1]
+        if self.last_closed_candle_time is None:
+            self.last_closed_candle_time = int(closed_timestamps[-1])
+            return
+
+        missed = closed_timestamps[closed_timestamps > self.last_closed_candle_time]
+        if len(missed) == len(closed_timestamps) and len(missed) > 1:
+            # The gap runs past the window start; earlier closes would be judged without their history.
+            logger.warning("%s closes of %s missed past the window; dispatching the latest.", len(missed), self.symbol)
+            missed = missed[-1:]
+        for closed_timestamp in missed:
+            self._dispatch_close(int(closed_timestamp), on_candle_close_callback)
+
+    def _handle_kline(self, kline: dict, on_candle_close_callback) -> None:
+        self._apply_rows(
+            [
+                [
+                    kline["t"],
+                    float(kline["o"]),
+                    float(kline["h"]),
+                    float(kline["l"]),
+                    float(kline["c"]),
+                    float(kline["v"]),
+                ]
+            ]
+        )
+
+        if not kline.get("x"):
+            return
+
+        closed_timestamp = int(kline["t"])
+        if self.last_closed_candle_time is None or closed_timestamp > self.last_closed_candle_time:
+            self._dispatch_close(closed_timestamp, on_candle_close_callback)
+
+    async def _run_polling(self, on_candle_close_callback) -> None:
+        while True:
+            try:
+                await self._poll_once(on_candle_close_callback)
             except Exception as exc:
                 logger.error("Data feed loop interrupted: %s", exc)
             finally:
                 await asyncio.sleep(self.poll_seconds)
 
+    async def _run_scheduled(self, on_candle_close_callback) -> None:
+        scheduler = self.scheduler
+        while True:
+            try:
+                if scheduler.needs_clock_sync:
+                    await scheduler.sync_clock(self._fetch_time)
+                closed_timestamp = await scheduler.wait_for_close()
+                for attempt in range(scheduler.confirm_attempts):
+                    await self._poll_once(on_candle_close_callback)
+                    if self.last_closed_candle_time is not None and self.last_closed_candle_time >= closed_timestamp:
+                        break
+                    await scheduler.pause_between_confirmations()
+                else:
+                    logger.warning(
+                        "Close of %s candle %s not confirmed after %s polls.",
+                        self.symbol,
+                        closed_timestamp,
+                        scheduler.confirm_attempts,
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.error("Scheduled data feed loop interrupted: %s", exc)
+                await scheduler.sleep(self.poll_seconds)
+
+    async def _run_websocket(self, on_candle_close_callback) -> None:
+        await run_kline_stream(self.ws_url, [self], on_candle_close_callback, self.poll_seconds)
+
+    async def prepare(self) -> None:
+        """Loads the initial window, from the cache when one is attached."""
+        try:
+            if not self._hydrate_from_cache():
+                await self._load_window()
+                if len(self.candles) > 1:
+                    self.last_closed_candle_time = int(self.candles.snapshot().timestamp[-2])
+        except Exception as exc:
+            logger.error("Initial OHLCV fetch failed: %s", exc)
+
+    async def start_stream(self, on_candle_close_callback):
+        logger.info("Starting %s data feed for %s (%s)", self.mode, self.symbol, self.timeframe)
+        await self.prepare()
+
+        if self.mode == "websocket":
+            await self._run_websocket(on_candle_close_callback)
+        elif self.mode == "scheduled":
+            await self._run_scheduled(on_candle_close_callback)
+        else:
+            await self._run_polling(on_candle_close_callback)
+
     async def close(self):
-        await self.exchange.close()
+        if self._owns_exchange:
+            await self.exchange.close()
+
+
+async def run_kline_stream(ws_url: str, feeds: list[LiveDataFeed], on_candle_close_callback, poll_seconds: float):
+    """
+    Drives ``feeds`` from one kline websocket (raw or combined), routing pushes by stream name.
+
+    On every (re)connect each feed first backfills by REST the closes it missed. While the
+    stream is down, every feed runs its regular REST polling loop until a reconnect succeeds.
+    """
+    routes = {_stream_name(feed.symbol, feed.timeframe): feed for feed in feeds}
+    fallbacks: list[asyncio.Task] = []
+
+    async def _stop_fallbacks() -> None:
+        for task in fallbacks:
+            task.cancel()
+        await asyncio.gather(*fallbacks, return_exceptions=True)
+        fallbacks.clear()
+
+    try:
+        while True:
+            try:
+                async with websockets.connect(ws_url, ping_interval=20) as stream:
+                    logger.info("Kline stream connected: %s", ws_url)
+                    await _stop_fallbacks()
+                    # Backfill whatever closed while the stream was down before trusting pushes again.
+                    for feed in feeds:
+                        await feed._poll_once(on_candle_close_callback)
+                    async for message in stream:
+                        try:
+                            payload = json.loads(message)
+                            payload = payload.get("data", payload)
+                            kline = payload.get("k")
+                            if kline is None:
+                                continue
+                            feed = routes.get(f"{payload['s'].lower()}@kline_{kline['i']}")
+                            if feed is not None:
+                                feed._handle_kline(kline, on_candle_close_callback)
+                        except (AttributeError, KeyError, TypeError, ValueError) as exc:
+                            logger.error("Malformed kline message skipped: %s", exc)
+                logger.warning("Kline stream closed. Falling back to REST polling.")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.error("Kline stream unavailable: %s. Falling back to REST polling.", exc)
+
+            # REST polling carries the feeds until a reconnect succeeds.
+            if not fallbacks:
+                fallbacks.extend(asyncio.create_task(feed._run_polling(on_candle_close_callback)) for feed in feeds)
+            await asyncio.sleep(poll_seconds)
+    finally:
+        await _stop_fallbacks()
@@ -0,0 +1,317 @@
+"""
+Declared, memoized derived columns shared by the strategy rules.
+
+A ``FeatureGraph`` holds feature definitions (name, inputs, compute function and how far
+each row reads back/ahead). A ``FeatureWindow`` binds the graph to one feed's candle
+window: every feature is computed at most once per window, lazily, and when the window
+advances by a few bars only the rows whose inputs changed are recomputed; the rest are
+copied over from the previous window. Per-feature timing counters live on the graph.
+"""
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from strategy.candle_store import CandleSnapshot
+
+BASE_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+@dataclass(frozen=True)
+class Feature:
+    name: str
+    inputs: tuple[str, ...]
+    compute: Callable[..., np.ndarray]
+    # Rows before/after row i that row i reads from its inputs.
+    lookback: int = 0
+    lookahead: int = 0
+    # False when row i can depend on the whole window (e.g. a forward fill); always recomputed.
+    local: bool = True
+
+
+@dataclass
+class FeatureTiming:
+    calls: int = 0
+    rows: int = 0
+    seconds: float = 0.0
+
+
+class FeatureGraph:
+    """
+    Registry of derived features over the base OHLCV columns, with per-feature timings.
+    """
+
+    def __init__(self):
+        self.features: dict[str, Feature] = {}
+        self.timings: dict[str, FeatureTiming] = {}
+        self._spans: dict[str, tuple[int, int, bool]] = {}
+
+    def feature(self, name: str, *inputs: str, lookback: int = 0, lookahead: int = 0, local: bool = True):
+        """Decorator registering ``compute(*input_arrays) -> ndarray`` as feature ``name``."""
+
+        def register(compute):
+            self.add(Feature(name, inputs, compute, lookback, lookahead, local))
+            return compute
+
+        return register
+
+    def add(self, feature: Feature) -> None:
+        if feature.name in BASE_COLUMNS or feature.name in self.features:
+            raise ValueError(f"feature {feature.name!r} is already defined")
+        missing = [name for name in feature.inputs if name not in BASE_COLUMNS and name not in self.features]
+        if missing:
+            raise ValueError(f"feature {feature.name!r} depends on undefined {missing}")
+        self.features[feature.name] = feature
+
+    def span(self, name: str) -> tuple[int, int, bool]:
+        """Cumulative (lookback, lookahead, local) of a feature through all of its inputs."""
+        if name in BASE_COLUMNS:
+            return 0, 0, True
+        if name not in self._spans:
+            feature = self.features[name]
+            lookback, lookahead, local = 0, 0, feature.local
+            for dependency in feature.inputs:
+                dep_back, dep_ahead, dep_local = self.span(dependency)
+                lookback, lookahead = max(lookback, dep_back), max(lookahead, dep_ahead)
+                local = local and dep_local
+            self._spans[name] = (lookback + feature.lookback, lookahead + feature.lookahead, local)
+        return self._spans[name]
+
+    @contextmanager
+    def timer(self, name: str):
+        """Times one feature evaluation or rule; the caller may add to ``rows``."""
+        timing = self.timings.setdefault(name, FeatureTiming())
+        started = time.perf_counter()
+        try:
+            yield timing
+        finally:
+            timing.calls += 1
+            timing.seconds += time.perf_counter() - started
+
+    def timing_report(self) -> list[dict]:
+        """Per-feature/rule cost, most expensive first. Rule timings include the features they pull in."""
+        report = [
+            {
+                "name": name,
+                "calls": timing.calls,
+                "rows": timing.rows,
+                "total_ms": timing.seconds * 1000,
+                "mean_us": timing.seconds / timing.calls * 1e6 if timing.calls else 0.0,
+            }
+            for name, timing in self.timings.items()
+        ]
+        return sorted(report, key=lambda row: row["total_ms"], reverse=True)
+
+    def window(self, min_reuse_rows: int = 1024) -> FeatureWindow:
+        return FeatureWindow(self, min_reuse_rows)
+
+
+class FeatureWindow:
+    """
+    Lazily evaluated feature values for the current candle window of one feed.
+    """
+
+    def __init__(self, graph: FeatureGraph, min_reuse_rows: int = 1024):
+        self.graph = graph
+        # Below this many reusable rows, two partial computes cost more than one full pass
+        # (measured crossover on the strategy graph is between 1k and 1.5k rows).
+        self.min_reuse_rows = min_reuse_rows
+        self.candles: CandleSnapshot | None = None
+        self._base: CandleSnapshot | None = None
+        self._values: dict[str, np.ndarray] = {}
+        self._previous: dict[str, np.ndarray] = {}
+        # New rows [0, overlap) equal previous rows [offset, offset + overlap).
+        self._offset = 0
+        self._overlap = 0
+
+    def advance(self, candles: CandleSnapshot) -> None:
+        """Binds the window to ``candles``; values overlapping the previous window become reusable."""
+        previous = self._base
+        self.candles = candles
+        self._previous = self._values
+        self._values = {}
+        self._offset = self._overlap = 0
+        if len(candles) < self.min_reuse_rows:
+            self._base = None
+            return
+        # Snapshots alias ring-buffer memory that is later reused, so compare against a private copy.
+        self._base = CandleSnapshot(*(np.array(candles[column]) for column in ("timestamp", *BASE_COLUMNS)))
+        if previous is None or len(previous) == 0:
+            return
+        offset = int(np.searchsorted(previous.timestamp, candles.timestamp[0]))
+        overlap = min(len(previous) - offset, len(candles))
+        if overlap <= 0:
+            return
+        rows = slice(offset, offset + overlap)
+        if not np.array_equal(previous.timestamp[rows], candles.timestamp[:overlap]):
+            return
+        # A candle patched inside the window invalidates everything derived from it.
+        for column in BASE_COLUMNS:
+            if not np.array_equal(previous[column][rows], candles[column][:overlap]):
+                return
+        self._offset, self._overlap = offset, overlap
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name in BASE_COLUMNS:
+            return self.candles[name]
+        values = self._values.get(name)
+        if values is None:
+            values = self._values[name] = self._evaluate(self.graph.features[name])
+        return values
+
+    def _evaluate(self, feature: Feature) -> np.ndarray:
+        inputs = [self[name] for name in feature.inputs]
+        size = len(self.candles)
+        lookback, lookahead, local = self.graph.span(feature.name)
+        previous = self._previous.get(feature.name)
+        # Rows [head, tail) read only inputs that are unchanged and away from the window edges.
+        head, tail = min(lookback, size), self._overlap - lookahead
+
+        with self.graph.timer(feature.name) as timing:
+            if previous is None or not local or tail - head < self.min_reuse_rows:
+                timing.rows += size
+                return feature.compute(*inputs)
+
+            values = np.empty(size, dtype=previous.dtype)
+            values[head:tail] = previous[self._offset + head : self._offset + tail]
+            if head:
+                stop = min(size, head + feature.lookahead)
+                values[:head] = feature.compute(*(array[:stop] for array in inputs))[:head]
+            if tail < size:
+                start = max(0, tail - feature.lookback)
+                values[tail:] = feature.compute(*(array[start:] for array in inputs))[tail - start :]
+            timing.rows += size - (tail - head)
+            return values
+
+
+def _shift(values: np.ndarray, periods: int) -> np.ndarray:
+    shifted = np.full(len(values), np.nan)
+    if periods < len(values):
+        shifted[periods:] = values[: len(values) - periods]
+    return shifted
+
+
+def _centered(values: np.ndarray, window: int, reducer) -> np.ndarray:
+    """``reducer`` over the centered ``window`` rows; NaN where the window leaves the array."""
+    result = np.full(len(values), np.nan)
+    if len(values) >= window:
+        half = window // 2
+        result[half : len(values) - half] = reducer(sliding_window_view(values, window), axis=1)
+    return result
+
+
+def _trailing(values: np.ndarray, window: int, reducer) -> np.ndarray:
+    """``reducer`` over the trailing ``window`` rows ending at each row; NaN until the window fills."""
+    result = np.full(len(values), np.nan)
+    if len(values) >= window:
+        result[window - 1 :] = reducer(sliding_window_view(values, window), axis=1)
+    return result
+
+
+def _forward_fill(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    positions = np.where(mask, np.arange(len(values)), -1)
+    np.maximum.accumulate(positions, out=positions)
+    return np.where(positions >= 0, values[positions], np.nan)
+
+
+def register_swing_features(graph: FeatureGraph, swing_lookback: int) -> None:
+    """Adds ``swing_high[k]``/``swing_low[k]`` and their forward-filled levels for lookback ``k``."""
+    suffix = f"[{swing_lookback}]"
+    if f"swing_high{suffix}" in graph.features:
+        return
+    window = swing_lookback * 2 + 1
+    graph.add(
+        Feature(
+            f"swing_high{suffix}",
+            ("high",),
+            lambda high: high == _centered(high, window, np.max),
+            swing_lookback,
+            swing_lookback,
+        )
+    )
+    graph.add(
+        Feature(
+            f"swing_low{suffix}",
+            ("low",),
+            lambda low: low == _centered(low, window, np.min),
+            swing_lookback,
+            swing_lookback,
+        )
+    )
+    graph.add(Feature(f"last_swing_high{suffix}", ("high", f"swing_high{suffix}"), _forward_fill, local=False))
+    graph.add(Feature(f"last_swing_low{suffix}", ("low", f"swing_low{suffix}"), _forward_fill, local=False))
+
+
+STRATEGY_FEATURES = FeatureGraph()
+
+
+@STRATEGY_FEATURES.feature("high_2", "high", lookback=2)
+def _high_2(high):
+    return _shift(high, 2)
+
+
+@STRATEGY_FEATURES.feature("low_2", "low", lookback=2)
+def _low_2(low):
+    return _shift(low, 2)
+
+
+@STRATEGY_FEATURES.feature("prev_open", "open", lookback=1)
+def _prev_open(open_):
+    return _shift(open_, 1)
+
+
+@STRATEGY_FEATURES.feature("prev_close", "close", lookback=1)
+def _prev_close(close):
+    return _shift(close, 1)
+
+
+@STRATEGY_FEATURES.feature("body", "open", "close")
+def _body(open_, close):
+    return np.abs(close - open_)
+
+
+@STRATEGY_FEATURES.feature("range", "high", "low")
+def _range(high, low):
+    range_size = high - low
+    return np.where(range_size == 0, np.nan, range_size)
+
+
+@STRATEGY_FEATURES.feature("body_ratio", "body", "range")
+def _body_ratio(body, range_size):
+    return body / range_size
+
+
+@STRATEGY_FEATURES.feature("true_range", "high", "low", "prev_close")
+def _true_range(high, low, prev_close):
+    # First row has no previous close; like pandas' max(skipna) it falls back to high - low.
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+@STRATEGY_FEATURES.feature("atr_14", "true_range", lookback=13)
+def _atr_14(true_range):
+    return _trailing(true_range, 14, np.mean)
+
+
+@STRATEGY_FEATURES.feature("volume_displacement", "volume", lookback=20)
+def _volume_displacement(volume):
+    """Volume relative to the mean of the 20 bars before it."""
+    baseline = _shift(_trailing(volume, 20, np.mean), 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return volume / np.where(baseline == 0, np.nan, baseline)
+
+
+@STRATEGY_FEATURES.feature("premium_discount", "high", "low", "close", lookback=49)
+def _premium_discount(high, low, close):
+    """Close position inside the 50-bar dealing range: 0 = range low, 1 = range high, > 0.5 is premium."""
+    range_high = _trailing(high, 50, np.max)
+    range_low = _trailing(low, 50, np.min)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (close - range_low) / np.where(range_high == range_low, np.nan, range_high - range_low)
+
+
+register_swing_features(STRATEGY_FEATURES, 5)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from core.config import settings
+from strategy.candle_cache import CandleCache
+from strategy.close_scheduler import CloseBoundaryScheduler, ExchangeClock
+from strategy.data_feed import LiveDataFeed, combined_kline_stream_url, create_market_data_client, run_kline_stream
+
+logger = logging.getLogger("openclaw.feed_multiplexer")
+
+
+class RequestBudget:
+    """
+    Async token bucket shared by every REST call made through one exchange client.
+    """
+
+    def __init__(self, requests_per_second: float, burst: int = 1):
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+        self.rate = requests_per_second
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                now = loop.time()
+                if self._updated_at is not None:
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class FeedMultiplexer:
+    """
+    Runs many (symbol, timeframe) feeds over one shared async exchange client.
+
+    Every REST call, clock syncs included, draws on one request budget. In poll mode feed
+    start-up is staggered across one poll interval so polls spread evenly instead of bursting
+    on the same tick. Scheduled feeds share one exchange clock, so a resync costs one
+    ``fetch_time`` per multiplexer. Websocket mode opens a single combined kline stream for
+    every subscription.
+    """
+
+    def __init__(
+        self,
+        subscriptions: list[tuple[str, str]],
+        max_candles: int = 100,
+        mode: str = "poll",
+        poll_seconds: float = 3,
+        requests_per_second: float = 10.0,
+        exchange=None,
+        cache_dir: str | None = None,
+        ws_base_url: str | None = None,
+    ):
+        if not subscriptions:
+            raise ValueError("FeedMultiplexer needs at least one subscription")
+        self.mode = mode
+        self.poll_seconds = poll_seconds
+        self._owns_exchange = exchange is None
+        self.exchange = exchange if exchange is not None else create_market_data_client()
+        self.budget = RequestBudget(requests_per_second)
+        self.exchange_clock = ExchangeClock()
+        self.ws_url = combined_kline_stream_url(
+            ws_base_url or settings.BINANCE_WS_BASE_URL, list(dict.fromkeys(subscriptions))
+        )
+        self.feeds: dict[tuple[str, str], LiveDataFeed] = {}
+        for symbol, timeframe in dict.fromkeys(subscriptions):
+            self.feeds[(symbol, timeframe)] = LiveDataFeed(
+                symbol=symbol,
+                timeframe=timeframe,
+                max_candles=max_candles,
+                poll_seconds=poll_seconds,
+                mode=mode,
+                exchange=self.exchange,
+                rate_limiter=self.budget,
+                cache=CandleCache(cache_dir, symbol, timeframe) if cache_dir else None,
+                scheduler=CloseBoundaryScheduler(timeframe, exchange_clock=self.exchange_clock),
+            )
+
+    async def _start_feed(self, feed: LiveDataFeed, delay: float, on_candle_close_callback) -> None:
+        await asyncio.sleep(delay)
+        await feed.start_stream(on_candle_close_callback)
+
+    async def start(self, on_candle_close_callback) -> None:
+        """
+        Starts every feed. The callback receives ``(locked_candles, symbol=..., timeframe=...)``.
+        """
+        feeds = list(self.feeds.values())
+        if self.mode == "websocket":
+            logger.info("Starting %s feeds on one kline stream with %.1f req/s budget.", len(feeds), self.budget.rate)
+            await asyncio.gather(*(feed.prepare() for feed in feeds))
+            await run_kline_stream(self.ws_url, feeds, on_candle_close_callback, self.poll_seconds)
+            return
+
+        # Scheduled feeds all wake on the same close boundary; only interval polling is spread out.
+        stagger = self.poll_seconds / len(feeds) if self.mode == "poll" else 0.0
+        logger.info(
+            "Starting %s %s feeds with %.2fs stagger and %.1f req/s budget.",
+            len(feeds),
+            self.mode,
+            stagger,
+            self.budget.rate,
+        )
+        await asyncio.gather(
+            *(self._start_feed(feed, index * stagger, on_candle_close_callback) for index, feed in enumerate(feeds))
+        )
+
+    async def close(self) -> None:
+        if self._owns_exchange:
+            await self.exchange.close()
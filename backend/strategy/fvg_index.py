@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import logging
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+
+from models.schemas import FVGZone
+from strategy.candle_store import CandleSnapshot
+
+logger = logging.getLogger("openclaw.fvg_index")
+
+
+@dataclass(frozen=True)
+class _Zone:
+    created: int
+    bottom: float
+    top: float
+
+
+class _ZoneSet:
+    """
+    Open zones of one direction, kept in two sorted lists (by bottom and by top).
+
+    Each entry is ``(edge, created)`` so zones with equal edges stay distinct and ordered.
+    """
+
+    def __init__(self):
+        self.zones: dict[int, _Zone] = {}
+        self.by_bottom: list[tuple[float, int]] = []
+        self.by_top: list[tuple[float, int]] = []
+
+    def __len__(self) -> int:
+        return len(self.zones)
+
+    def add(self, zone: _Zone) -> None:
+        self.zones[zone.created] = zone
+        insort(self.by_bottom, (zone.bottom, zone.created))
+        insort(self.by_top, (zone.top, zone.created))
+
+    def _discard(self, entries: list[tuple[float, int]], edge: float, created: int) -> None:
+        position = bisect_left(entries, (edge, created))
+        del entries[position]
+
+    def mitigate_bottom_at_or_above(self, price: float) -> int:
+        """Drops zones whose bottom is at or above ``price`` (fully filled from above)."""
+        start = bisect_left(self.by_bottom, (price, -1))
+        for _, created in self.by_bottom[start:]:
+            zone = self.zones.pop(created)
+            self._discard(self.by_top, zone.top, created)
+        removed = len(self.by_bottom) - start
+        del self.by_bottom[start:]
+        return removed
+
+    def mitigate_top_at_or_below(self, price: float) -> int:
+        """Drops zones whose top is at or below ``price`` (fully filled from below)."""
+        stop = bisect_right(self.by_top, (price, float("inf")))
+        for _, created in self.by_top[:stop]:
+            zone = self.zones.pop(created)
+            self._discard(self.by_bottom, zone.bottom, created)
+        del self.by_top[:stop]
+        return stop
+
+    def nearest_below(self, price: float) -> _Zone | None:
+        """Zone with the highest bottom strictly below ``price`` (it may contain ``price``)."""
+        position = bisect_left(self.by_bottom, (price, -1))
+        if position == 0:
+            return None
+        return self.zones[self.by_bottom[position - 1][1]]
+
+    def nearest_above(self, price: float) -> _Zone | None:
+        """Zone with the lowest top strictly above ``price`` (it may contain ``price``)."""
+        position = bisect_right(self.by_top, (price, float("inf")))
+        if position == len(self.by_top):
+            return None
+        return self.zones[self.by_top[position][1]]
+
+
+class FVGZoneIndex:
+    """
+    Unmitigated fair value gaps for one (symbol, timeframe), maintained per closed candle.
+
+    Gaps use the same three-candle rule as ``QuantitativeEngine``. A bullish gap stays open
+    until a candle's low trades down to its bottom; a bearish gap until a high trades up to
+    its top. Partial fills leave the zone open. Nearest-zone queries are bisections over
+    sorted edges, so they stay O(log n) with thousands of historical zones.
+    """
+
+    def __init__(self):
+        self.bullish = _ZoneSet()
+        self.bearish = _ZoneSet()
+        self._recent: deque[tuple[float, float, float, float]] = deque(maxlen=2)
+        self._last_timestamp: int | None = None
+
+    def update(self, timestamp: int, open_: float, high: float, low: float, close: float) -> None:
+        """Mitigates zones the bar traded through, then records the gap the bar completed, if any."""
+        self.bullish.mitigate_bottom_at_or_above(low)
+        self.bearish.mitigate_top_at_or_below(high)
+
+        if len(self._recent) == 2:
+            (_, high_2, low_2, _), (prev_open, _, _, prev_close) = self._recent
+            if low > high_2 and prev_close > prev_open:
+                self.bullish.add(_Zone(timestamp, bottom=high_2, top=low))
+            elif high < low_2 and prev_close < prev_open:
+                self.bearish.add(_Zone(timestamp, bottom=high, top=low_2))
+
+        self._recent.append((open_, high, low, close))
+        self._last_timestamp = timestamp
+
+    def reset(self) -> None:
+        self.bullish = _ZoneSet()
+        self.bearish = _ZoneSet()
+        self._recent.clear()
+        self._last_timestamp = None
+
+    def sync(self, candles: CandleSnapshot) -> None:
+        """
+        Folds in the snapshot's bars newer than the last one seen. When bars are missing between
+        the last one seen and the snapshot, the zones cannot be trusted (the missing bars may have
+        filled them) and the index is rebuilt from the snapshot alone.
+        """
+        first_new = 0
+        if self._last_timestamp is not None:
+            first_new = int(np.searchsorted(candles.timestamp, self._last_timestamp, side="right"))
+            step = int(candles.timestamp[1] - candles.timestamp[0]) if len(candles) > 1 else None
+            if first_new == 0 and step is not None and candles.timestamp[0] > self._last_timestamp + step:
+                logger.warning(
+                    "FVG index missed bars between %s and %s; rebuilding from the snapshot.",
+                    self._last_timestamp,
+                    int(candles.timestamp[0]),
+                )
+                self.reset()
+        for index in range(first_new, len(candles)):
+            self.update(
+                int(candles.timestamp[index]),
+                float(candles.open[index]),
+                float(candles.high[index]),
+                float(candles.low[index]),
+                float(candles.close[index]),
+            )
+
+    def closest_bullish(self, price: float) -> FVGZone:
+        """Nearest open bullish gap below ``price``."""
+        zone = self.bullish.nearest_below(price)
+        return FVGZone() if zone is None else FVGZone(top=zone.top, bottom=zone.bottom)
+
+    def closest_bearish(self, price: float) -> FVGZone:
+        """Nearest open bearish gap above ``price``."""
+        zone = self.bearish.nearest_above(price)
+        return FVGZone() if zone is None else FVGZone(top=zone.top, bottom=zone.bottom)
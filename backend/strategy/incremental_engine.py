@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+import logging
+from collections import deque
+from datetime import datetime, timezone
+
+import numpy as np
+
+from models.schemas import FVGZone, MarketState
+from strategy.candle_store import CandleSnapshot
+
+logger = logging.getLogger("openclaw.quant_engine")
+
+
+class IncrementalQuantEngine:
+    """
+    Streaming counterpart of ``QuantitativeEngine`` for one (symbol, timeframe).
+
+    Keeps the last ``2 * swing_lookback + 1`` bars plus the most recent confirmed swing
+    high/low between candles, so each new bar costs O(swing_lookback). ``sync`` reproduces
+    the batch engine's window semantics exactly: a swing only counts when its full centered
+    window lies inside the snapshot, and FVG/MSS flags only use bars inside the snapshot.
+    """
+
+    def __init__(self, symbol: str, timeframe: str, swing_lookback: int = 5):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.swing_lookback = swing_lookback
+        self.reset()
+
+    def reset(self) -> None:
+        span = 2 * self.swing_lookback + 1
+        self._highs: deque[float] = deque(maxlen=span)
+        self._lows: deque[float] = deque(maxlen=span)
+        self._opens: deque[float] = deque(maxlen=3)
+        self._closes: deque[float] = deque(maxlen=3)
+        self._count = 0
+        self._last_timestamp: int | None = None
+        self._last_swing_high: tuple[int, float] | None = None
+        self._last_swing_low: tuple[int, float] | None = None
+
+    def update(self, timestamp: int, open_: float, high: float, low: float, close: float) -> None:
+        """Folds one closed bar into the state."""
+        self._highs.append(high)
+        self._lows.append(low)
+        self._opens.append(open_)
+        self._closes.append(close)
+        self._count += 1
+        self._last_timestamp = timestamp
+
+        if len(self._highs) == self._highs.maxlen:
+            # The bar at the center of the deque now has its full swing window.
+            center_index = self._count - 1 - self.swing_lookback
+            center_high = self._highs[self.swing_lookback]
+            center_low = self._lows[self.swing_lookback]
+            if center_high == max(self._highs):
+                self._last_swing_high = (center_index, center_high)
+            if center_low == min(self._lows):
+                self._last_swing_low = (center_index, center_low)
+
+    def sync(self, candles: CandleSnapshot) -> MarketState:
+        """Folds in the snapshot's unseen bars and evaluates the checklist over the snapshot window."""
+        timestamps = candles.timestamp
+        first_new = 0
+        if self._last_timestamp is not None:
+            first_new = int(np.searchsorted(timestamps, self._last_timestamp, side="right"))
+            if first_new == 0 or int(timestamps[first_new - 1]) != self._last_timestamp:
+                # The snapshot does not continue our history; rebuild from it.
+                first_new = 0
+        if first_new == 0:
+            self.reset()
+
+        for index in range(first_new, len(candles)):
+            self.update(
+                int(timestamps[index]),
+                float(candles.open[index]),
+                float(candles.high[index]),
+                float(candles.low[index]),
+                float(candles.close[index]),
+            )
+        return self.market_state(window=len(candles))
+
+    def _swing_in_window(self, swing: tuple[int, float] | None, window_start: int) -> float | None:
+        if swing is None or swing[0] - self.swing_lookback < window_start:
+            return None
+        return swing[1]
+
+    def market_state(self, window: int) -> MarketState:
+        if window < 5 or self._last_timestamp is None:
+            return MarketState(
+                timestamp=datetime.now(timezone.utc),
+                symbol=self.symbol,
+                timeframe=self.timeframe,
+                valid_poi_found=False,
+            )
+
+        window_start = self._count - window
+        high, low = self._highs[-1], self._lows[-1]
+        open_, close = self._opens[-1], self._closes[-1]
+        prev_open, prev_close = self._opens[-2], self._closes[-2]
+        high_2, low_2 = self._highs[-3], self._lows[-3]
+
+        bullish_fvg = low > high_2 and prev_close > prev_open
+        bearish_fvg = high < low_2 and prev_close < prev_open
+        last_swing_high = self._swing_in_window(self._last_swing_high, window_start)
+        last_swing_low = self._swing_in_window(self._last_swing_low, window_start)
+
+        range_size = high - low
+        displacement = range_size != 0 and abs(close - open_) / range_size > 0.7
+        bullish_mss = last_swing_high is not None and close > last_swing_high and displacement and close > open_
+        bearish_mss = last_swing_low is not None and close < last_swing_low and displacement and close < open_
+
+        valid_setup = False
+        setup_type = None
+        stop_reference = None
+        if bullish_mss and bullish_fvg:
+            valid_setup = True
+            setup_type = "BULLISH_MSS_WITH_DISPLACEMENT"
+            stop_reference = high_2
+        elif bearish_mss and bearish_fvg:
+            valid_setup = True
+            setup_type = "BEARISH_MSS_WITH_DISPLACEMENT"
+            stop_reference = low_2
+
+        state = MarketState(
+            timestamp=datetime.fromtimestamp(self._last_timestamp / 1000, tz=timezone.utc),
+            symbol=self.symbol,
+            timeframe=self.timeframe,
+            valid_poi_found=valid_setup,
+            setup_type=setup_type,
+            stop_reference=stop_reference,
+            closest_bullish_fvg=FVGZone(top=low, bottom=high_2) if bullish_fvg else FVGZone(),
+            closest_bearish_fvg=FVGZone(top=low_2, bottom=high) if bearish_fvg else FVGZone(),
+            last_swing_high=last_swing_high,
+            last_swing_low=last_swing_low,
+        )
+        logger.info("Market structure state: %s", json.dumps(state.model_dump(mode="json")))
+        return state
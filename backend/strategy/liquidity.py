@@ -0,0 +1,160 @@
+"""
+Liquidity pools and Balanced Price Ranges over the full candle history.
+
+Everything is vectorized over the history arrays (suffix extremes, sorted clustering,
+searchsorted pairing), so one pass over 50k cached bars fits inside
+``LATENCY_BUDGET_MS`` per closed candle; ``benchmarks/bench_liquidity.py`` checks it.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from models.schemas import BPRZone, LiquidityPool
+from strategy.candle_store import CandleSnapshot
+from strategy.quant_kernels import detect_fair_value_gaps, detect_swing_points
+
+LATENCY_BUDGET_MS = 25.0
+
+
+def _extreme_after(values: np.ndarray, reducer: np.ufunc, empty: float) -> np.ndarray:
+    """``reducer`` over ``values[i + 1:]`` for every row (``empty`` for the last row)."""
+    result = np.full(len(values), empty)
+    if len(values) > 1:
+        result[:-1] = reducer.accumulate(values[:0:-1])[::-1]
+    return result
+
+
+def _cluster(levels: np.ndarray, tolerance: float, reducer: np.ufunc) -> tuple[np.ndarray, np.ndarray]:
+    """Groups sorted-by-price levels within ``tolerance`` (relative) of their neighbour."""
+    if len(levels) == 0:
+        return levels, np.zeros(0, dtype=np.int64)
+    levels = np.sort(levels)
+    starts = np.flatnonzero(np.concatenate(([True], np.diff(levels) > levels[:-1] * tolerance)))
+    touches = np.diff(np.append(starts, len(levels)))
+    return reducer.reduceat(levels, starts), touches
+
+
+def liquidity_pools(
+    high: np.ndarray,
+    low: np.ndarray,
+    swing_lookback: int = 5,
+    tolerance: float = 0.0005,
+) -> dict:
+    """
+    Un-swept swing highs (buy-side) and lows (sell-side), with equal highs/lows merged.
+
+    A swing level is un-swept while no later candle traded beyond it by more than
+    ``tolerance``; levels within ``tolerance`` of each other form one pool whose
+    ``touches`` count the equal highs/lows resting there.
+    """
+    swing_high, swing_low = detect_swing_points(high, low, swing_lookback)
+    unswept_high = swing_high & (_extreme_after(high, np.maximum, -np.inf) <= high * (1 + tolerance))
+    unswept_low = swing_low & (_extreme_after(low, np.minimum, np.inf) >= low * (1 - tolerance))
+    buy_side, buy_touches = _cluster(high[unswept_high], tolerance, np.maximum)
+    sell_side, sell_touches = _cluster(low[unswept_low], tolerance, np.minimum)
+    return {
+        "buy_side": buy_side,
+        "buy_touches": buy_touches,
+        "sell_side": sell_side,
+        "sell_touches": sell_touches,
+    }
+
+
+def _pair_with_earlier(later: np.ndarray, earlier: np.ndarray, max_separation: int) -> tuple[np.ndarray, np.ndarray]:
+    """Every (later, earlier) index pair where ``earlier`` precedes ``later`` by at most ``max_separation`` bars."""
+    first = np.searchsorted(earlier, later - max_separation, side="left")
+    stop = np.searchsorted(earlier, later, side="left")
+    counts = stop - first
+    total = int(counts.sum())
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(later, counts), earlier[np.repeat(first, counts) + offsets]
+
+
+def balanced_price_ranges(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    max_separation: int = 20,
+) -> dict:
+    """
+    Overlaps of opposite FVGs printed within ``max_separation`` bars, still not traded through.
+
+    The later gap sets the direction: a bullish gap overlapping an earlier bearish gap is a
+    bullish BPR, and vice versa. Returns parallel arrays of direction flags and bounds.
+    """
+    fvg = detect_fair_value_gaps(open_, high, low, close)
+    bullish_rows = np.flatnonzero(fvg["bullish"])
+    bearish_rows = np.flatnonzero(fvg["bearish"])
+    lowest_after = _extreme_after(low, np.minimum, np.inf)
+    highest_after = _extreme_after(high, np.maximum, -np.inf)
+
+    tops, bottoms, bullish = [], [], []
+    for later_rows, earlier_rows, is_bullish in (
+        (bullish_rows, bearish_rows, True),
+        (bearish_rows, bullish_rows, False),
+    ):
+        later, earlier = _pair_with_earlier(later_rows, earlier_rows, max_separation)
+        later_kind = "bullish" if is_bullish else "bearish"
+        earlier_kind = "bearish" if is_bullish else "bullish"
+        top = np.minimum(fvg[f"{later_kind}_top"][later], fvg[f"{earlier_kind}_top"][earlier])
+        bottom = np.maximum(fvg[f"{later_kind}_btm"][later], fvg[f"{earlier_kind}_btm"][earlier])
+        if is_bullish:
+            alive = (top > bottom) & (lowest_after[later] > bottom)
+        else:
+            alive = (top > bottom) & (highest_after[later] < top)
+        tops.append(top[alive])
+        bottoms.append(bottom[alive])
+        bullish.append(np.full(int(alive.sum()), is_bullish))
+    # One gap can overlap several opposite gaps with the same resulting range; keep each range once.
+    ranges = np.column_stack((np.concatenate(tops), np.concatenate(bottoms), np.concatenate(bullish)))
+    ranges = np.unique(ranges, axis=0)
+    return {"top": ranges[:, 0], "bottom": ranges[:, 1], "bullish": ranges[:, 2].astype(bool)}
+
+
+def find_liquidity_targets(
+    candles: CandleSnapshot,
+    price: float,
+    max_targets: int = 3,
+    max_zones: int = 3,
+    swing_lookback: int = 5,
+) -> tuple[list[LiquidityPool], list[BPRZone]]:
+    """
+    Ranked candidate targets for ``MarketState``.
+
+    Pools: the nearest ``max_targets`` buy-side pools above ``price`` and sell-side pools
+    below it, ordered by distance, then by touches. Zones: the ``max_zones`` live BPRs
+    closest to ``price`` (distance 0 when ``price`` is inside the range).
+    """
+    high, low = candles.high, candles.low
+    pools = liquidity_pools(high, low, swing_lookback)
+    targets: list[LiquidityPool] = []
+    for side, levels, touches, above in (
+        ("BUY_SIDE", pools["buy_side"], pools["buy_touches"], True),
+        ("SELL_SIDE", pools["sell_side"], pools["sell_touches"], False),
+    ):
+        mask = levels > price if above else levels < price
+        levels, touches = levels[mask], touches[mask]
+        distance = np.abs(levels - price)
+        for position in np.lexsort((-touches, distance))[:max_targets]:
+            targets.append(
+                LiquidityPool(
+                    side=side,
+                    price=float(levels[position]),
+                    touches=int(touches[position]),
+                    distance_pct=round(float(distance[position] / price * 100), 4),
+                )
+            )
+    targets.sort(key=lambda pool: pool.distance_pct)
+
+    ranges = balanced_price_ranges(candles.open, high, low, candles.close)
+    distance = np.maximum(ranges["bottom"] - price, 0) + np.maximum(price - ranges["top"], 0)
+    zones = [
+        BPRZone(
+            direction="BULLISH" if ranges["bullish"][position] else "BEARISH",
+            top=float(ranges["top"][position]),
+            bottom=float(ranges["bottom"][position]),
+        )
+        for position in np.argsort(distance, kind="stable")[:max_zones]
+    ]
+    return targets, zones
@@ -7,6 +7,8 @@ import pandas as pd
 
 from core.config import settings
 from models.schemas import FVGZone, MarketState
+from strategy.candle_store import CandleSnapshot
+from strategy.features import STRATEGY_FEATURES, FeatureWindow, register_swing_features
 
 logger = logging.getLogger("openclaw.quant_engine")
 
@@ -16,8 +18,20 @@ class QuantitativeEngine:
     Calculates deterministic market-structure and FVG signals.
     """
 
-    def __init__(self, data: pd.DataFrame):
-        self.df = data.copy()
+    def __init__(
+        self,
+        data: pd.DataFrame | CandleSnapshot,
+        symbol: str | None = None,
+        timeframe: str | None = None,
+        features: FeatureWindow | None = None,
+    ):
+        # The snapshot adapter already returns a private frame, so only caller-owned frames are copied.
+        self.df = data.to_frame() if isinstance(data, CandleSnapshot) else data.copy()
+        self.symbol = symbol or settings.TRADING_SYMBOL
+        self.timeframe = timeframe or settings.TRADING_TIMEFRAME
+        # Pass a long-lived window per feed to reuse derived columns across closes.
+        self.features = features if features is not None else STRATEGY_FEATURES.window()
+        self.features.advance(data if isinstance(data, CandleSnapshot) else CandleSnapshot.from_frame(self.df))
 
     @staticmethod
     def _maybe_float(value):
@@ -26,35 +40,36 @@ class QuantitativeEngine:
         return float(value)
 
     def detect_fair_value_gaps(self) -> pd.DataFrame:
-        df = self.df
-        df["Bullish_FVG"] = (df["Low"] > df["High"].shift(2)) & (df["Close"].shift(1) > df["Open"].shift(1))
-        df["Bullish_FVG_Top"] = np.where(df["Bullish_FVG"], df["Low"], np.nan)
-        df["Bullish_FVG_Btm"] = np.where(df["Bullish_FVG"], df["High"].shift(2), np.nan)
-
-        df["Bearish_FVG"] = (df["High"] < df["Low"].shift(2)) & (df["Close"].shift(1) < df["Open"].shift(1))
-        df["Bearish_FVG_Top"] = np.where(df["Bearish_FVG"], df["Low"].shift(2), np.nan)
-        df["Bearish_FVG_Btm"] = np.where(df["Bearish_FVG"], df["High"], np.nan)
+        df, features = self.df, self.features
+        with features.graph.timer("rule:detect_fair_value_gaps"):
+            high, low = features["high"], features["low"]
+            high_2, low_2 = features["high_2"], features["low_2"]
+            prev_open, prev_close = features["prev_open"], features["prev_close"]
+
+            df["Bullish_FVG"] = (low > high_2) & (prev_close > prev_open)
+            df["Bullish_FVG_Top"] = np.where(df["Bullish_FVG"], low, np.nan)
+            df["Bullish_FVG_Btm"] = np.where(df["Bullish_FVG"], high_2, np.nan)
+
+            df["Bearish_FVG"] = (high < low_2) & (prev_close < prev_open)
+            df["Bearish_FVG_Top"] = np.where(df["Bearish_FVG"], low_2, np.nan)
+            df["Bearish_FVG_Btm"] = np.where(df["Bearish_FVG"], high, np.nan)
         return df
 
     def map_market_structure(self, swing_lookback: int = 5) -> pd.DataFrame:
-        df = self.df
-        window = swing_lookback * 2 + 1
+        df, features = self.df, self.features
+        register_swing_features(features.graph, swing_lookback)
+        suffix = f"[{swing_lookback}]"
+        with features.graph.timer("rule:map_market_structure"):
+            open_, close = features["open"], features["close"]
+            df["Swing_High"] = features[f"swing_high{suffix}"]
+            df["Swing_Low"] = features[f"swing_low{suffix}"]
 
-        df["Swing_High"] = df["High"] == df["High"].rolling(window=window, center=True).max()
-        df["Swing_Low"] = df["Low"] == df["Low"].rolling(window=window, center=True).min()
+            df["Last_Swing_High"] = features[f"last_swing_high{suffix}"]
+            df["Last_Swing_Low"] = features[f"last_swing_low{suffix}"]
 
-        df["Last_Swing_High"] = df["High"].where(df["Swing_High"]).ffill()
-        df["Last_Swing_Low"] = df["Low"].where(df["Swing_Low"]).ffill()
-
-        body = (df["Close"] - df["Open"]).abs()
-        range_size = (df["High"] - df["Low"]).replace(0, np.nan)
-
-        df["Bullish_MSS"] = (df["Close"] > df["Last_Swing_High"]) & (body / range_size > 0.7) & (
-            df["Close"] > df["Open"]
-        )
-        df["Bearish_MSS"] = (df["Close"] < df["Last_Swing_Low"]) & (body / range_size > 0.7) & (
-            df["Close"] < df["Open"]
-        )
+            displacement = features["body_ratio"] > 0.7
+            df["Bullish_MSS"] = (close > df["Last_Swing_High"].to_numpy()) & displacement & (close > open_)
+            df["Bearish_MSS"] = (close < df["Last_Swing_Low"].to_numpy()) & displacement & (close < open_)
 
         return df
 
@@ -64,8 +79,8 @@ class QuantitativeEngine:
         if self.df.empty or len(self.df) < 5:
             return MarketState(
                 timestamp=datetime.now(timezone.utc),
-                symbol=settings.TRADING_SYMBOL,
-                timeframe=settings.TRADING_TIMEFRAME,
+                symbol=self.symbol,
+                timeframe=self.timeframe,
                 valid_poi_found=False,
             )
 
@@ -85,8 +100,8 @@ class QuantitativeEngine:
 
         state = MarketState(
             timestamp=self.df.index[-1].to_pydatetime(),
-            symbol=settings.TRADING_SYMBOL,
-            timeframe=settings.TRADING_TIMEFRAME,
+            symbol=self.symbol,
+            timeframe=self.timeframe,
             valid_poi_found=valid_setup,
             setup_type=setup_type,
             stop_reference=stop_reference,
@@ -0,0 +1,157 @@
+"""
+Array kernels for the execution checklist.
+
+Same signals as ``QuantitativeEngine`` computed on raw contiguous float64 arrays, with no
+Series construction, index alignment or row objects. NaN marks "no value" exactly where
+the pandas path produces NaN, so both paths build identical ``MarketState`` objects.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+
+import numpy as np
+
+from models.schemas import FVGZone, MarketState
+from strategy.candle_store import CandleSnapshot
+
+logger = logging.getLogger("openclaw.quant_engine")
+
+
+def detect_fair_value_gaps(open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> dict:
+    """Bullish/bearish FVG flags and zone bounds per row (bounds are NaN where there is no gap)."""
+    size = len(high)
+    bullish = np.zeros(size, dtype=bool)
+    bearish = np.zeros(size, dtype=bool)
+    if size > 2:
+        np.logical_and(low[2:] > high[:-2], close[1:-1] > open_[1:-1], out=bullish[2:])
+        np.logical_and(high[2:] < low[:-2], close[1:-1] < open_[1:-1], out=bearish[2:])
+    high_2 = np.full(size, np.nan)
+    low_2 = np.full(size, np.nan)
+    high_2[2:] = high[:-2]
+    low_2[2:] = low[:-2]
+    return {
+        "bullish": bullish,
+        "bullish_top": np.where(bullish, low, np.nan),
+        "bullish_btm": np.where(bullish, high_2, np.nan),
+        "bearish": bearish,
+        "bearish_top": np.where(bearish, low_2, np.nan),
+        "bearish_btm": np.where(bearish, high, np.nan),
+    }
+
+
+def _rolling_extreme(values: np.ndarray, window: int, reducer: np.ufunc) -> np.ndarray:
+    """
+    ``reducer`` over every full ``window``-row slice, by doubling spans (O(n log window)).
+
+    Contiguous elementwise passes beat a strided reduction over ``sliding_window_view``
+    on long histories; max/min are exact, so the result is identical.
+    """
+    span = 1
+    extreme = values
+    while span * 2 <= window:
+        extreme = reducer(extreme[:-span], extreme[span:])
+        span *= 2
+    return reducer(extreme[: len(values) - window + 1], extreme[window - span :])
+
+
+def detect_swing_points(high: np.ndarray, low: np.ndarray, swing_lookback: int = 5) -> tuple[np.ndarray, np.ndarray]:
+    """Rows whose high/low is the extreme of the centered ``2 * swing_lookback + 1`` window."""
+    size = len(high)
+    window = swing_lookback * 2 + 1
+    swing_high = np.zeros(size, dtype=bool)
+    swing_low = np.zeros(size, dtype=bool)
+    if size >= window:
+        centered = slice(swing_lookback, size - swing_lookback)
+        swing_high[centered] = high[centered] == _rolling_extreme(high, window, np.maximum)
+        swing_low[centered] = low[centered] == _rolling_extreme(low, window, np.minimum)
+    return swing_high, swing_low
+
+
+def _forward_fill(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    positions = np.where(mask, np.arange(len(values)), -1)
+    np.maximum.accumulate(positions, out=positions)
+    return np.where(positions >= 0, values[positions], np.nan)
+
+
+def map_market_structure(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    swing_lookback: int = 5,
+) -> dict:
+    """Swing flags, forward-filled last swings and MSS flags per row."""
+    swing_high, swing_low = detect_swing_points(high, low, swing_lookback)
+    last_swing_high = _forward_fill(high, swing_high)
+    last_swing_low = _forward_fill(low, swing_low)
+
+    range_size = high - low
+    with np.errstate(divide="ignore", invalid="ignore"):
+        displacement = (range_size != 0) & (np.abs(close - open_) / range_size > 0.7)
+    return {
+        "swing_high": swing_high,
+        "swing_low": swing_low,
+        "last_swing_high": last_swing_high,
+        "last_swing_low": last_swing_low,
+        "bullish_mss": (close > last_swing_high) & displacement & (close > open_),
+        "bearish_mss": (close < last_swing_low) & displacement & (close < open_),
+    }
+
+
+def _maybe_float(value) -> float | None:
+    return None if np.isnan(value) else float(value)
+
+
+def run_execution_checklist(
+    candles: CandleSnapshot,
+    symbol: str,
+    timeframe: str,
+    swing_lookback: int = 5,
+) -> MarketState:
+    """Array equivalent of ``QuantitativeEngine.run_execution_checklist`` for a locked snapshot."""
+    if len(candles) < 5:
+        return MarketState(
+            timestamp=datetime.now(timezone.utc),
+            symbol=symbol,
+            timeframe=timeframe,
+            valid_poi_found=False,
+        )
+
+    open_, high, low, close = candles.open, candles.high, candles.low, candles.close
+    fvg = detect_fair_value_gaps(open_, high, low, close)
+    structure = map_market_structure(open_, high, low, close, swing_lookback)
+
+    valid_setup = False
+    setup_type = None
+    stop_reference = None
+    if structure["bullish_mss"][-1] and fvg["bullish"][-1]:
+        valid_setup = True
+        setup_type = "BULLISH_MSS_WITH_DISPLACEMENT"
+        stop_reference = _maybe_float(fvg["bullish_btm"][-1])
+    elif structure["bearish_mss"][-1] and fvg["bearish"][-1]:
+        valid_setup = True
+        setup_type = "BEARISH_MSS_WITH_DISPLACEMENT"
+        stop_reference = _maybe_float(fvg["bearish_top"][-1])
+
+    state = MarketState(
+        timestamp=datetime.fromtimestamp(int(candles.timestamp[-1]) / 1000, tz=timezone.utc),
+        symbol=symbol,
+        timeframe=timeframe,
+        valid_poi_found=valid_setup,
+        setup_type=setup_type,
+        stop_reference=stop_reference,
+        closest_bullish_fvg=FVGZone(
+            top=_maybe_float(fvg["bullish_top"][-1]),
+            bottom=_maybe_float(fvg["bullish_btm"][-1]),
+        ),
+        closest_bearish_fvg=FVGZone(
+            top=_maybe_float(fvg["bearish_top"][-1]),
+            bottom=_maybe_float(fvg["bearish_btm"][-1]),
+        ),
+        last_swing_high=_maybe_float(structure["last_swing_high"][-1]),
+        last_swing_low=_maybe_float(structure["last_swing_low"][-1]),
+    )
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Market structure state: %s", state.model_dump_json())
+    return state
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+
+import ccxt
+import numpy as np
+
+from strategy.candle_store import CandleRingBuffer, CandleSnapshot
+
+logger = logging.getLogger("openclaw.resampler")
+
+
+@dataclass
+class _Bucket:
+    start: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    aligned: bool
+
+
+class IncrementalResampler:
+    """
+    Builds higher-timeframe bars from closed base candles as they arrive.
+
+    Each base bar costs O(1) per target timeframe: it folds into the open bucket,
+    and the bucket is published as soon as the last base bar of its period closes
+    (or when a later bucket starts after a gap). Buckets are aligned to UTC epoch
+    boundaries, so 15m/1h/4h/1d bars match the exchange's own candles. Partial
+    buckets seen at start-up are dropped rather than published with a wrong open.
+    """
+
+    def __init__(self, base_timeframe: str, targets: list[str], max_candles: int = 100):
+        self.base_timeframe = base_timeframe
+        self.base_ms = ccxt.Exchange.parse_timeframe(base_timeframe) * 1000
+        self.targets: dict[str, int] = {}
+        for target in targets:
+            if target[-1] in ("w", "M"):
+                raise ValueError(f"{target} bars are not epoch-aligned and cannot be resampled incrementally")
+            target_ms = ccxt.Exchange.parse_timeframe(target) * 1000
+            if target_ms <= self.base_ms or target_ms % self.base_ms:
+                raise ValueError(f"{target} is not a multiple of base timeframe {base_timeframe}")
+            self.targets[target] = target_ms
+        self.max_candles = max_candles
+        self._subscribers = []
+        self._last_seen: dict[str, int] = {}
+        self._buckets: dict[tuple[str, str], _Bucket] = {}
+        self._buffers: dict[tuple[str, str], CandleRingBuffer] = {}
+
+    def subscribe(self, on_candle_close_callback) -> None:
+        """Registers ``callback(locked_candles, symbol=..., timeframe=...)`` for higher-timeframe closes."""
+        self._subscribers.append(on_candle_close_callback)
+
+    def candles(self, symbol: str, timeframe: str) -> CandleSnapshot:
+        return self._buffer(symbol, timeframe).snapshot()
+
+    def _buffer(self, symbol: str, timeframe: str) -> CandleRingBuffer:
+        key = (symbol, timeframe)
+        if key not in self._buffers:
+            self._buffers[key] = CandleRingBuffer(window=self.max_candles)
+        return self._buffers[key]
+
+    def _emit(self, symbol: str, timeframe: str, bucket: _Bucket) -> bool:
+        if not bucket.aligned:
+            return False
+        self._buffer(symbol, timeframe).upsert(
+            bucket.start, (bucket.open, bucket.high, bucket.low, bucket.close, bucket.volume)
+        )
+        return True
+
+    def update(self, symbol: str, timestamp: int, open_: float, high: float, low: float, close: float, volume: float):
+        """Folds one closed base bar in. Returns the target timeframes that closed on it."""
+        closed = []
+        for timeframe, period_ms in self.targets.items():
+            key = (symbol, timeframe)
+            start = timestamp - timestamp % period_ms
+            bucket = self._buckets.get(key)
+
+            if bucket is not None and bucket.start != start:
+                # A gap skipped this bucket's final base bar; it is still over, so flush it.
+                if self._emit(symbol, timeframe, bucket):
+                    closed.append(timeframe)
+                bucket = None
+
+            if bucket is None:
+                bucket = _Bucket(start, open_, high, low, close, volume, aligned=timestamp == start)
+                self._buckets[key] = bucket
+            else:
+                bucket.high = max(bucket.high, high)
+                bucket.low = min(bucket.low, low)
+                bucket.close = close
+                bucket.volume += volume
+
+            if timestamp + self.base_ms == start + period_ms:
+                if self._emit(symbol, timeframe, bucket):
+                    closed.append(timeframe)
+                del self._buckets[key]
+        return closed
+
+    async def on_base_close(self, locked_candles: CandleSnapshot, symbol: str, timeframe: str) -> None:
+        """Feed callback: folds newly locked base candles in and publishes any higher-timeframe closes."""
+        if timeframe != self.base_timeframe:
+            return
+
+        # The first snapshot per symbol only warms up state; its history is not re-published.
+        publish = symbol in self._last_seen
+        last_seen = self._last_seen.get(symbol)
+        first_new = 0 if last_seen is None else int(np.searchsorted(locked_candles.timestamp, last_seen, side="right"))
+        closed: dict[str, None] = {}
+        for index in range(first_new, len(locked_candles)):
+            timestamp = int(locked_candles.timestamp[index])
+            for target in self.update(
+                symbol,
+                timestamp,
+                float(locked_candles.open[index]),
+                float(locked_candles.high[index]),
+                float(locked_candles.low[index]),
+                float(locked_candles.close[index]),
+                float(locked_candles.volume[index]),
+            ):
+                closed[target] = None
+            last_seen = timestamp
+        if last_seen is not None:
+            self._last_seen[symbol] = last_seen
+
+        if not publish:
+            return
+        for target in closed:
+            snapshot = self.candles(symbol, target)
+            logger.info("Higher-timeframe %s candle closed for %s at %s.", target, symbol, snapshot.last_timestamp)
+            for callback in self._subscribers:
+                asyncio.create_task(callback(snapshot, symbol=symbol, timeframe=target))
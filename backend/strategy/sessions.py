@@ -1,11 +1,28 @@
-from datetime import datetime, time
+from datetime import datetime, time, timedelta, timezone
 import logging
 
+import numpy as np
+import pandas as pd
+
 logger = logging.getLogger("openclaw.sessions")
 
+MINUTES_PER_DAY = 24 * 60
+MS_PER_MINUTE = 60_000
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _minute(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
 class SessionManager:
     """
     Strictly enforces UTC canonical session times and overlap killzones.
+
+    Every window is precomputed into minute-of-day lookup tables, so a whole timestamp
+    array is annotated with one modulo and one gather. Windows are inclusive at both
+    ends: the closing minute only matches on its exact boundary (e.g. 09:00:00, not
+    09:00:30), which keeps the tables identical to the original per-call time checks.
     """
     def __init__(self):
         # Defined strictly in UTC as per OpenClaw architectural rules
@@ -15,41 +32,81 @@ class SessionManager:
             "LONDON": {"open": time(8, 0), "close": time(17, 0)},
             "NEW_YORK": {"open": time(13, 0), "close": time(22, 0)}
         }
-        
+
         self.overlaps = {
             "TOKYO_LONDON": {"start": time(8, 0), "end": time(9, 0)},
             "LONDON_NY": {"start": time(13, 0), "end": time(17, 0)}
         }
 
-    def _is_time_between(self, current_time: time, start: time, end: time) -> bool:
-        """Handles midnight wrap-arounds for UTC time checks."""
+        # NY Silver Bullet (14:00 - 15:00 UTC / 10 AM - 11 AM EST)
+        self.silver_bullet = {"start": time(14, 0), "end": time(15, 0)}
+
+        windows = {name: (hours["open"], hours["close"]) for name, hours in self.sessions.items()}
+        windows.update({name: (hours["start"], hours["end"]) for name, hours in self.overlaps.items()})
+        windows["SILVER_BULLET"] = (self.silver_bullet["start"], self.silver_bullet["end"])
+        self.labels = list(windows)
+        self._killzone_bits = 0
+        for name in (*self.overlaps, "SILVER_BULLET"):
+            self._killzone_bits |= 1 << self.labels.index(name)
+        # Bits active anywhere inside a minute, and bits that only hold on the minute's first instant.
+        self._inside = np.zeros(MINUTES_PER_DAY, dtype=np.uint16)
+        self._boundary = np.zeros(MINUTES_PER_DAY, dtype=np.uint16)
+        for bit, (start, end) in enumerate(windows.values()):
+            self._fill(1 << bit, _minute(start), _minute(end))
+
+    def _fill(self, bit: int, start: int, end: int) -> None:
+        """Marks [start, end) as inside and ``end`` itself as a boundary-only match."""
+        minutes = np.arange(MINUTES_PER_DAY)
         if start < end:
-            return start <= current_time <= end
-        else: # Crosses midnight (e.g., Sydney)
-            return current_time >= start or current_time <= end
+            inside = (minutes >= start) & (minutes < end)
+        else:  # Crosses midnight (e.g., Sydney)
+            inside = (minutes >= start) | (minutes < end)
+        self._inside[inside] |= bit
+        self._boundary[end] |= bit
+
+    @staticmethod
+    def to_epoch_ms(timestamps) -> np.ndarray:
+        """Epoch milliseconds from a DatetimeIndex, datetime64 array or int64 ms array (naive means UTC)."""
+        if isinstance(timestamps, pd.DatetimeIndex):
+            if timestamps.tz is not None:
+                timestamps = timestamps.tz_convert("UTC").tz_localize(None)
+            return timestamps.values.astype("datetime64[ms]").astype(np.int64)
+        values = np.asarray(timestamps)
+        if np.issubdtype(values.dtype, np.datetime64):
+            return values.astype("datetime64[ms]").astype(np.int64)
+        return values.astype(np.int64, copy=False)
+
+    def session_bits(self, timestamps) -> np.ndarray:
+        """Bitmask per timestamp; bit ``i`` is set when ``self.labels[i]`` is active."""
+        epoch_ms = self.to_epoch_ms(timestamps)
+        minute = (epoch_ms // MS_PER_MINUTE) % MINUTES_PER_DAY
+        on_boundary = epoch_ms % MS_PER_MINUTE == 0
+        return self._inside[minute] | np.where(on_boundary, self._boundary[minute], 0).astype(np.uint16)
+
+    def killzone_mask(self, timestamps) -> np.ndarray:
+        return (self.session_bits(timestamps) & self._killzone_bits) != 0
+
+    def annotate(self, timestamps) -> pd.DataFrame:
+        """One boolean column per session/overlap/Silver Bullet plus ``KILLZONE``, in one vectorized pass."""
+        bits = self.session_bits(timestamps)
+        index = timestamps if isinstance(timestamps, pd.DatetimeIndex) else None
+        columns = {label: (bits & (1 << bit)) != 0 for bit, label in enumerate(self.labels)}
+        columns["KILLZONE"] = (bits & self._killzone_bits) != 0
+        return pd.DataFrame(columns, index=index)
+
+    @staticmethod
+    def _epoch_ms(current_dt_utc: datetime) -> int:
+        if current_dt_utc.tzinfo is None:
+            current_dt_utc = current_dt_utc.replace(tzinfo=timezone.utc)
+        return (current_dt_utc - _EPOCH) // timedelta(milliseconds=1)
 
     def get_active_sessions(self, current_dt_utc: datetime) -> list[str]:
         """Returns a list of currently active canonical sessions."""
-        current_time = current_dt_utc.time()
-        active = []
-        for session, hours in self.sessions.items():
-            if self._is_time_between(current_time, hours["open"], hours["close"]):
-                active.append(session)
-        return active
+        bits = int(self.session_bits([self._epoch_ms(current_dt_utc)])[0])
+        return [session for session in self.sessions if bits & (1 << self.labels.index(session))]
 
     def is_valid_killzone(self, current_dt_utc: datetime) -> bool:
         """
         Execution is ONLY allowed during high-volume overlaps or specific Silver Bullets.
         """
-        current_time = current_dt_utc.time()
-        
-        # Check overlaps
-        for overlap, hours in self.overlaps.items():
-            if self._is_time_between(current_time, hours["start"], hours["end"]):
-                return True
-                
-        # NY Silver Bullet (14:00 - 15:00 UTC / 10 AM - 11 AM EST)
-        if self._is_time_between(current_time, time(14, 0), time(15, 0)):
-            return True
-            
-        return False
+        return bool(self.killzone_mask([self._epoch_ms(current_dt_utc)])[0])
@@ -0,0 +1,116 @@
+from dataclasses import fields
+
+import numpy as np
+import pytest
+
+from backtest.engine import Backtester, simulate_exits
+from backtest.policies import CachedDecisionPolicy, RuleBasedPolicy
+from backtest.signals import checklist_signals, market_state_at
+from backtest.sweep import run_sweep
+from models.schemas import AIDecision
+from strategy.candle_store import CandleSnapshot
+from strategy.market_structure import QuantitativeEngine
+
+FIVE_MINUTES_MS = 5 * 60 * 1000
+T0 = 1_767_225_600_000
+
+
+def _random_candles(count: int, seed: int) -> CandleSnapshot:
+    """Rounded random walk with frequent displacement candles, so setups and swing ties occur."""
+    rng = np.random.default_rng(seed)
+    displacement = rng.random(count) < 0.15
+    moves = np.where(displacement, rng.choice([-1, 1], count) * rng.uniform(3, 6, count), rng.normal(0, 1, count))
+    close = 100.0 + np.cumsum(moves + rng.normal(0, 0.2, count))
+    open_ = close - moves
+    wick = np.where(displacement, 0.1, np.abs(rng.normal(0, 0.6, count)))
+    return CandleSnapshot(
+        T0 + np.arange(count, dtype=np.int64) * FIVE_MINUTES_MS,
+        open_.round(1),
+        (np.maximum(open_, close) + wick).round(1),
+        (np.minimum(open_, close) - wick).round(1),
+        close.round(1),
+        np.ones(count),
+    )
+
+
+def test_vectorized_signals_match_the_windowed_checklist_on_every_bar():
+    full = _random_candles(300, seed=4)
+    setups = 0
+    for window in (20, 60):
+        signals = checklist_signals(full, window)
+        for row in range(4, len(full)):
+            start = max(0, row + 1 - window)
+            locked = CandleSnapshot(*(getattr(full, field.name)[start : row + 1] for field in fields(CandleSnapshot)))
+            expected = QuantitativeEngine(locked, symbol="BTC/USDT", timeframe="5m").run_execution_checklist()
+            assert market_state_at(full, signals, row, "BTC/USDT", "5m") == expected, f"window {window}, row {row}"
+            setups += expected.valid_poi_found
+    assert setups > 0
+
+
+def test_exits_resolve_stop_first_then_target_then_time_stop():
+    high = np.array([101.0, 102.0, 106.0, 101.0, 101.0, 101.0, 101.0, 101.0])
+    low = np.array([99.0, 98.0, 99.5, 99.5, 99.5, 99.5, 99.5, 99.5])
+    close = np.array([100.0, 100.0, 105.0, 100.0, 100.0, 100.0, 100.5, 100.0])
+    exit_row, exit_price, reason = simulate_exits(
+        high,
+        low,
+        close,
+        entry_rows=np.array([0, 0, 2, 5]),
+        is_long=np.array([True, True, True, False]),
+        stop_loss=np.array([98.0, 95.0, 95.0, 110.0]),
+        take_profit=np.array([106.0, 106.0, 120.0, 90.0]),
+        horizon=4,
+    )
+    # Bar 1 touches the first stop, bar 2 reaches the second target; the last trade runs out of bars.
+    assert reason.tolist() == ["STOP", "TARGET", "TIME", "OPEN"]
+    assert exit_row.tolist() == [1, 2, 6, 7]
+    assert exit_price.tolist() == [98.0, 106.0, 100.5, 100.0]
+
+
+def test_cached_decisions_go_through_position_manager_math():
+    full = _random_candles(300, seed=4)
+    signals = checklist_signals(full, 100)
+    row = int(np.flatnonzero(signals["valid"])[0])
+    state = market_state_at(full, signals, row, "BTC/USDT", "5m")
+    is_long = state.setup_type.startswith("BULLISH")
+    price = float(full.close[row])
+    risk = abs(price - state.stop_reference * (0.999 if is_long else 1.001))
+    decision = AIDecision(
+        action="LONG" if is_long else "SHORT",
+        confidence=80,
+        reasoning="recorded",
+        target_liquidity=price + (4 * risk if is_long else -4 * risk),
+        stop_reference=state.stop_reference,
+    )
+    policy = CachedDecisionPolicy({("BTC/USDT", state.timestamp.isoformat()): decision})
+
+    report = Backtester(policy, window=100, killzone_gating=False, max_trade_duration_mins=10_000).run(full)
+
+    assert len(report.trades) == 1
+    trade = report.trades.iloc[0]
+    assert trade["entry_row"] == row
+    assert trade["entry_time"] == T0 + (row + 1) * FIVE_MINUTES_MS
+    assert trade["position_size"] * risk == pytest.approx(100.0)
+    expected_r = {"STOP": -1.0, "TARGET": 4.0}.get(trade["exit_reason"], trade["r_multiple"])
+    assert trade["r_multiple"] == pytest.approx(expected_r)
+    assert report.stats["policy_calls"] == report.stats["signals"]
+
+
+def test_sweep_matches_direct_backtests_and_ranks_results():
+    full = _random_candles(2000, seed=5)
+    grid = {"swing_lookback": [3, 5], "min_rr_ratio": [1.5, 3.0]}
+
+    results = run_sweep(full, grid, symbol="BTC/USDT", timeframe="5m", workers=2)
+
+    assert len(results) == 4
+    assert results["total_r"].is_monotonic_decreasing
+    for row in results.itertuples():
+        direct = Backtester(
+            RuleBasedPolicy(row.min_rr_ratio),
+            symbol="BTC/USDT",
+            timeframe="5m",
+            swing_lookback=row.swing_lookback,
+            min_rr_ratio=row.min_rr_ratio,
+        ).run(full)
+        assert row.trades == direct.stats["trades"]
+        assert row.total_r == pytest.approx(direct.stats["total_r"])
@@ -0,0 +1,17 @@
+from benchmarks.suite import compare, run
+
+
+def test_compare_flags_only_slowdowns_beyond_the_threshold():
+    baseline = {"a": {"p50_us": 100.0}, "b": {"p50_us": 100.0}, "c": {"p50_us": 100.0}}
+    results = {"a": {"p50_us": 124.0}, "b": {"p50_us": 126.0}, "c": {"p50_us": 60.0}, "d": {"p50_us": 5.0}}
+
+    statuses = {row["case"]: row["status"] for row in compare(results, baseline, threshold=0.25)}
+
+    assert statuses == {"a": "ok", "b": "regression", "c": "faster", "d": "new"}
+
+
+def test_suite_cases_run():
+    results = run(only="parser", repeat=3)
+
+    assert {"parser[plain]", "parser[think_preamble]", "parser[deeply_nested]"} <= set(results)
+    assert all(stats["p50_us"] > 0 for stats in results.values())
@@ -0,0 +1,130 @@
+import asyncio
+
+import numpy as np
+
+from strategy.candle_cache import CandleCache
+from strategy.candle_store import CandleRingBuffer
+from strategy.data_feed import LiveDataFeed
+
+FIVE_MINUTES_MS = 5 * 60 * 1000
+T0 = 1_767_225_600_000
+
+
+def _rows(first: int, last: int) -> list:
+    return [
+        [T0 + idx * FIVE_MINUTES_MS, 100.0, 101.0, 99.0, 100.0 + idx, 1.0]
+        for idx in range(first, last + 1)
+    ]
+
+
+def _snapshot(first: int, last: int):
+    buffer = CandleRingBuffer(window=last - first + 1)
+    for row in _rows(first, last):
+        buffer.upsert(row[0], row[1:])
+    return buffer.snapshot()
+
+
+def test_cache_appends_only_new_rows_and_reads_memory_mapped(tmp_path):
+    cache = CandleCache(tmp_path, "BTC/USDT", "5m")
+    assert cache.append(_snapshot(0, 4)) == 5
+    assert cache.append(_snapshot(3, 6)) == 2
+
+    reopened = CandleCache(tmp_path, "BTC/USDT", "5m")
+    tail = reopened.tail(3)
+
+    assert len(reopened) == 7
+    assert list(tail["Close"]) == [104.0, 105.0, 106.0]
+    assert isinstance(tail.close, np.memmap)
+    assert reopened.last_timestamp == T0 + 6 * FIVE_MINUTES_MS
+
+
+def test_cache_repairs_torn_append_on_open(tmp_path):
+    cache = CandleCache(tmp_path, "BTC/USDT", "5m")
+    cache.append(_snapshot(0, 2))
+    with open(cache.path / "Open.bin", "ab") as handle:
+        handle.write(np.array([1.0]).tobytes())
+
+    reopened = CandleCache(tmp_path, "BTC/USDT", "5m")
+
+    assert len(reopened) == 3
+    assert (reopened.path / "Open.bin").stat().st_size == 3 * 8
+
+
+class _GapExchange:
+    def __init__(self):
+        self.since_calls = []
+
+    def milliseconds(self):
+        return T0 + 4 * FIVE_MINUTES_MS + 1
+
+    async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.since_calls.append(since)
+        return [row for row in _rows(0, 4) if since is None or row[0] >= since][-limit:]
+
+    async def close(self):
+        return None
+
+
+def test_feed_hydrates_from_cache_fetches_gap_and_signals_on_first_poll(tmp_path):
+    cache = CandleCache(tmp_path, "BTC/USDT", "5m")
+    cache.append(_snapshot(0, 2))
+    exchange = _GapExchange()
+    feed = LiveDataFeed(symbol="BTC/USDT", timeframe="5m", max_candles=10, exchange=exchange, cache=cache)
+    dispatched = []
+
+    async def scenario():
+        done = asyncio.Event()
+
+        async def on_close(locked_candles, symbol, timeframe):
+            dispatched.append(locked_candles)
+            done.set()
+
+        task = asyncio.create_task(feed.start_stream(on_close))
+        try:
+            await asyncio.wait_for(done.wait(), timeout=2)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(scenario())
+
+    # No full-window fetch: the first request already starts at the cached tail.
+    assert exchange.since_calls[0] == T0 + 2 * FIVE_MINUTES_MS
+    assert dispatched[0].timestamp[-1] == T0 + 3 * FIVE_MINUTES_MS
+    assert list(dispatched[0]["Close"]) == [100.0, 101.0, 102.0, 103.0]
+    assert cache.last_timestamp == T0 + 3 * FIVE_MINUTES_MS
+
+
+class _PagingExchange:
+    """Candles 0-29 with 29 forming; since-queries page forward like Binance does."""
+
+    def milliseconds(self):
+        return T0 + 29 * FIVE_MINUTES_MS + 1
+
+    async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        rows = _rows(0, 29)
+        if since is None:
+            return rows[-limit:]
+        return [row for row in rows if row[0] >= since][:limit]
+
+    async def close(self):
+        return None
+
+
+def test_feed_pages_a_gap_wider_than_the_window_into_the_cache(tmp_path):
+    cache = CandleCache(tmp_path, "BTC/USDT", "5m")
+    cache.append(_snapshot(0, 2))
+    feed = LiveDataFeed(symbol="BTC/USDT", timeframe="5m", max_candles=5, exchange=_PagingExchange(), cache=cache)
+    dispatched = []
+
+    async def on_close(locked_candles, symbol, timeframe):
+        dispatched.append(locked_candles)
+
+    feed._hydrate_from_cache()
+    asyncio.run(feed._poll_once(on_close))
+
+    history = cache.read()
+    assert len(cache) == 29
+    assert np.all(np.diff(history.timestamp) == FIVE_MINUTES_MS)
+    assert list(history["Close"][-2:]) == [127.0, 128.0]
+    assert dispatched[0].timestamp[-1] == T0 + 28 * FIVE_MINUTES_MS
@@ -0,0 +1,47 @@
+import numpy as np
+
+from strategy.candle_store import CandleRingBuffer
+from strategy.market_structure import QuantitativeEngine
+
+
+def _fill(buffer: CandleRingBuffer, start: int, count: int) -> None:
+    for ts in range(start, start + count):
+        buffer.upsert(ts, [ts, ts + 1.0, ts - 1.0, ts + 0.5, 10.0])
+
+
+def test_snapshot_is_read_only_view_that_survives_further_appends():
+    buffer = CandleRingBuffer(window=5)
+    _fill(buffer, 0, 12)
+    snapshot = buffer.snapshot(through=10)
+
+    assert list(snapshot.timestamp) == [7, 8, 9, 10]
+    assert np.shares_memory(snapshot.close, buffer._values)
+    assert not snapshot.close.flags.writeable
+
+    # Headroom keeps the locked rows intact while new candles keep arriving.
+    _fill(buffer, 12, 5)
+    assert list(snapshot.timestamp) == [7, 8, 9, 10]
+    assert list(snapshot["Close"]) == [7.5, 8.5, 9.5, 10.5]
+
+
+def test_ring_buffer_memory_is_fixed_and_forming_candle_is_patched_in_place():
+    buffer = CandleRingBuffer(window=3)
+    storage = buffer._values
+    _fill(buffer, 0, 1_000)
+    buffer.upsert(999, [1.0, 2.0, 0.5, 1.5, 99.0])
+
+    assert buffer._values is storage
+    assert len(buffer) == 3
+    assert list(buffer.snapshot().timestamp) == [997, 998, 999]
+    assert buffer.snapshot()["Volume"][-1] == 99.0
+
+
+def test_quant_engine_accepts_snapshot_without_mutating_it():
+    buffer = CandleRingBuffer(window=20)
+    _fill(buffer, 0, 20)
+    snapshot = buffer.snapshot()
+
+    state = QuantitativeEngine(snapshot).run_execution_checklist()
+
+    assert state.timestamp == snapshot.last_timestamp.to_pydatetime()
+    assert list(snapshot.timestamp) == list(range(20))
@@ -0,0 +1,61 @@
+import asyncio
+
+from strategy.close_scheduler import CloseBoundaryScheduler
+
+FIVE_MINUTES_MS = 5 * 60 * 1000
+T0 = 1_767_225_600_000
+
+
+class _FakeClock:
+    def __init__(self, now: float):
+        self.now = now
+        self.sleeps = []
+
+    def time(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_clock_sync_corrects_skew_and_wakes_just_after_exchange_boundary():
+    # Local clock is 2 s behind the exchange, 10 s before the exchange-side close.
+    clock = _FakeClock(now=(T0 + FIVE_MINUTES_MS - 12_000) / 1000)
+    scheduler = CloseBoundaryScheduler("5m", grace_ms=150, clock=clock.time, sleep=clock.sleep)
+
+    async def fetch_server_time():
+        await clock.sleep(0.02)
+        server_ms = clock.time() * 1000 + 2_000
+        await clock.sleep(0.02)
+        return server_ms
+
+    async def scenario():
+        await scheduler.sync_clock(fetch_server_time)
+        return await scheduler.wait_for_close()
+
+    closed_open_time = asyncio.run(scenario())
+
+    assert abs(scheduler.offset_ms - 2_000) < 1
+    assert closed_open_time == T0
+    assert abs(scheduler.exchange_now_ms() - (T0 + FIVE_MINUTES_MS + 150)) < 1
+    assert scheduler.needs_clock_sync is False
+
+
+def test_scheduler_requests_resync_after_configured_number_of_closes():
+    clock = _FakeClock(now=T0 / 1000)
+    scheduler = CloseBoundaryScheduler("5m", resync_every=2, clock=clock.time, sleep=clock.sleep)
+
+    async def fetch_server_time():
+        return clock.time() * 1000
+
+    async def scenario():
+        await scheduler.sync_clock(fetch_server_time)
+        first = await scheduler.wait_for_close()
+        second = await scheduler.wait_for_close()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert second - first == FIVE_MINUTES_MS
+    assert scheduler.needs_clock_sync is True
@@ -0,0 +1,156 @@
+import asyncio
+import json
+
+import numpy as np
+import websockets
+
+from strategy.data_feed import LiveDataFeed
+
+FIVE_MINUTES_MS = 5 * 60 * 1000
+T0 = 1_767_225_600_000  # 2026-01-01T00:00:00Z
+
+
+def _kline(index: int, close: float, closed: bool) -> str:
+    open_time = T0 + index * FIVE_MINUTES_MS
+    return json.dumps(
+        {
+            "e": "kline",
+            "s": "BTCUSDT",
+            "k": {
+                "t": open_time,
+                "T": open_time + FIVE_MINUTES_MS - 1,
+                "i": "5m",
+                "o": "100.0",
+                "h": str(close + 1),
+                "l": "99.0",
+                "c": str(close),
+                "v": "10.0",
+                "x": closed,
+            },
+        }
+    )
+
+
+def _rest_rows(last_index: int) -> list:
+    return [
+        [T0 + idx * FIVE_MINUTES_MS, 100.0, 101.0 + idx, 99.0, 100.0 + idx, 10.0]
+        for idx in range(last_index + 1)
+    ]
+
+
+class _FakeExchange:
+    def __init__(self, rest_batches: list[list]):
+        self._batches = rest_batches
+        self.calls = []
+
+    def milliseconds(self):
+        return self._batches[0][-1][0] + 1
+
+    async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.calls.append(since)
+        rows = self._batches.pop(0) if len(self._batches) > 1 else self._batches[0]
+        return [row for row in rows if since is None or row[0] >= since][-limit:]
+
+    async def close(self):
+        return None
+
+
+async def _run_feed_against(
+    recorded: list[str], rest_batches: list[list], expected_closes: int, serve_once: bool = False
+):
+    async def replay(websocket):
+        if serve_once:
+            # Stop listening: every reconnect attempt fails until the test ends.
+            server.close(close_connections=False)
+        for message in recorded:
+            await websocket.send(message)
+        await websocket.close()
+
+    server = await websockets.serve(replay, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    feed = LiveDataFeed(
+        symbol="BTC/USDT",
+        timeframe="5m",
+        poll_seconds=0.05,
+        mode="websocket",
+        ws_url=f"ws://127.0.0.1:{port}",
+    )
+
+    await feed.exchange.close()
+    feed.exchange = _FakeExchange(rest_batches)
+    locked_frames = []
+    done = asyncio.Event()
+
+    async def on_close(locked_candles, symbol, timeframe):
+        assert (symbol, timeframe) == ("BTC/USDT", "5m")
+        locked_frames.append(locked_candles)
+        if len(locked_frames) >= expected_closes:
+            done.set()
+
+    task = asyncio.create_task(feed.start_stream(on_close))
+    try:
+        await asyncio.wait_for(done.wait(), timeout=5)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        server.close()
+        await server.wait_closed()
+        await feed.close()
+    return locked_frames
+
+
+def test_websocket_mode_dispatches_pushed_candle_closes_with_locked_snapshots():
+    recorded = [
+        _kline(2, 102.5, closed=False),
+        _kline(2, 103.0, closed=True),
+        _kline(3, 104.0, closed=False),
+        _kline(3, 105.0, closed=True),
+    ]
+    frames = asyncio.run(_run_feed_against(recorded, [_rest_rows(2)], expected_closes=2))
+
+    assert [snapshot["Close"][-1] for snapshot in frames] == [103.0, 105.0]
+    assert frames[0].timestamp[-1] == T0 + 2 * FIVE_MINUTES_MS
+    # Anti-repaint: the forming candle that follows a close is never in the locked snapshot.
+    assert all(np.all(np.diff(snapshot.timestamp) > 0) for snapshot in frames)
+    assert len(frames[1]) == 4
+    assert not frames[0]["Close"].flags.writeable
+
+
+def test_websocket_disconnect_falls_back_to_rest_and_backfills_gap():
+    recorded = [_kline(2, 103.0, closed=True)]
+    # Initial fetch, backfill on connect, then REST fallback sees candle 3 closed and 4 forming.
+    rest_batches = [_rest_rows(2), _rest_rows(2), _rest_rows(4)]
+    frames = asyncio.run(_run_feed_against(recorded, rest_batches, expected_closes=2))
+
+    assert frames[0]["Close"][-1] == 103.0
+    assert frames[1].timestamp[-1] == T0 + 3 * FIVE_MINUTES_MS
+
+    # The stream stays down: polling continues and a poll that finds several new closes dispatches each.
+    rest_batches = [_rest_rows(2), _rest_rows(2), _rest_rows(4), _rest_rows(4), _rest_rows(7)]
+    frames = asyncio.run(_run_feed_against(recorded, rest_batches, expected_closes=5, serve_once=True))
+
+    closes = [int(frame.timestamp[-1] - T0) // FIVE_MINUTES_MS for frame in frames]
+    assert closes == [2, 3, 4, 5, 6]
+    assert all(len(frame) == close + 1 for frame, close in zip(frames, closes))
+
+
+def test_incremental_refresh_patches_forming_candle_and_appends_new_ones():
+    feed = LiveDataFeed(symbol="BTC/USDT", timeframe="5m", max_candles=3)
+    asyncio.run(feed.exchange.close())
+    forming_update = _rest_rows(3)
+    forming_update[-1] = [T0 + 3 * FIVE_MINUTES_MS, 100.0, 110.0, 99.0, 109.0, 42.0]
+    feed.exchange = _FakeExchange([_rest_rows(3), forming_update, _rest_rows(4)])
+
+    async def refresh_three_times():
+        for _ in range(3):
+            await feed._refresh()
+
+    asyncio.run(refresh_three_times())
+
+    # Only the first refresh pulls a full window; later ones query from the forming candle.
+    assert feed.exchange.calls == [None, T0 + 3 * FIVE_MINUTES_MS, T0 + 3 * FIVE_MINUTES_MS]
+    assert len(feed.df) == 3
+    assert feed.df.index[-1].value // 1_000_000 == T0 + 4 * FIVE_MINUTES_MS
+    # The candle-4 batch re-sent candle 3 with its final values, overwriting the earlier patch.
+    assert feed.df["Close"].iloc[-2] == 103.0
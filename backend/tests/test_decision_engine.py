@@ -1,18 +1,30 @@
 import asyncio
-from datetime import datetime, timezone
+import json
+from datetime import datetime, timedelta, timezone
 
 import aiohttp
 import pytest
 
 from ai.decision_engine import DecisionEngine
+from core.metrics import metrics
 from models.schemas import MarketState
 
 
+async def _ndjson(chunks: list[dict]):
+    for chunk in chunks:
+        yield json.dumps(chunk).encode() + b"\n"
+
+
 class _FakeResponse:
     def __init__(self, status: int, payload: dict):
         self.status = status
         self._payload = payload
 
+    @property
+    def content(self):
+        # Streamed requests get the whole answer as one final chunk.
+        return _ndjson([{**self._payload, "done": True}])
+
     async def __aenter__(self):
         return self
 
@@ -22,20 +34,24 @@ class _FakeResponse:
     async def json(self):
         return self._payload
 
+    async def read(self):
+        return b""
+
 
 class _FakeSession:
+    closed = False
+
     def __init__(self, response: _FakeResponse):
         self._response = response
-
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, exc_type, exc, tb):
-        return False
+        self.payloads = []
 
     def post(self, url, json):
+        self.payloads.append(json)
         return self._response
 
+    async def close(self):
+        self.closed = True
+
 
 def _sample_market_state() -> MarketState:
     return MarketState(
@@ -65,11 +81,10 @@ def test_decision_engine_returns_wait_when_ollama_unavailable(monkeypatch):
     monkeypatch.setattr(DecisionEngine, "_load_execution_guide", lambda self: "guide")
 
     class _BrokenSession:
-        async def __aenter__(self):
-            raise aiohttp.ClientError("connection refused")
+        closed = False
 
-        async def __aexit__(self, exc_type, exc, tb):
-            return False
+        def post(self, url, json):
+            raise aiohttp.ClientError("connection refused")
 
     monkeypatch.setattr(aiohttp, "ClientSession", lambda *args, **kwargs: _BrokenSession())
 
@@ -79,3 +94,201 @@ def test_decision_engine_returns_wait_when_ollama_unavailable(monkeypatch):
     assert decision.action == "WAIT"
     assert decision.confidence == 0
     assert "Connection Failure" in decision.reasoning
+
+
+def test_decision_engine_reuses_one_session_and_reports_cold_and_warm_latency(monkeypatch):
+    monkeypatch.setattr(DecisionEngine, "_load_execution_guide", lambda self: "guide")
+    sessions = []
+    responses = iter(
+        [
+            _FakeResponse(status=200, payload={"done": True}),
+            _FakeResponse(
+                status=200,
+                payload={
+                    "response": "{}",
+                    "load_duration": 4_000_000_000,
+                    "prompt_eval_count": 1_800,
+                    "eval_count": 35,
+                },
+            ),
+            # Same static prefix: only the market state is evaluated.
+            _FakeResponse(
+                status=200,
+                payload={"response": "{}", "load_duration": 2_000_000, "prompt_eval_count": 60, "eval_count": 40},
+            ),
+        ]
+    )
+
+    class _SequencedSession(_FakeSession):
+        def post(self, url, json):
+            self.payloads.append(json)
+            return next(responses)
+
+    def _session(*args, **kwargs):
+        sessions.append(_SequencedSession(None))
+        return sessions[-1]
+
+    monkeypatch.setattr(aiohttp, "ClientSession", _session)
+    monkeypatch.setattr(metrics, "series", {})
+    monkeypatch.setattr(metrics, "counters", {})
+    engine = DecisionEngine()
+    engine.warm_ping_secs = 0
+
+    async def _run():
+        await engine.start()
+        await engine.evaluate_market(_sample_market_state())
+        await engine.evaluate_market(_sample_market_state())
+        await engine.close()
+
+    asyncio.run(_run())
+
+    assert len(sessions) == 1 and sessions[0].closed
+    warm_ping, *decisions = sessions[0].payloads
+    assert warm_ping["prompt"] == "" and warm_ping["keep_alive"] == engine.keep_alive
+    assert all(payload["keep_alive"] == engine.keep_alive for payload in decisions)
+    assert decisions[0]["system"] == decisions[1]["system"] and decisions[0]["system"].startswith("guide")
+    assert "null" not in decisions[0]["prompt"] and "\n " not in decisions[0]["prompt"]
+    report = metrics.snapshot("llm.")
+    assert report["llm.decision.cold"]["count"] == 1
+    assert report["llm.decision.warm"]["count"] == 1
+    assert report["llm.warm_ping"]["count"] == 1
+    assert report["llm.ttft"]["count"] == 2
+    assert report["llm.prompt_tokens"] == 1_860 and report["llm.output_tokens"] == 75
+
+
+def test_decision_engine_reuses_decision_for_near_identical_state_until_ttl(monkeypatch):
+    monkeypatch.setattr(DecisionEngine, "_load_execution_guide", lambda self: "guide")
+    answer = (
+        '{"action": "LONG", "confidence": 80, "reasoning": "MSS", "entry_poi": null,'
+        ' "target_liquidity": 105.0, "stop_reference": null}'
+    )
+    session = _FakeSession(_FakeResponse(status=200, payload={"response": answer}))
+    monkeypatch.setattr(aiohttp, "ClientSession", lambda *args, **kwargs: session)
+    monkeypatch.setattr(metrics, "counters", {})
+    engine = DecisionEngine()
+    opened = datetime(2026, 1, 5, 8, 0, tzinfo=timezone.utc)
+
+    def _state(minutes: int, stop: float) -> MarketState:
+        return _sample_market_state().model_copy(
+            update={"timestamp": opened + timedelta(minutes=minutes), "stop_reference": stop}
+        )
+
+    async def _run():
+        first = await engine.evaluate_market(_state(0, 65_002.0))
+        # Same setup one candle later, stop moved by less than the quantization step.
+        first.stop_reference = None
+        repeat = await engine.evaluate_market(_state(5, 65_001.0))
+        moved = await engine.evaluate_market(_state(10, 64_900.0))
+        expired = await engine.evaluate_market(_state(30, 65_002.0))
+        return repeat, moved, expired
+
+    repeat, moved, expired = asyncio.run(_run())
+
+    assert len(session.payloads) == 3
+    assert repeat.action == "LONG" and repeat.stop_reference == 65_001.0
+    assert moved.action == expired.action == "LONG"
+    assert metrics.snapshot("llm.cache.") == {"llm.cache.hit": 1, "llm.cache.miss": 3}
+
+
+def test_streamed_decision_skips_reasoning_and_stops_at_first_complete_object(monkeypatch):
+    monkeypatch.setattr(DecisionEngine, "_load_execution_guide", lambda self: "guide")
+    answer = json.dumps(
+        {
+            "action": "SHORT",
+            "confidence": 75,
+            "reasoning": "Bearish {MSS} into \"sell-side\" liquidity.",
+            "entry_poi": None,
+            "target_liquidity": 95.0,
+            "stop_reference": None,
+        }
+    )
+    # A decoy object inside the reasoning block, tags split across chunks, chatter after the answer.
+    text = '<thi' + 'nk>Maybe {"action": "LONG"} fits.</th' + 'ink>\n' + answer + "\nDone. " * 50
+    tokens = [text[index : index + 3] for index in range(0, len(text), 3)]
+    consumed = []
+
+    class _StreamResponse(_FakeResponse):
+        @property
+        def content(self):
+            async def _chunks():
+                for token in tokens:
+                    consumed.append(token)
+                    yield json.dumps({"response": token, "done": False}).encode()
+
+            return _chunks()
+
+    session = _FakeSession(_StreamResponse(status=200, payload={}))
+    monkeypatch.setattr(aiohttp, "ClientSession", lambda *args, **kwargs: session)
+    monkeypatch.setattr(metrics, "series", {})
+    monkeypatch.setattr(metrics, "counters", {})
+    engine = DecisionEngine()
+    engine.stream = True
+
+    decision = asyncio.run(engine.evaluate_market(_sample_market_state()))
+
+    assert session.payloads[0]["stream"] is True
+    assert decision.action == "SHORT" and decision.target_liquidity == 95.0
+    assert decision.reasoning == 'Bearish {MSS} into "sell-side" liquidity.'
+    assert answer in "".join(consumed) and "Done" not in "".join(consumed)
+    assert metrics.snapshot("llm.time_to_decision")["llm.time_to_decision"]["count"] == 1
+    # Cut before the final stats: no prompt count and no cold/warm guess from first-token latency.
+    report = metrics.snapshot("llm.")
+    assert "llm.prompt_tokens" not in report and report["llm.output_tokens"] > 0
+    assert report["llm.decision.unknown"]["count"] == 1 and "llm.decision.cold" not in report
+
+
+def test_evaluate_batch_keeps_valid_entries_and_retries_only_failed_ones(monkeypatch):
+    monkeypatch.setattr(DecisionEngine, "_load_execution_guide", lambda self: "guide")
+    decision = {
+        "action": "LONG",
+        "confidence": 80,
+        "reasoning": "MSS",
+        "entry_poi": None,
+        "target_liquidity": 110.0,
+        "stop_reference": None,
+    }
+    batch_answer = {
+        "decisions": [
+            {"id": 0, **decision},
+            {"id": 1, "action": "SHORT", "confidence": 60},
+            {"id": 7, **decision},
+        ]
+    }
+    single_answer = json.dumps({**decision, "action": "SHORT", "target_liquidity": 90.0})
+    responses = iter(
+        [
+            _FakeResponse(status=200, payload={"response": json.dumps(batch_answer)}),
+            _FakeResponse(status=200, payload={"response": single_answer}),
+            _FakeResponse(status=200, payload={"response": single_answer}),
+        ]
+    )
+
+    class _SequencedSession(_FakeSession):
+        def post(self, url, json):
+            self.payloads.append(json)
+            return next(responses)
+
+    session = _SequencedSession(None)
+    monkeypatch.setattr(aiohttp, "ClientSession", lambda *args, **kwargs: session)
+    engine = DecisionEngine()
+    engine.decision_cache = None
+    states = [
+        _sample_market_state().model_copy(update={"symbol": symbol})
+        for symbol in ("BTC/USDT", "ETH/USDT", "SOL/USDT")
+    ]
+
+    heard = []
+    decisions = asyncio.run(engine.evaluate_batch(states, on_decision=lambda index, d: heard.append(index)))
+
+    batch_payload, *singles = session.payloads
+    assert batch_payload["stream"] is False
+    assert batch_payload["options"]["num_predict"] <= engine.num_ctx
+    # Every decision is reported, the valid batch entry first and the retries after it.
+    assert heard == [0, 1, 2]
+    assert [state["id"] for state in json.loads(batch_payload["prompt"].split("\n", 2)[-1])] == [0, 1, 2]
+    assert [json.loads(payload["prompt"].split("\n", 1)[1])["symbol"] for payload in singles] == [
+        "ETH/USDT",
+        "SOL/USDT",
+    ]
+    assert [d.action for d in decisions] == ["LONG", "SHORT", "SHORT"]
+    assert decisions[0].target_liquidity == 110.0 and decisions[0].stop_reference == 100.0
@@ -0,0 +1,103 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+
+import worker
+from ai.llm_scheduler import LLMScheduler
+from core.metrics import metrics
+from execution.feasibility import FeasibilityFilter
+from execution.position_manager import plan_trade
+from models.schemas import AIDecision, BPRZone, FVGZone, LiquidityPool, MarketState
+
+
+def _bullish_state(**overrides) -> MarketState:
+    fields = {
+        "timestamp": datetime.now(timezone.utc),
+        "symbol": "BTC/USDT",
+        "timeframe": "5m",
+        "valid_poi_found": True,
+        "setup_type": "BULLISH_MSS_WITH_DISPLACEMENT",
+        "stop_reference": 99.0,
+        "closest_bullish_fvg": FVGZone(top=100.2, bottom=99.8),
+        "last_swing_high": 102.0,
+        "liquidity_targets": [LiquidityPool(side="BUY_SIDE", price=101.5, distance_pct=1.0)],
+    }
+    return MarketState(**{**fields, **overrides})
+
+
+def test_filter_bound_matches_plan_trade_at_the_rr_threshold():
+    feasibility = FeasibilityFilter()
+    state = _bullish_state()
+    verdict = feasibility.check(state, 100.5, 3.0)
+    # Best level set: entry at the FVG's distal edge, target the swing high.
+    plan = plan_trade(
+        AIDecision(
+            action="LONG", confidence=80, reasoning="", entry_poi=99.8, target_liquidity=102.0, stop_reference=99.0
+        ),
+        current_price=100.5,
+        account_balance=10_000.0,
+        risk_percent=0.01,
+        min_rr_ratio=0.0,
+    )
+
+    assert verdict["feasible"] is False and verdict["action"] == "LONG"
+    assert verdict["rr_bound"] == pytest.approx(plan["rr_ratio"])
+    assert f"{plan['rr_ratio']:.2f}" in verdict["reason"]
+    assert feasibility.check(state, 100.5, plan["rr_ratio"] - 1e-9)["feasible"] is True
+    far_pool = [LiquidityPool(side="BUY_SIDE", price=105.0, distance_pct=4.5)]
+    assert feasibility.check(_bullish_state(liquidity_targets=far_pool), 100.5, 3.0)["feasible"] is True
+    # Nothing to bound with: let the LLM decide.
+    assert feasibility.check(_bullish_state(stop_reference=None), 100.5, 3.0)["feasible"] is True
+
+
+def test_entry_deep_in_the_zone_keeps_the_setup_feasible():
+    feasibility = FeasibilityFilter()
+    # Only an entry near the zone's bottom clears 3R; the current price and the FVG top do not.
+    deep_fvg = _bullish_state(closest_bullish_fvg=FVGZone(top=100.2, bottom=99.0))
+    deep_bpr = _bullish_state(bpr_zones=[BPRZone(direction="BULLISH", top=99.7, bottom=99.3)])
+    plan = plan_trade(
+        AIDecision(
+            action="LONG", confidence=80, reasoning="", entry_poi=99.6, target_liquidity=102.0, stop_reference=99.0
+        ),
+        current_price=100.5,
+        account_balance=10_000.0,
+        risk_percent=0.01,
+        min_rr_ratio=3.0,
+    )
+
+    assert plan["status"] == "planned"
+    assert feasibility.check(deep_fvg, 100.5, 3.0)["feasible"] is True
+    verdict = feasibility.check(deep_bpr, 100.5, 3.0)
+    assert verdict["feasible"] is True and verdict["rr_bound"] >= 3.0
+
+
+def test_worker_rejects_infeasible_setup_without_calling_the_llm(monkeypatch):
+    events = []
+
+    async def _fake_publish(event):
+        events.append(event)
+
+    async def _never_called(_):
+        pytest.fail("infeasible setup must not reach the LLM")
+
+    monkeypatch.setattr(worker, "_market_state", lambda locked, symbol, timeframe: _bullish_state())
+    monkeypatch.setattr(worker, "publish_event", _fake_publish)
+    monkeypatch.setattr(worker, "llm_scheduler", LLMScheduler(worker.ai_brain))
+    monkeypatch.setattr(worker.ai_brain, "evaluate_market", _never_called)
+    monkeypatch.setattr(worker.risk_guard, "check_daily_killswitch", lambda db: True)
+    monkeypatch.setattr(worker.settings, "KILLZONE_GATING_ENABLED", False)
+    monkeypatch.setattr(metrics, "counters", {})
+    locked = pd.DataFrame(
+        [[100.0, 101.0, 99.0, 100.5, 1000]],
+        columns=["Open", "High", "Low", "Close", "Volume"],
+        index=[datetime.now(timezone.utc)],
+    )
+
+    asyncio.run(worker.process_closed_candle(locked, symbol="BTC/USDT", timeframe="5m"))
+
+    assert len(events) == 1
+    assert events[0].status == "REJECTED" and events[0].action == "LONG"
+    assert "LLM skipped" in events[0].reasoning
+    assert metrics.counters["llm.calls_saved.feasibility"] == 1
@@ -0,0 +1,64 @@
+import numpy as np
+
+from strategy.candle_store import CandleRingBuffer
+from strategy.features import STRATEGY_FEATURES, FeatureGraph
+
+FIVE_MINUTES_MS = 5 * 60 * 1000
+
+
+def test_advanced_window_matches_fresh_evaluation_for_every_feature():
+    rng = np.random.default_rng(3)
+    for window in (30, 120):
+        buffer = CandleRingBuffer(window=window)
+        # min_reuse_rows=1 forces partial recomputation even on small windows.
+        live = STRATEGY_FEATURES.window(min_reuse_rows=1)
+        close = 100.0
+        for step in range(300):
+            open_ = close
+            close = open_ + rng.normal(0, 1)
+            high = round(max(open_, close) + abs(rng.normal(0, 0.3)), 1)
+            low = round(min(open_, close) - abs(rng.normal(0, 0.3)), 1)
+            volume = float(rng.integers(0, 50))
+            buffer.upsert(step * FIVE_MINUTES_MS, (round(open_, 1), high, low, round(close, 1), volume))
+            if step > 3 and rng.random() < 0.03:
+                # A late correction inside the window must invalidate the reused rows.
+                buffer.upsert((step - 2) * FIVE_MINUTES_MS, (101.0, 102.0, 100.5, 101.5, 3.0))
+
+            snapshot = buffer.snapshot()
+            live.advance(snapshot)
+            fresh = STRATEGY_FEATURES.window()
+            fresh.advance(snapshot)
+            for name in STRATEGY_FEATURES.features:
+                expected = fresh[name]
+                np.testing.assert_array_equal(live[name], expected, err_msg=f"{name} at step {step}")
+                assert live[name].dtype == expected.dtype
+
+
+def test_features_are_computed_once_per_window_and_timed():
+    graph = FeatureGraph()
+    calls = []
+
+    @graph.feature("midpoint", "high", "low")
+    def _midpoint(high, low):
+        calls.append(len(high))
+        return (high + low) / 2
+
+    @graph.feature("midpoint_2", "midpoint", lookback=2)
+    def _midpoint_2(midpoint):
+        return np.concatenate(([np.nan, np.nan], midpoint[:-2]))
+
+    buffer = CandleRingBuffer(window=10)
+    for step in range(10):
+        buffer.upsert(step * FIVE_MINUTES_MS, (1.0, 2.0 + step, 0.5, 1.5, 1.0))
+    window = graph.window()
+    window.advance(buffer.snapshot())
+
+    window["midpoint_2"]
+    window["midpoint"]
+    window["midpoint_2"]
+
+    assert calls == [10]
+    assert graph.span("midpoint_2") == (2, 0, True)
+    report = {row["name"]: row for row in graph.timing_report()}
+    assert report["midpoint"]["calls"] == 1
+    assert report["midpoint_2"]["rows"] == 10
@@ -0,0 +1,169 @@
+import asyncio
+import json
+
+import websockets
+
+from strategy.feed_multiplexer import FeedMultiplexer, RequestBudget
+
+FIVE_MINUTES_MS = 5 * 60 * 1000
+T0 = 1_767_225_600_000
+
+
+class _SharedFakeExchange:
+    """One client for every symbol: the first poll per symbol sees candle 2 forming, later ones candle 3."""
+
+    def __init__(self):
+        self.calls: dict[str, int] = {}
+        self.closed = False
+
+        self.time_calls = 0
+
+    def milliseconds(self):
+        return T0 + 3 * FIVE_MINUTES_MS + 1
+
+    async def fetch_time(self):
+        self.time_calls += 1
+        return self.milliseconds()
+
+    async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        count = self.calls[symbol] = self.calls.get(symbol, 0) + 1
+        last_index = 2 if count == 1 else 3
+        rows = [
+            [T0 + idx * FIVE_MINUTES_MS, 100.0, 101.0, 99.0, 100.0 + idx, 1.0]
+            for idx in range(last_index + 1)
+        ]
+        return [row for row in rows if since is None or row[0] >= since][-limit:]
+
+    async def close(self):
+        self.closed = True
+
+
+def test_multiplexer_dispatches_each_symbol_over_one_shared_client():
+    exchange = _SharedFakeExchange()
+    symbols = ["BTC/USDT", "ETH/USDT", "SOL/USDT"]
+    multiplexer = FeedMultiplexer(
+        subscriptions=[(symbol, "5m") for symbol in symbols],
+        poll_seconds=0.05,
+        requests_per_second=200,
+        exchange=exchange,
+    )
+    seen = {}
+
+    async def scenario():
+        done = asyncio.Event()
+
+        async def on_close(locked_candles, symbol, timeframe):
+            seen[(symbol, timeframe)] = int(locked_candles.timestamp[-1])
+            if len(seen) == len(symbols):
+                done.set()
+
+        task = asyncio.create_task(multiplexer.start(on_close))
+        try:
+            await asyncio.wait_for(done.wait(), timeout=5)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await multiplexer.close()
+
+    asyncio.run(scenario())
+
+    assert seen == {(symbol, "5m"): T0 + 2 * FIVE_MINUTES_MS for symbol in symbols}
+    assert all(feed.exchange is exchange for feed in multiplexer.feeds.values())
+    # Feeds never close a client they do not own; the multiplexer does.
+    assert exchange.closed is False
+
+
+def test_request_budget_spaces_calls_at_configured_rate():
+    async def scenario():
+        budget = RequestBudget(requests_per_second=100)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await asyncio.gather(*(budget.acquire() for _ in range(11)))
+        return loop.time() - started
+
+    assert asyncio.run(scenario()) >= 0.09
+
+
+def _kline(market_id: str, index: int) -> str:
+    open_time = T0 + index * FIVE_MINUTES_MS
+    kline = {"t": open_time, "i": "5m", "o": "100", "h": "101", "l": "99", "c": "100.5", "v": "1", "x": True}
+    return json.dumps({"stream": f"{market_id.lower()}@kline_5m", "data": {"e": "kline", "s": market_id, "k": kline}})
+
+
+def test_websocket_multiplexer_uses_one_combined_stream_for_every_symbol():
+    exchange = _SharedFakeExchange()
+    paths = []
+    seen = {}
+
+    async def scenario():
+        done = asyncio.Event()
+
+        async def replay(websocket):
+            paths.append(websocket.path)
+            for market_id in ("ETHUSDT", "BTCUSDT"):
+                await websocket.send(_kline(market_id, 3))
+            await websocket.wait_closed()
+
+        async def on_close(locked_candles, symbol, timeframe):
+            seen.setdefault(symbol, []).append(int(locked_candles.timestamp[-1]))
+            if sum(map(len, seen.values())) == 4:
+                done.set()
+
+        server = await websockets.serve(replay, "127.0.0.1", 0)
+        multiplexer = FeedMultiplexer(
+            subscriptions=[("BTC/USDT", "5m"), ("ETH/USDT", "5m")],
+            mode="websocket",
+            poll_seconds=0.05,
+            requests_per_second=200,
+            exchange=exchange,
+            ws_base_url=f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}",
+        )
+        task = asyncio.create_task(multiplexer.start(on_close))
+        try:
+            await asyncio.wait_for(done.wait(), timeout=5)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(scenario())
+
+    assert paths == ["/stream?streams=btcusdt@kline_5m/ethusdt@kline_5m"]
+    # Candle 2 comes from the backfill on connect, candle 3 from the routed push.
+    assert seen == {symbol: [T0 + 2 * FIVE_MINUTES_MS, T0 + 3 * FIVE_MINUTES_MS] for symbol in ("BTC/USDT", "ETH/USDT")}
+
+
+def test_scheduled_feeds_share_one_budgeted_clock_sync():
+    exchange = _SharedFakeExchange()
+    multiplexer = FeedMultiplexer(
+        subscriptions=[(symbol, "5m") for symbol in ("BTC/USDT", "ETH/USDT", "SOL/USDT")],
+        mode="scheduled",
+        requests_per_second=200,
+        exchange=exchange,
+    )
+    acquired = []
+    acquire = multiplexer.budget.acquire
+
+    async def counting_acquire():
+        acquired.append(exchange.time_calls)
+        await acquire()
+
+    multiplexer.budget.acquire = counting_acquire
+
+    async def scenario():
+        async def on_close(locked_candles, symbol, timeframe):
+            return None
+
+        task = asyncio.create_task(multiplexer.start(on_close))
+        # Every feed loads its window, syncs the clock and then sleeps until the next real close.
+        while not all(feed.scheduler._closes_since_sync == 0 for feed in multiplexer.feeds.values()):
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+
+    assert exchange.time_calls == 1
+    # Three window loads and the one fetch_time all went through the shared budget.
+    assert len(acquired) == 4
@@ -0,0 +1,81 @@
+import numpy as np
+
+from models.schemas import FVGZone
+from strategy.candle_store import CandleRingBuffer, CandleSnapshot
+from strategy.fvg_index import FVGZoneIndex
+
+FIVE_MINUTES_MS = 5 * 60 * 1000
+
+
+def test_fvg_zone_stays_open_through_partial_fill_and_closes_when_filled():
+    index = FVGZoneIndex()
+    bars = [
+        (100.0, 101.0, 99.0, 100.5),
+        (100.5, 104.0, 100.4, 103.8),  # displacement candle
+        (103.8, 105.0, 102.0, 104.5),  # low 102 > high 101 two bars back -> bullish gap 101..102
+        (104.5, 104.8, 101.5, 104.0),  # trades into the gap, not through it
+    ]
+    for offset, bar in enumerate(bars):
+        index.update(offset * FIVE_MINUTES_MS, *bar)
+    assert index.closest_bullish(104.0) == FVGZone(top=102.0, bottom=101.0)
+
+    index.update(4 * FIVE_MINUTES_MS, 104.0, 104.2, 100.9, 101.2)
+    assert index.closest_bullish(104.0) == FVGZone()
+
+
+def test_fvg_index_matches_brute_force_scan():
+    rng = np.random.default_rng(21)
+    index = FVGZoneIndex()
+    bars = []
+    open_zones = {"bullish": [], "bearish": []}
+    close = 100.0
+    for step in range(3000):
+        open_ = close
+        close = open_ + (rng.choice([-1, 1]) * rng.uniform(2, 4) if rng.random() < 0.2 else rng.normal(0, 1))
+        high = round(max(open_, close) + abs(rng.normal(0, 0.3)), 1)
+        low = round(min(open_, close) - abs(rng.normal(0, 0.3)), 1)
+        bar = (round(open_, 1), high, low, round(close, 1))
+        index.update(step * FIVE_MINUTES_MS, *bar)
+
+        open_zones["bullish"] = [zone for zone in open_zones["bullish"] if low > zone[0]]
+        open_zones["bearish"] = [zone for zone in open_zones["bearish"] if high < zone[1]]
+        if len(bars) >= 2:
+            (_, high_2, low_2, _), (prev_open, _, _, prev_close) = bars[-2], bars[-1]
+            if low > high_2 and prev_close > prev_open:
+                open_zones["bullish"].append((high_2, low, step))
+            elif high < low_2 and prev_close < prev_open:
+                open_zones["bearish"].append((high, low_2, step))
+        bars.append(bar)
+
+        for price in rng.uniform(low - 20, high + 20, 3):
+            below = [zone for zone in open_zones["bullish"] if zone[0] < price]
+            above = [zone for zone in open_zones["bearish"] if zone[1] > price]
+            # Ties on the edge resolve by creation time, as in the index's sorted entries.
+            expected_bull = max(below, key=lambda zone: (zone[0], zone[2]), default=(None, None))
+            expected_bear = min(above, key=lambda zone: (zone[1], zone[2]), default=(None, None))
+            assert index.closest_bullish(price) == FVGZone(bottom=expected_bull[0], top=expected_bull[1])
+            assert index.closest_bearish(price) == FVGZone(bottom=expected_bear[0], top=expected_bear[1])
+
+    assert len(index.bullish) == len(open_zones["bullish"])
+    assert len(index.bearish) == len(open_zones["bearish"])
+    assert len(index.bullish) + len(index.bearish) > 0
+
+
+def test_sync_rebuilds_instead_of_bridging_a_gap_in_the_bars():
+    def snapshot(first: int, bars: list) -> CandleSnapshot:
+        buffer = CandleRingBuffer(window=len(bars))
+        for offset, (open_, high, low, close) in enumerate(bars):
+            buffer.upsert((first + offset) * FIVE_MINUTES_MS, (open_, high, low, close, 1.0))
+        return buffer.snapshot()
+
+    index = FVGZoneIndex()
+    index.sync(snapshot(0, [(100.0, 101.0, 99.0, 100.5), (100.5, 102.0, 100.0, 101.5)]))
+    # 498 bars later; without the bars in between the gap rule must not pair these with bars 0 and 1.
+    index.sync(snapshot(500, [(108.0, 111.0, 107.5, 110.0), (110.0, 112.0, 109.0, 111.0)]))
+
+    assert len(index.bullish) == 0 and len(index.bearish) == 0
+    assert index.closest_bullish(111.0) == FVGZone()
+
+    # The rebuilt index tracks the new window as usual.
+    index.sync(snapshot(502, [(111.0, 114.0, 112.5, 113.5)]))
+    assert index.closest_bullish(113.5) == FVGZone(top=112.5, bottom=111.0)
@@ -0,0 +1,70 @@
+import numpy as np
+
+from strategy.candle_store import CandleRingBuffer
+from strategy.incremental_engine import IncrementalQuantEngine
+from strategy.market_structure import QuantitativeEngine
+
+FIVE_MINUTES_MS = 5 * 60 * 1000
+T0 = 1_767_225_600_000
+
+
+def _random_bars(count: int, seed: int) -> list:
+    """Random walk with frequent displacement candles so MSS + FVG setups actually occur."""
+    rng = np.random.default_rng(seed)
+    bars = []
+    close = 100.0
+    for index in range(count):
+        open_ = close + rng.normal(0, 0.2)
+        if rng.random() < 0.15:
+            close = open_ + rng.choice([-1, 1]) * rng.uniform(3, 6)
+            wick = 0.1
+        else:
+            close = open_ + rng.normal(0, 1)
+            wick = abs(rng.normal(0, 0.6))
+        # Rounded prices make equal highs/lows (ties in the swing window) common.
+        bars.append(
+            (
+                T0 + index * FIVE_MINUTES_MS,
+                round(open_, 1),
+                round(max(open_, close) + wick, 1),
+                round(min(open_, close) - wick, 1),
+                round(close, 1),
+                1.0,
+            )
+        )
+    return bars
+
+
+def test_incremental_engine_matches_batch_engine_on_random_series():
+    setups = 0
+    for seed, window in ((1, 40), (2, 100)):
+        buffer = CandleRingBuffer(window=window)
+        engine = IncrementalQuantEngine("BTC/USDT", "5m")
+        for timestamp, *values in _random_bars(400, seed):
+            buffer.upsert(timestamp, values)
+            snapshot = buffer.snapshot()
+            if len(snapshot) < 5:
+                continue
+            expected = QuantitativeEngine(snapshot, symbol="BTC/USDT", timeframe="5m").run_execution_checklist()
+            actual = engine.sync(snapshot)
+            assert actual == expected, f"diverged at {timestamp}"
+            setups += expected.valid_poi_found
+    assert setups > 0
+
+
+def test_incremental_engine_rebuilds_when_history_does_not_continue():
+    bars = _random_bars(80, seed=3)
+    buffer = CandleRingBuffer(window=30)
+    engine = IncrementalQuantEngine("BTC/USDT", "5m")
+    for timestamp, *values in bars[:40]:
+        buffer.upsert(timestamp, values)
+    engine.sync(buffer.snapshot())
+
+    # A reconnect after a long outage hands over a window with no overlap.
+    fresh = CandleRingBuffer(window=30)
+    for timestamp, *values in bars[50:]:
+        fresh.upsert(timestamp, values)
+    snapshot = fresh.snapshot()
+    assert engine.sync(snapshot) == QuantitativeEngine(
+        snapshot, symbol="BTC/USDT", timeframe="5m"
+    ).run_execution_checklist()
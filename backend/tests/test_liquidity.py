@@ -0,0 +1,33 @@
+import numpy as np
+
+from strategy.candle_store import CandleSnapshot
+from strategy.liquidity import balanced_price_ranges, find_liquidity_targets, liquidity_pools
+
+
+def test_equal_highs_form_one_pool_and_swept_highs_drop_out():
+    # Swing highs at 110 (later swept by 112), then 112.00 and 112.03: equal highs never exceeded.
+    high = np.array(
+        [100, 101, 102, 110, 102, 101, 100, 101, 103, 112.0, 103, 101, 100, 101, 104, 112.03, 104, 101, 100, 99],
+        dtype=float,
+    )
+    pools = liquidity_pools(high, high - 2, swing_lookback=2, tolerance=0.0005)
+
+    assert pools["buy_side"].tolist() == [112.03]
+    assert pools["buy_touches"].tolist() == [2]
+
+
+def test_opposite_gap_overlap_is_reported_as_bpr():
+    # Row 2 prints a bearish gap 96.5..99.0, row 5 a bullish gap 95.6..97.5; they overlap at 96.5..97.5.
+    open_ = np.array([100.0, 100.0, 96.0, 93.5, 94.8, 99.2, 100.5])
+    high = np.array([101.0, 100.5, 96.5, 95.6, 99.5, 101.0, 102.0])
+    low = np.array([99.0, 95.5, 93.0, 93.0, 94.5, 97.5, 100.0])
+    close = np.array([100.0, 96.0, 93.5, 94.8, 99.2, 100.5, 101.5])
+
+    ranges = balanced_price_ranges(open_, high, low, close)
+    assert ranges["bullish"].tolist() == [True]
+    assert (ranges["bottom"][0], ranges["top"][0]) == (96.5, 97.5)
+
+    timestamps = np.arange(len(open_), dtype=np.int64) * 300_000
+    candles = CandleSnapshot(timestamps, open_, high, low, close, np.ones(len(open_)))
+    _, zones = find_liquidity_targets(candles, price=101.5)
+    assert [(zone.direction, zone.bottom, zone.top) for zone in zones] == [("BULLISH", 96.5, 97.5)]
@@ -0,0 +1,162 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+
+import worker
+from ai.llm_scheduler import LLMRequestDropped, LLMScheduler
+from models.schemas import AIDecision, MarketState
+
+
+def _state(symbol: str, minute: int, valid: bool = True) -> MarketState:
+    return MarketState(
+        timestamp=datetime(2026, 1, 5, 8, minute, tzinfo=timezone.utc),
+        symbol=symbol,
+        timeframe="5m",
+        valid_poi_found=valid,
+        stop_reference=99.0,
+    )
+
+
+class _GatedEngine:
+    """Evaluations block until released, so the test controls the queue."""
+
+    def __init__(self):
+        self.started = []
+        self.gate = asyncio.Event()
+
+    async def evaluate_market(self, market_state: MarketState) -> AIDecision:
+        self.started.append((market_state.symbol, market_state.timestamp.minute))
+        await self.gate.wait()
+        return AIDecision(action="LONG", confidence=70, reasoning="ok")
+
+    async def evaluate_batch(self, market_states: list[MarketState], on_decision=None) -> list[AIDecision]:
+        self.started.append(tuple(state.symbol for state in market_states))
+        await self.gate.wait()
+        return [AIDecision(action="SHORT", confidence=60, reasoning=state.symbol) for state in market_states]
+
+
+def test_scheduler_bounds_concurrency_and_coalesces_superseded_requests():
+    async def _run():
+        engine = _GatedEngine()
+        scheduler = LLMScheduler(engine, max_concurrency=1)
+        tasks = [asyncio.create_task(scheduler.evaluate(_state("BTC/USDT", 0)))]
+        await asyncio.sleep(0)
+        for symbol, minute in (("BTC/USDT", 5), ("ETH/USDT", 5), ("BTC/USDT", 10)):
+            tasks.append(asyncio.create_task(scheduler.evaluate(_state(symbol, minute))))
+            await asyncio.sleep(0)
+        assert scheduler.running == 1 and scheduler.queued == 2
+        engine.gate.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return engine.started, results, scheduler
+
+    started, results, scheduler = asyncio.run(_run())
+
+    # The newer BTC candle takes the superseded one's place ahead of ETH.
+    assert started == [("BTC/USDT", 0), ("BTC/USDT", 10), ("ETH/USDT", 5)]
+    assert isinstance(results[1], LLMRequestDropped) and "superseded" in results[1].reason
+    assert [result.action for index, result in enumerate(results) if index != 1] == ["LONG"] * 3
+    assert scheduler.running == 0 and scheduler.queued == 0
+
+
+def test_scheduler_drops_expired_queued_requests_and_cancels_late_evaluations():
+    now = [0.0]
+
+    async def _run():
+        engine = _GatedEngine()
+        scheduler = LLMScheduler(engine, max_concurrency=1, clock=lambda: now[0])
+        running = asyncio.create_task(scheduler.evaluate(_state("BTC/USDT", 0), deadline=100.0))
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(scheduler.evaluate(_state("ETH/USDT", 0), deadline=50.0))
+        await asyncio.sleep(0)
+        now[0] = 60.0
+        engine.gate.set()
+        first = await asyncio.gather(running, queued, return_exceptions=True)
+        # 0.05 s left when it starts and the engine never answers.
+        engine.gate.clear()
+        late = await asyncio.gather(scheduler.evaluate(_state("BTC/USDT", 5), deadline=60.05), return_exceptions=True)
+        return engine.started, first + late, scheduler
+
+    started, (running, queued, late), scheduler = asyncio.run(_run())
+
+    assert running.action == "LONG"
+    assert isinstance(queued, LLMRequestDropped) and "queued" in queued.reason
+    assert isinstance(late, LLMRequestDropped) and "before the evaluation finished" in late.reason
+    assert ("ETH/USDT", 0) not in started
+    assert scheduler.running == 0
+
+
+def test_scheduler_batches_queued_requests_behind_a_running_evaluation():
+    async def _run():
+        engine = _GatedEngine()
+        scheduler = LLMScheduler(engine, max_concurrency=1, max_batch=2)
+        tasks = [
+            asyncio.create_task(scheduler.evaluate(_state(symbol, 0)))
+            for symbol in ("BTC/USDT", "ETH/USDT", "SOL/USDT", "XRP/USDT")
+        ]
+        await asyncio.sleep(0)
+        engine.gate.set()
+        return engine.started, await asyncio.gather(*tasks)
+
+    started, results = asyncio.run(_run())
+
+    assert started == [("BTC/USDT", 0), ("ETH/USDT", "SOL/USDT"), ("XRP/USDT", 0)]
+    assert [result.reasoning for result in results[1:3]] == ["ETH/USDT", "SOL/USDT"]
+    assert results[3].action == "LONG"
+
+
+def test_batch_answers_survive_a_deadline_hit_while_retrying():
+    class _RetryingEngine(_GatedEngine):
+        """The batch answers ETH at once; the retry for BTC never finishes."""
+
+        async def evaluate_batch(self, market_states, on_decision=None):
+            on_decision(1, AIDecision(action="SHORT", confidence=60, reasoning="from the batch"))
+            await asyncio.Event().wait()
+
+    async def _run():
+        engine = _RetryingEngine()
+        scheduler = LLMScheduler(engine, max_concurrency=1, max_batch=2)
+        running = asyncio.create_task(scheduler.evaluate(_state("SOL/USDT", 0)))
+        await asyncio.sleep(0)
+        queued = [
+            asyncio.create_task(scheduler.evaluate(_state("BTC/USDT", 0), deadline=time.time() + 0.1)),
+            asyncio.create_task(scheduler.evaluate(_state("ETH/USDT", 0), deadline=time.time() + 5)),
+        ]
+        await asyncio.sleep(0)
+        engine.gate.set()
+        return await asyncio.gather(running, *queued, return_exceptions=True)
+
+    running, slot_holder, batched = asyncio.run(_run())
+
+    assert running.action == "LONG"
+    assert isinstance(slot_holder, LLMRequestDropped)
+    assert batched.action == "SHORT" and batched.reasoning == "from the batch"
+
+
+def test_worker_publishes_wait_event_for_dropped_llm_request(monkeypatch):
+    events = []
+
+    async def _fake_publish(event):
+        events.append(event)
+
+    async def _never_called(_):
+        pytest.fail("stale candle must not reach the LLM")
+
+    monkeypatch.setattr(worker, "_market_state", lambda locked, symbol, timeframe: _state(symbol, 0))
+    monkeypatch.setattr(worker, "publish_event", _fake_publish)
+    monkeypatch.setattr(worker.risk_guard, "check_daily_killswitch", lambda db: True)
+    monkeypatch.setattr(worker.settings, "KILLZONE_GATING_ENABLED", False)
+    monkeypatch.setattr(worker.ai_brain, "evaluate_market", _never_called)
+    locked = pd.DataFrame(
+        [[100.0, 101.0, 99.0, 100.5, 1000]],
+        columns=["Open", "High", "Low", "Close", "Volume"],
+        index=[datetime(2026, 1, 5, 8, 0, tzinfo=timezone.utc)],
+    )
+
+    asyncio.run(worker.process_closed_candle(locked, symbol="BTC/USDT", timeframe="5m"))
+
+    assert len(events) == 1
+    assert events[0].status == "WAIT" and events[0].action == "WAIT"
+    assert events[0].reasoning.startswith("LLM evaluation dropped")
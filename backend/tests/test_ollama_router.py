@@ -0,0 +1,141 @@
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+
+from aiohttp import web
+
+from ai.decision_engine import DecisionEngine
+from ai.ollama_router import OllamaRouter
+from core.metrics import metrics
+from models.schemas import MarketState
+
+ANSWER = json.dumps(
+    {
+        "action": "LONG",
+        "confidence": 70,
+        "reasoning": "ok",
+        "entry_poi": None,
+        "target_liquidity": 104.0,
+        "stop_reference": None,
+    }
+)
+
+
+class _FakeOllama:
+    """Local /api/generate that answers after ``delay`` seconds and records what it finished."""
+
+    def __init__(self, delay: float, status: int = 200):
+        self.delay = delay
+        self.status = status
+        self.started = 0
+        self.finished = 0
+        self.cancelled = 0
+        self.runner = None
+        self.url = None
+
+    async def generate(self, request: web.Request) -> web.Response:
+        await request.json()
+        self.started += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        self.finished += 1
+        if self.status != 200:
+            return web.json_response({"error": "model not found"}, status=self.status)
+        # One line works for both the streamed and the plain response path.
+        return web.json_response({"response": ANSWER, "done": True})
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_post("/api/generate", self.generate)
+        self.runner = web.AppRunner(app, handler_cancellation=True)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+
+def _state() -> MarketState:
+    return MarketState(
+        timestamp=datetime.now(timezone.utc),
+        symbol="BTC/USDT",
+        timeframe="5m",
+        valid_poi_found=True,
+        stop_reference=100.0,
+    )
+
+
+async def _with_servers(delays: list[float], body, statuses: list[int] | None = None):
+    servers = [_FakeOllama(delay, status) for delay, status in zip(delays, statuses or [200] * len(delays))]
+    for server in servers:
+        await server.start()
+    engine = DecisionEngine()
+    engine.decision_cache = None
+    try:
+        return await body(engine, servers), servers
+    finally:
+        await engine.close()
+        for server in servers:
+            await server.runner.cleanup()
+
+
+def test_router_sends_requests_to_the_fastest_endpoint_and_skips_failing_ones(monkeypatch):
+    monkeypatch.setattr(DecisionEngine, "_load_execution_guide", lambda self: "guide")
+
+    async def _body(engine, servers):
+        engine.router = OllamaRouter(
+            [servers[0].url, servers[1].url, "http://127.0.0.1:9"], hedge=False, max_failures=1
+        )
+        decisions = [await engine.evaluate_market(_state()) for _ in range(8)]
+        return decisions, engine.router
+
+    (decisions, router), _ = asyncio.run(_with_servers([0.08, 0.005], _body))
+
+    slow, fast, dead = router.endpoints
+    # Every endpoint is sampled once; after that the fast one takes all the traffic and the
+    # refused connection fails over instead of surfacing, then sits out its cooldown.
+    assert all(decision.action == "LONG" for decision in decisions)
+    assert len(slow.latencies) == 1 and len(fast.latencies) == 7
+    assert dead.error_rate > 0 and not dead.healthy(time.monotonic())
+    assert router.ranked()[0] is fast
+
+
+def test_non_200_answer_fails_over_and_ranks_the_endpoint_last(monkeypatch):
+    monkeypatch.setattr(DecisionEngine, "_load_execution_guide", lambda self: "guide")
+    monkeypatch.setattr(metrics, "counters", {})
+
+    async def _body(engine, servers):
+        # No cooldown: the failing endpoint stays eligible and must lose on rank alone.
+        engine.router = OllamaRouter([servers[0].url, servers[1].url], hedge=False, cooldown_secs=0.0)
+        return [await engine.evaluate_market(_state()) for _ in range(5)]
+
+    decisions, (bad, good) = asyncio.run(_with_servers([0.0, 0.0], _body, statuses=[503, 200]))
+
+    assert [decision.action for decision in decisions] == ["LONG"] * 5
+    assert bad.started == 1 and good.started == 5
+    assert metrics.counters["llm.router.failover"] == 1
+
+
+def test_hedged_request_returns_the_first_answer_and_cancels_the_loser(monkeypatch):
+    monkeypatch.setattr(DecisionEngine, "_load_execution_guide", lambda self: "guide")
+    monkeypatch.setattr(metrics, "counters", {})
+
+    async def _body(engine, servers):
+        engine.router = OllamaRouter([servers[0].url, servers[1].url], hedge=True, hedge_min_secs=0.05)
+        started = asyncio.get_running_loop().time()
+        decision = await engine.evaluate_market(_state())
+        elapsed = asyncio.get_running_loop().time() - started
+        # Let the slow server see its connection close.
+        await asyncio.sleep(0.05)
+        return decision, elapsed
+
+    (decision, elapsed), (slow, fast) = asyncio.run(_with_servers([2.0, 0.01], _body))
+
+    assert decision.action == "LONG"
+    assert elapsed < 1.0
+    assert fast.finished == 1
+    assert slow.started == 1 and slow.finished == 0 and slow.cancelled == 1
+    assert metrics.counters["llm.router.hedged"] == 1 and metrics.counters["llm.router.hedge_won"] == 1
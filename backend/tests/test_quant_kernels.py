@@ -0,0 +1,61 @@
+from dataclasses import fields
+
+import numpy as np
+
+from strategy import quant_kernels
+from strategy.candle_store import CandleRingBuffer, CandleSnapshot
+from strategy.market_structure import QuantitativeEngine
+
+FIVE_MINUTES_MS = 5 * 60 * 1000
+T0 = 1_767_225_600_000
+
+
+def _snapshot(count: int, seed: int):
+    rng = np.random.default_rng(seed)
+    buffer = CandleRingBuffer(window=count)
+    close = 100.0
+    for index in range(count):
+        open_ = close + rng.normal(0, 0.2)
+        strong = rng.random() < 0.15
+        close = open_ + (rng.choice([-1, 1]) * rng.uniform(3, 6) if strong else rng.normal(0, 1))
+        wick = 0.1 if strong else abs(rng.normal(0, 0.6))
+        high = round(max(open_, close) + wick, 1)
+        low = round(min(open_, close) - wick, 1)
+        # Occasional flat bars exercise the zero-range guard.
+        if rng.random() < 0.02:
+            high = low = round(close, 1)
+        buffer.upsert(T0 + index * FIVE_MINUTES_MS, (round(open_, 1), high, low, round(close, 1), 1.0))
+    return buffer.snapshot()
+
+
+def test_kernel_columns_match_pandas_columns():
+    snapshot = _snapshot(300, seed=11)
+    engine = QuantitativeEngine(snapshot, symbol="BTC/USDT", timeframe="5m")
+    engine.detect_fair_value_gaps()
+    df = engine.map_market_structure(swing_lookback=5)
+    args = (snapshot.open, snapshot.high, snapshot.low, snapshot.close)
+    fvg = quant_kernels.detect_fair_value_gaps(*args)
+    structure = quant_kernels.map_market_structure(*args, swing_lookback=5)
+
+    np.testing.assert_array_equal(fvg["bullish"], df["Bullish_FVG"].to_numpy())
+    np.testing.assert_array_equal(fvg["bearish_top"], df["Bearish_FVG_Top"].to_numpy())
+    np.testing.assert_array_equal(structure["swing_high"], df["Swing_High"].to_numpy())
+    np.testing.assert_array_equal(structure["last_swing_low"], df["Last_Swing_Low"].to_numpy())
+    np.testing.assert_array_equal(structure["bullish_mss"], df["Bullish_MSS"].to_numpy())
+    np.testing.assert_array_equal(structure["bearish_mss"], df["Bearish_MSS"].to_numpy())
+
+
+def test_kernel_checklist_matches_pandas_checklist_on_every_prefix():
+    full = _snapshot(400, seed=5)
+    setups = 0
+    for stop in range(1, len(full) + 1):
+        start = max(0, stop - 60)
+        window = CandleSnapshot(*(getattr(full, field.name)[start:stop] for field in fields(CandleSnapshot)))
+        expected = QuantitativeEngine(window, symbol="BTC/USDT", timeframe="5m").run_execution_checklist()
+        actual = quant_kernels.run_execution_checklist(window, symbol="BTC/USDT", timeframe="5m")
+        if len(window) < 5:
+            assert not actual.valid_poi_found
+            continue
+        assert actual == expected
+        setups += expected.valid_poi_found
+    assert setups > 0
@@ -0,0 +1,123 @@
+import asyncio
+import gzip
+import json
+
+import aiohttp
+import numpy as np
+import pytest
+
+import worker
+from ai.llm_scheduler import LLMScheduler
+from backtest.replay import replay
+from core.recorder import PipelineRecorder, replayable_settings
+from strategy.candle_store import CandleRingBuffer
+
+FIVE_MINUTES_MS = 5 * 60 * 1000
+LLM_ANSWER = json.dumps(
+    {
+        "action": "LONG",
+        "confidence": 70,
+        "reasoning": "recorded",
+        "entry_poi": None,
+        "target_liquidity": 1000.0,
+        "stop_reference": None,
+    }
+)
+
+
+class _FakeResponse:
+    status = 200
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    async def json(self):
+        return {"response": LLM_ANSWER}
+
+    @property
+    async def content(self):
+        yield json.dumps({"response": LLM_ANSWER, "done": True}).encode()
+
+    async def text(self):
+        return ""
+
+
+class _FakeSession:
+    closed = False
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    def post(self, url, **kwargs):
+        return _FakeResponse()
+
+    async def close(self):
+        self.closed = True
+
+
+async def _record_session(recorder: PipelineRecorder) -> None:
+    rng = np.random.default_rng(7)
+    buffer = CandleRingBuffer(window=30)
+    close = 100.0
+    for step in range(150):
+        open_ = close
+        move = rng.choice([-1, 1]) * rng.uniform(3, 6) if rng.random() < 0.2 else rng.normal(0, 1)
+        close = open_ + move
+        wick = 0.1 if abs(move) >= 3 else abs(rng.normal(0, 0.6))
+        values = (round(open_, 1), round(max(open_, close) + wick, 1), round(min(open_, close) - wick, 1))
+        buffer.upsert(1_767_225_600_000 + step * FIVE_MINUTES_MS, (*values, round(close, 1), 1.0))
+        await worker.process_closed_candle(buffer.snapshot(), symbol="BTC/USDT", timeframe="5m")
+    recorder.close()
+
+
+def test_recorded_session_replays_identically_and_detects_changed_llm_output(monkeypatch, tmp_path):
+    monkeypatch.setattr(aiohttp, "ClientSession", _FakeSession)
+    monkeypatch.setattr(worker.settings, "KILLZONE_GATING_ENABLED", False)
+    monkeypatch.setattr(worker.settings, "TELEGRAM_ALERTS_ENABLED", False)
+    # The canned LLM answer targets a level outside the state; let every setup reach it.
+    monkeypatch.setattr(worker.settings, "FEASIBILITY_FILTER_ENABLED", False)
+    # The synthetic session is in the past; keep the LLM deadlines open.
+    monkeypatch.setattr(worker, "llm_scheduler", LLMScheduler(worker.ai_brain, clock=lambda: 0.0))
+    path = tmp_path / "pipeline.jsonl.gz"
+    recorder = PipelineRecorder(path)
+    monkeypatch.setattr(worker, "pipeline_recorder", recorder)
+    asyncio.run(_record_session(recorder))
+
+    lines = [json.loads(line) for line in gzip.open(path, "rt", encoding="utf-8")]
+    statuses = {event["status"] for line in lines for event in line.get("events", [])}
+    assert {"WAIT", "EXECUTED"} <= statuses
+    # After the first window only the newly closed candle is stored.
+    assert all(len(line["window"]["rows"]) == 1 for line in lines[2:])
+
+    report = asyncio.run(replay(path))
+    assert report["candles"] == 150
+    assert report["mismatches"] == []
+
+    for line in lines:
+        for answer in line.get("ollama", []):
+            answer["response"] = answer["response"].replace('"LONG"', '"WAIT"')
+    with gzip.open(path, "wt", encoding="utf-8") as handle:
+        handle.writelines(json.dumps(line) + "\n" for line in lines)
+    mismatches = asyncio.run(replay(path))["mismatches"]
+    assert mismatches and {mismatch["kind"] for mismatch in mismatches} == {"events"}
+
+
+def test_replay_refuses_a_log_recorded_with_batched_llm_calls(monkeypatch, tmp_path):
+    monkeypatch.setattr(worker.settings, "LLM_MAX_BATCH", 4)
+    path = tmp_path / "pipeline.jsonl.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as handle:
+        handle.write(json.dumps({"settings": replayable_settings()}) + "\n")
+    monkeypatch.setattr(worker.settings, "LLM_MAX_BATCH", 1)
+
+    with pytest.raises(ValueError, match="LLM_MAX_BATCH=4"):
+        asyncio.run(replay(path))
+    assert worker.settings.LLM_MAX_BATCH == 1
@@ -0,0 +1,78 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from strategy.candle_store import CandleRingBuffer
+from strategy.resampler import IncrementalResampler
+
+FIVE_MINUTES_MS = 5 * 60 * 1000
+T0 = 1_767_225_600_000  # 2026-01-01T00:00:00Z, aligned to every target
+
+
+def _random_bars(count: int, first_index: int = 0) -> list:
+    rng = np.random.default_rng(7)
+    closes = 100 + np.cumsum(rng.normal(0, 1, count))
+    bars = []
+    for offset, close in enumerate(closes):
+        open_ = close + rng.normal(0, 0.5)
+        bars.append(
+            [
+                T0 + (first_index + offset) * FIVE_MINUTES_MS,
+                open_,
+                max(open_, close) + abs(rng.normal(0, 0.3)),
+                min(open_, close) - abs(rng.normal(0, 0.3)),
+                close,
+                float(rng.integers(1, 100)),
+            ]
+        )
+    return bars
+
+
+def test_incremental_bars_match_pandas_resample_for_complete_periods():
+    # Start mid-hour so the first 15m and 1h buckets are partial and must be dropped.
+    bars = _random_bars(24 * 12 + 7, first_index=5)
+    resampler = IncrementalResampler("5m", ["15m", "1h", "4h"], max_candles=500)
+    for bar in bars:
+        resampler.update("BTC/USDT", *bar)
+
+    frame = pd.DataFrame(bars, columns=["timestamp", "Open", "High", "Low", "Close", "Volume"])
+    frame.index = pd.to_datetime(frame.pop("timestamp"), unit="ms", utc=True)
+    aggregations = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+    for timeframe, rule in (("15m", "15min"), ("1h", "1h"), ("4h", "4h")):
+        counts = frame["Close"].resample(rule).count()
+        expected = frame.resample(rule).agg(aggregations)[counts == counts.max()]
+        actual = resampler.candles("BTC/USDT", timeframe).to_frame()
+        pd.testing.assert_frame_equal(actual, expected, check_freq=False, check_names=False)
+
+
+def test_on_base_close_publishes_higher_timeframe_closes_to_subscribers():
+    resampler = IncrementalResampler("5m", ["15m"])
+    published = []
+
+    async def subscriber(locked_candles, symbol, timeframe):
+        published.append((symbol, timeframe, int(locked_candles.timestamp[-1]), len(locked_candles)))
+
+    resampler.subscribe(subscriber)
+    buffer = CandleRingBuffer(window=100)
+
+    bars = _random_bars(9)
+
+    async def scenario():
+        # Warm-up snapshot already contains a finished 15m bucket; it must not be re-published.
+        for bar in bars[:4]:
+            buffer.upsert(bar[0], bar[1:])
+        await resampler.on_base_close(buffer.snapshot(), symbol="BTC/USDT", timeframe="5m")
+        for bar in bars[4:]:
+            buffer.upsert(bar[0], bar[1:])
+            await resampler.on_base_close(buffer.snapshot(), symbol="BTC/USDT", timeframe="5m")
+        await resampler.on_base_close(buffer.snapshot(), symbol="BTC/USDT", timeframe="1m")
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+
+    assert published == [
+        ("BTC/USDT", "15m", T0 + 3 * FIVE_MINUTES_MS, 2),
+        ("BTC/USDT", "15m", T0 + 6 * FIVE_MINUTES_MS, 3),
+    ]
@@ -0,0 +1,35 @@
+from datetime import datetime, time, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from strategy.sessions import SessionManager
+
+
+def _between(current: time, start: time, end: time) -> bool:
+    if start < end:
+        return start <= current <= end
+    return current >= start or current <= end
+
+
+def test_lookup_tables_match_per_call_time_checks_across_a_day():
+    manager = SessionManager()
+    day = datetime(2026, 3, 2, tzinfo=timezone.utc)
+    # Every minute boundary plus an instant 30 s later, so inclusive window ends are exercised.
+    moments = [day + timedelta(minutes=minute, seconds=seconds) for minute in range(24 * 60) for seconds in (0, 30)]
+    index = pd.DatetimeIndex(moments)
+
+    annotated = manager.annotate(index)
+    for moment, row in zip(moments, annotated.itertuples(index=False)):
+        current = moment.time()
+        row = row._asdict()
+        for session, hours in manager.sessions.items():
+            assert row[session] == _between(current, hours["open"], hours["close"]), (moment, session)
+        killzone = any(_between(current, hours["start"], hours["end"]) for hours in manager.overlaps.values())
+        killzone = killzone or _between(current, time(14, 0), time(15, 0))
+        assert row["KILLZONE"] == killzone, moment
+
+    epoch_ms = index.asi8 // 1_000_000
+    np.testing.assert_array_equal(manager.killzone_mask(epoch_ms), annotated["KILLZONE"].to_numpy())
+    assert manager.is_valid_killzone(datetime(2026, 3, 2, 14, 30))
+    assert manager.get_active_sessions(datetime(2026, 3, 2, 8, 30, tzinfo=timezone.utc)) == ["TOKYO", "LONDON"]
@@ -4,11 +4,14 @@ from datetime import datetime, timezone
 import pandas as pd
 
 import worker
+from core.recorder import collect
 from models.schemas import AIDecision, FVGZone, MarketState
+from strategy.candle_store import CandleRingBuffer
+from strategy.resampler import IncrementalResampler
 
 
-def _locked_df():
-    ts = datetime.now(timezone.utc)
+def _locked_df(ts=None):
+    ts = ts or datetime.now(timezone.utc)
     return pd.DataFrame(
         [[100.0, 101.0, 99.0, 100.5, 1000]],
         columns=["Open", "High", "Low", "Close", "Volume"],
@@ -18,7 +21,7 @@ def _locked_df():
 
 def test_worker_pipeline_emits_executed_event_with_mocked_llm(monkeypatch):
     class _FakeQuantEngine:
-        def __init__(self, df):
+        def __init__(self, df, **kwargs):
             self.df = df
 
         def run_execution_checklist(self):
@@ -60,9 +63,137 @@ def test_worker_pipeline_emits_executed_event_with_mocked_llm(monkeypatch):
     monkeypatch.setattr(worker.position_manager, "validate_and_execute", _fake_execute)
     monkeypatch.setattr(worker, "publish_event", _fake_publish)
     monkeypatch.setattr(worker.risk_guard, "check_daily_killswitch", lambda db: True)
+    monkeypatch.setattr(worker.settings, "KILLZONE_GATING_ENABLED", False)
 
     asyncio.run(worker.process_closed_candle(_locked_df()))
 
     assert len(events) == 1
     assert events[0].status == "EXECUTED"
     assert events[0].action == "LONG"
+
+
+def test_worker_pipeline_carries_dispatched_symbol_instead_of_settings(monkeypatch):
+    built_for = {}
+
+    class _FakeQuantEngine:
+        def __init__(self, df, symbol=None, timeframe=None, **kwargs):
+            built_for.update(symbol=symbol, timeframe=timeframe)
+
+        def run_execution_checklist(self):
+            return MarketState(
+                timestamp=datetime.now(timezone.utc),
+                symbol=built_for["symbol"],
+                timeframe=built_for["timeframe"],
+                valid_poi_found=False,
+            )
+
+    events = []
+
+    async def _fake_publish(event):
+        events.append(event)
+
+    monkeypatch.setattr(worker, "QuantitativeEngine", _FakeQuantEngine)
+    monkeypatch.setattr(worker, "publish_event", _fake_publish)
+    monkeypatch.setattr(worker.risk_guard, "check_daily_killswitch", lambda db: True)
+    monkeypatch.setattr(worker.settings, "KILLZONE_GATING_ENABLED", False)
+
+    asyncio.run(worker.process_closed_candle(_locked_df(), symbol="ETH/USDT", timeframe="15m"))
+
+    assert built_for == {"symbol": "ETH/USDT", "timeframe": "15m"}
+    assert events[0].symbol == "ETH/USDT"
+    assert events[0].status == "WAIT"
+
+
+def test_worker_pipeline_skips_quant_engine_outside_killzones(monkeypatch):
+    class _FailingQuantEngine:
+        def __init__(self, *args, **kwargs):
+            raise AssertionError("quant engine must not run outside killzones")
+
+    events = []
+
+    async def _fake_publish(event):
+        events.append(event)
+
+    monkeypatch.setattr(worker, "QuantitativeEngine", _FailingQuantEngine)
+    monkeypatch.setattr(worker, "publish_event", _fake_publish)
+    monkeypatch.setattr(worker.risk_guard, "check_daily_killswitch", lambda db: True)
+    monkeypatch.setattr(worker.settings, "KILLZONE_GATING_ENABLED", True)
+
+    # The 03:00 UTC candle closes at 03:05, far from every overlap and the Silver Bullet.
+    asyncio.run(worker.process_closed_candle(_locked_df(datetime(2026, 3, 2, 3, 0, tzinfo=timezone.utc))))
+
+    assert len(events) == 1
+    assert events[0].status == "WAIT"
+    assert "killzone" in events[0].reasoning
+
+
+def test_higher_timeframe_closes_update_context_instead_of_trading(monkeypatch):
+    events = []
+    built_for_htf = []
+
+    async def _fake_publish(event):
+        events.append(event)
+
+    def _fake_state(locked_candles, symbol, timeframe, htf=False):
+        built_for_htf.append(htf)
+        return MarketState(
+            timestamp=datetime.now(timezone.utc),
+            symbol=symbol,
+            timeframe=timeframe,
+            valid_poi_found=htf,
+            setup_type="BULLISH_MSS_WITH_DISPLACEMENT" if htf else None,
+            last_swing_low=99.0,
+        )
+
+    monkeypatch.setattr(worker, "publish_event", _fake_publish)
+    monkeypatch.setattr(worker, "_market_state", _fake_state)
+    monkeypatch.setattr(worker, "htf_context", {})
+    monkeypatch.setattr(worker.risk_guard, "check_daily_killswitch", lambda db: True)
+    monkeypatch.setattr(worker.settings, "KILLZONE_GATING_ENABLED", False)
+    monkeypatch.setattr(worker.settings, "FVG_INDEX_ENABLED", False)
+    monkeypatch.setattr(worker.settings, "LIQUIDITY_TARGETS_ENABLED", False)
+    monkeypatch.setattr(worker.settings, "TRADING_TIMEFRAME", "5m")
+    monkeypatch.setattr(worker.settings, "HTF_TIMEFRAMES", "15m")
+    resampler = IncrementalResampler("5m", ["15m"])
+    resampler.subscribe(worker.update_htf_context)
+    buffer = CandleRingBuffer(window=10)
+    t0 = 1_767_225_600_000
+
+    async def _feed():
+        for index in range(7):
+            buffer.upsert(t0 + index * 300_000, (100.0, 101.0, 99.0, 100.5, 10.0))
+            await resampler.on_base_close(buffer.snapshot(), symbol="BTC/USDT", timeframe="5m")
+            await asyncio.sleep(0)
+        assert not events, "HTF closes must not reach the execution pipeline"
+        with collect() as recorded:
+            await worker.process_closed_candle(buffer.snapshot(), symbol="BTC/USDT", timeframe="5m")
+        return recorded
+
+    recorded = asyncio.run(_feed())
+
+    assert built_for_htf == [True, True, False]
+    context = worker.htf_context[("BTC/USDT", "15m")]
+    assert list(worker.htf_context) == [("BTC/USDT", "15m")]
+    assert context.setup_type == "BULLISH_MSS_WITH_DISPLACEMENT"
+    assert recorded["market_state"][0]["htf_context"] == [context.model_dump(mode="json")]
+    assert events[0].status == "WAIT"
+
+
+def test_fvg_index_keeps_syncing_while_the_killswitch_is_active(monkeypatch):
+    events = []
+
+    async def _fake_publish(event):
+        events.append(event)
+
+    monkeypatch.setattr(worker, "publish_event", _fake_publish)
+    monkeypatch.setattr(worker, "fvg_indexes", {})
+    monkeypatch.setattr(worker.risk_guard, "check_daily_killswitch", lambda db: False)
+    monkeypatch.setattr(worker.settings, "FVG_INDEX_ENABLED", True)
+    buffer = CandleRingBuffer(window=3)
+    for index in range(3):
+        buffer.upsert(1_767_225_600_000 + index * 300_000, (100.0, 101.0, 99.0, 100.5, 10.0))
+
+    asyncio.run(worker.process_closed_candle(buffer.snapshot(), symbol="BTC/USDT", timeframe="5m"))
+
+    assert events[0].status == "KILLSWITCH"
+    assert worker.fvg_indexes[("BTC/USDT", "5m")]._last_timestamp == 1_767_225_600_000 + 2 * 300_000
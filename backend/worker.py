@@ -2,17 +2,30 @@ import asyncio
 from datetime import datetime, timezone
 
 import aiohttp
+import ccxt
+import numpy as np
 
 from ai.decision_engine import DecisionEngine
+from ai.llm_scheduler import LLMRequestDropped, LLMScheduler
 from core.config import settings
 from core.database import SessionLocal
 from core.logger import setup_logger
+from core.recorder import PipelineRecorder, record
+from execution.feasibility import FeasibilityFilter
 from execution.position_manager import PositionManager
 from execution.risk_guard import RiskGuard
-from models.schemas import ExecutionEvent
+from models.schemas import ExecutionEvent, HTFContext, MarketState
 from notifications.telegram_bot import send_execution_alert
-from strategy.data_feed import LiveDataFeed
+from strategy import quant_kernels
+from strategy.candle_store import CandleSnapshot
+from strategy.feed_multiplexer import FeedMultiplexer
+from strategy.features import STRATEGY_FEATURES, FeatureWindow
+from strategy.fvg_index import FVGZoneIndex
+from strategy.incremental_engine import IncrementalQuantEngine
+from strategy.liquidity import find_liquidity_targets
 from strategy.market_structure import QuantitativeEngine
+from strategy.resampler import IncrementalResampler
+from strategy.sessions import SessionManager
 
 logger = setup_logger("openclaw.worker")
 
@@ -21,12 +34,48 @@ if not settings.ENABLE_TESTNET:
     raise RuntimeError("ENABLE_TESTNET must remain true for this build.")
 logger.info("TESTNET MODE ENABLED")
 
-data_feed = LiveDataFeed(
-    symbol=settings.TRADING_SYMBOL,
-    timeframe=settings.TRADING_TIMEFRAME,
+
+def _split_csv(value: str, default: str | None = None) -> list[str]:
+    items = [item.strip() for item in value.split(",") if item.strip()]
+    return items or ([default] if default else [])
+
+
+feed_multiplexer = FeedMultiplexer(
+    subscriptions=[
+        (symbol, timeframe)
+        for symbol in _split_csv(settings.WATCH_SYMBOLS, settings.TRADING_SYMBOL)
+        for timeframe in _split_csv(settings.WATCH_TIMEFRAMES, settings.TRADING_TIMEFRAME)
+    ],
     max_candles=settings.MAX_CANDLES,
+    mode=settings.DATA_FEED_MODE,
+    requests_per_second=settings.FEED_REQUESTS_PER_SECOND,
+    cache_dir=settings.CANDLE_CACHE_DIR or None,
 )
+htf_timeframes = _split_csv(settings.HTF_TIMEFRAMES)
+htf_resampler = (
+    IncrementalResampler(
+        base_timeframe=settings.TRADING_TIMEFRAME,
+        targets=htf_timeframes,
+        max_candles=settings.MAX_CANDLES,
+    )
+    if htf_timeframes
+    else None
+)
+# Latest structure of each resampled higher-timeframe close; context only, never traded on.
+htf_context: dict[tuple[str, str], HTFContext] = {}
+# HTF closes keep their own engines so a resampled series never shares state with a watched feed of the same key.
+htf_incremental_engines: dict[tuple[str, str], IncrementalQuantEngine] = {}
+htf_feature_windows: dict[tuple[str, str], FeatureWindow] = {}
+incremental_engines: dict[tuple[str, str], IncrementalQuantEngine] = {}
+fvg_indexes: dict[tuple[str, str], FVGZoneIndex] = {}
+feature_windows: dict[tuple[str, str], FeatureWindow] = {}
+session_manager = SessionManager()
 ai_brain = DecisionEngine()
+llm_scheduler = LLMScheduler(
+    ai_brain,
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    max_batch=settings.LLM_MAX_BATCH,
+)
 risk_guard = RiskGuard(
     max_daily_drawdown_r=settings.MAX_DAILY_DRAWDOWN_R,
     max_trade_duration_mins=settings.MAX_TRADE_DURATION_MINS,
@@ -35,9 +84,12 @@ position_manager = PositionManager(
     risk_per_trade_percent=settings.RISK_PER_TRADE_PERCENT,
     min_rr_ratio=settings.MIN_RR_RATIO,
 )
+feasibility_filter = FeasibilityFilter()
+pipeline_recorder = PipelineRecorder(settings.PIPELINE_RECORD_PATH) if settings.PIPELINE_RECORD_PATH else None
 
 
 async def publish_event(event: ExecutionEvent) -> None:
+    record("events", event.model_dump(mode="json"))
     headers = {"X-Internal-Token": settings.INTERNAL_API_TOKEN}
     try:
         timeout = aiohttp.ClientTimeout(total=5)
@@ -60,31 +112,127 @@ async def publish_event(event: ExecutionEvent) -> None:
         await send_execution_alert(event)
 
 
-async def process_closed_candle(locked_df):
+def _market_state(locked_candles, symbol: str, timeframe: str, htf: bool = False):
+    engines = htf_incremental_engines if htf else incremental_engines
+    windows = htf_feature_windows if htf else feature_windows
+    if settings.QUANT_ENGINE == "incremental":
+        engine = engines.get((symbol, timeframe))
+        if engine is None:
+            engine = engines[(symbol, timeframe)] = IncrementalQuantEngine(symbol, timeframe)
+        return engine.sync(locked_candles)
+    if settings.QUANT_ENGINE == "numpy":
+        return quant_kernels.run_execution_checklist(locked_candles, symbol=symbol, timeframe=timeframe)
+    features = windows.get((symbol, timeframe))
+    if features is None:
+        features = windows[(symbol, timeframe)] = STRATEGY_FEATURES.window(settings.FEATURE_REUSE_MIN_ROWS)
+    quant_engine = QuantitativeEngine(locked_candles, symbol=symbol, timeframe=timeframe, features=features)
+    return quant_engine.run_execution_checklist()
+
+
+def _fvg_index(symbol: str, timeframe: str) -> FVGZoneIndex:
+    index = fvg_indexes.get((symbol, timeframe))
+    if index is None:
+        index = fvg_indexes[(symbol, timeframe)] = FVGZoneIndex()
+        feed = feed_multiplexer.feeds.get((symbol, timeframe))
+        if feed is not None and feed.cache is not None:
+            # Seed from the on-disk history so gaps older than the live window are known.
+            index.sync(feed.cache.read())
+    return index
+
+
+def _liquidity_history(locked_candles: CandleSnapshot, symbol: str, timeframe: str) -> CandleSnapshot:
+    """Cached history through the locked close when the feed has a cache, else the locked window."""
+    feed = feed_multiplexer.feeds.get((symbol, timeframe))
+    if feed is None or feed.cache is None or feed.cache.last_timestamp != int(locked_candles.timestamp[-1]):
+        return locked_candles
+    return feed.cache.tail(settings.LIQUIDITY_HISTORY_BARS)
+
+
+def _candle_close_ms(locked_candles, timeframe: str) -> int:
+    """Close time of the latest locked candle: its open time plus one timeframe."""
+    if isinstance(locked_candles, CandleSnapshot):
+        open_ms = int(locked_candles.timestamp[-1])
+    else:
+        open_ms = int(session_manager.to_epoch_ms(locked_candles.index[-1:])[0])
+    return open_ms + ccxt.Exchange.parse_timeframe(timeframe) * 1000
+
+
+def _last_close(locked_candles) -> float:
+    """Latest close from either a CandleSnapshot or a legacy locked DataFrame."""
+    return float(np.asarray(locked_candles["Close"])[-1])
+
+
+async def process_closed_candle(locked_candles, symbol: str | None = None, timeframe: str | None = None):
+    symbol = symbol or settings.TRADING_SYMBOL
+    timeframe = timeframe or settings.TRADING_TIMEFRAME
+    if pipeline_recorder is None:
+        await _run_pipeline(locked_candles, symbol, timeframe)
+        return
+    with pipeline_recorder.capture(locked_candles, symbol, timeframe):
+        await _run_pipeline(locked_candles, symbol, timeframe)
+
+
+async def _run_pipeline(locked_candles, symbol: str, timeframe: str):
     db = SessionLocal()
     try:
-        if not risk_guard.check_daily_killswitch(db):
+        fvg_index = None
+        if settings.FVG_INDEX_ENABLED and isinstance(locked_candles, CandleSnapshot):
+            # Zone tracking has to see every candle, including the ones the kill-switch and
+            # killzone gates skip; a gap wider than the window forces a rebuild.
+            fvg_index = _fvg_index(symbol, timeframe)
+            fvg_index.sync(locked_candles)
+
+        trading_allowed = risk_guard.check_daily_killswitch(db)
+        record("killswitch", trading_allowed)
+        if not trading_allowed:
             event = ExecutionEvent(
                 timestamp=datetime.now(timezone.utc),
-                symbol=settings.TRADING_SYMBOL,
+                symbol=symbol,
                 action="WAIT",
                 confidence=0,
                 reasoning="Daily kill-switch active. Trading halted.",
                 status="KILLSWITCH",
-                price=float(locked_df["Close"].iloc[-1]),
+                price=_last_close(locked_candles),
                 size=None,
                 pnl_r=None,
             )
             await publish_event(event)
             return
 
-        quant_engine = QuantitativeEngine(locked_df)
-        market_state = quant_engine.run_execution_checklist()
-        current_price = float(locked_df["Close"].iloc[-1])
+        current_price = _last_close(locked_candles)
+        close_ms = _candle_close_ms(locked_candles, timeframe)
+        if settings.KILLZONE_GATING_ENABLED and not session_manager.killzone_mask([close_ms])[0]:
+            event = ExecutionEvent(
+                symbol=symbol,
+                action="WAIT",
+                confidence=0,
+                reasoning="Candle closed outside the killzones; quant engine and LLM skipped.",
+                status="WAIT",
+                price=current_price,
+                size=None,
+                pnl_r=None,
+            )
+            await publish_event(event)
+            return
+
+        market_state = _market_state(locked_candles, symbol, timeframe)
+        if fvg_index is not None:
+            market_state.closest_bullish_fvg = fvg_index.closest_bullish(current_price)
+            market_state.closest_bearish_fvg = fvg_index.closest_bearish(current_price)
+        if settings.LIQUIDITY_TARGETS_ENABLED and isinstance(locked_candles, CandleSnapshot):
+            history = _liquidity_history(locked_candles, symbol, timeframe)
+            market_state.liquidity_targets, market_state.bpr_zones = find_liquidity_targets(history, current_price)
+        if timeframe == settings.TRADING_TIMEFRAME:
+            market_state.htf_context = [
+                htf_context[(symbol, target)]
+                for target in _split_csv(settings.HTF_TIMEFRAMES)
+                if (symbol, target) in htf_context
+            ]
+        record("market_state", market_state.model_dump(mode="json"))
 
         if not market_state.valid_poi_found:
             event = ExecutionEvent(
-                symbol=settings.TRADING_SYMBOL,
+                symbol=symbol,
                 action="WAIT",
                 confidence=0,
                 reasoning="No valid quantitative POI found on closed candle.",
@@ -96,10 +244,44 @@ async def process_closed_candle(locked_df):
             await publish_event(event)
             return
 
-        ai_decision = await ai_brain.evaluate_market(market_state)
+        if settings.FEASIBILITY_FILTER_ENABLED:
+            verdict = feasibility_filter.check(market_state, current_price, position_manager.min_rr_ratio)
+            if not verdict["feasible"]:
+                event = ExecutionEvent(
+                    symbol=symbol,
+                    action=verdict["action"],
+                    confidence=0,
+                    reasoning=verdict["reason"],
+                    status="REJECTED",
+                    price=current_price,
+                    size=None,
+                    pnl_r=None,
+                )
+                await publish_event(event)
+                return
+
+        # A decision has to be acted on before the next candle closes, or not at all.
+        next_close_ms = close_ms + ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        deadline = next_close_ms / 1000 - settings.LLM_DEADLINE_MARGIN_SECS
+        try:
+            ai_decision = await llm_scheduler.evaluate(market_state, deadline=deadline)
+        except LLMRequestDropped as exc:
+            event = ExecutionEvent(
+                symbol=symbol,
+                action="WAIT",
+                confidence=0,
+                reasoning=f"LLM evaluation dropped: {exc.reason}.",
+                status="WAIT",
+                price=current_price,
+                size=None,
+                pnl_r=None,
+            )
+            await publish_event(event)
+            return
+
         result = position_manager.validate_and_execute(
             ai_decision=ai_decision,
-            symbol=settings.TRADING_SYMBOL,
+            symbol=symbol,
             current_price=current_price,
             account_balance=settings.DEFAULT_ACCOUNT_BALANCE,
             db=db,
@@ -112,7 +294,7 @@ async def process_closed_candle(locked_df):
             "failed": "FAILED",
         }
         event = ExecutionEvent(
-            symbol=settings.TRADING_SYMBOL,
+            symbol=symbol,
             action=ai_decision.action,
             confidence=ai_decision.confidence,
             reasoning=ai_decision.reasoning if result.get("status") == "executed" else result.get("reason", ai_decision.reasoning),
@@ -128,9 +310,46 @@ async def process_closed_candle(locked_df):
         db.close()
 
 
+async def on_candle_close(locked_candles, symbol: str, timeframe: str):
+    if htf_resampler is not None:
+        await htf_resampler.on_base_close(locked_candles, symbol=symbol, timeframe=timeframe)
+        # Resampler callbacks run as tasks; one yield lets them refresh the context this candle reads.
+        await asyncio.sleep(0)
+    await process_closed_candle(locked_candles, symbol=symbol, timeframe=timeframe)
+
+
+async def update_htf_context(locked_candles, symbol: str, timeframe: str):
+    """
+    Resampler callback: refreshes the structure of a higher-timeframe close. HTF bars frame
+    the POI and draw on liquidity; execution stays on the feeds' own timeframes, whose market
+    state carries the latest context of every HTF resampled from them.
+    """
+    try:
+        state = _market_state(locked_candles, symbol, timeframe, htf=True)
+        htf_context[(symbol, timeframe)] = HTFContext(
+            timeframe=timeframe,
+            setup_type=state.setup_type if state.valid_poi_found else None,
+            closest_bullish_fvg=state.closest_bullish_fvg,
+            closest_bearish_fvg=state.closest_bearish_fvg,
+            last_swing_high=state.last_swing_high,
+            last_swing_low=state.last_swing_low,
+        )
+    except Exception as exc:
+        logger.error("HTF context update failed for %s (%s): %s", symbol, timeframe, exc)
+
+
 async def main():
     logger.info("Initializing OpenClaw worker.")
-    await data_feed.start_stream(on_candle_close_callback=process_closed_candle)
+    if htf_resampler is not None:
+        htf_resampler.subscribe(update_htf_context)
+    await ai_brain.start()
+    try:
+        await feed_multiplexer.start(on_candle_close_callback=on_candle_close)
+    finally:
+        await feed_multiplexer.close()
+        await ai_brain.close()
+        if pipeline_recorder is not None:
+            pipeline_recorder.close()
 
 
 if __name__ == "__main__":